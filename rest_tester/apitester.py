@@ -3,14 +3,26 @@ This file contains APITester class with its properties and methods
 """
 
 import os
+import time
+import atexit
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 
 from rest_tester.logger import logger
 from rest_tester.options import Options
 from rest_tester.modules.auth_module import Authenticator
-from rest_tester.modules.request_module import get_api_client
+from rest_tester.modules.token_module import TokenManager
+from rest_tester.modules.request_module import APIClientFactory
+from rest_tester.modules.execution_module import RequestExecutor, RequestLimits, LazyResponses, RequestMemo
+from rest_tester.modules.load_module import LatencySampler, LoadRunner
 from rest_tester.utils.postman_parser import convert_from_postman
 from rest_tester.utils.openapi_parser import convert_from_openapi
-from rest_tester.configs.constants import openapi_id_name, postman_id_name
+from rest_tester.utils.conversion_cache import ConversionCache
+from rest_tester.utils.group_index import GroupIndex
+from rest_tester.utils.latency_histogram import LatencyHistogram
+from rest_tester.utils.sharding import get_worker_count, partition
+from rest_tester.utils.spec_reader import detect_spec_format
+from rest_tester.configs.constants import openapi_id_name, postman_id_name, test_modifiers, latency_test_types
 from rest_tester.utils.utils import *
 
 
@@ -38,23 +50,91 @@ class APITester:
         :returns:
             Path of test groups directory after parsing
         """
-        with open(tests_groups_directory, 'r') as file:
-            if tests_groups_directory.endswith('.yaml'):
-                file_content = yaml.safe_load(file)
-            elif tests_groups_directory.endswith('.json'):
-                file_content = json.load(file)
-        if postman_id_name in list(file_content.get('info', {})):
-            return convert_from_postman(tests_groups_directory)
-        elif openapi_id_name in list(file_content):
-            return convert_from_openapi(tests_groups_directory)
+        if os.path.isdir(tests_groups_directory):
+            return tests_groups_directory
+        conversion_options = {'conversion_seed': self.config.conversion_seed, 'stream_specs': self.config.stream_specs}
+        cache = ConversionCache(tests_groups_directory, conversion_options) if self.config.conversion_cache else None
+        if cache and cache.is_fresh():
+            logger.info(f"Spec {tests_groups_directory} unchanged since last conversion, using {cache.root_dir}")
+            return cache.root_dir
+        spec_format = detect_spec_format(tests_groups_directory)
+        if spec_format is None:
+            with open(tests_groups_directory, 'r') as file:
+                if tests_groups_directory.endswith('.yaml'):
+                    file_content = yaml.safe_load(file)
+                elif tests_groups_directory.endswith('.json'):
+                    file_content = json.load(file)
+            if postman_id_name in list(file_content.get('info', {})):
+                spec_format = 'postman'
+            elif openapi_id_name in list(file_content):
+                spec_format = 'openapi'
+        if spec_format == 'postman':
+            return convert_from_postman(tests_groups_directory, cache)
+        elif spec_format == 'openapi':
+            return convert_from_openapi(
+                tests_groups_directory,
+                cache,
+                self.config.conversion_workers,
+                self.config.conversion_seed,
+                self.config.stream_specs,
+            )
         else:
             return tests_groups_directory
     
+    def index_test_groups(self, dir_groups_to_test: str) -> dict:
+        """
+        Method to index the JSON files of every test group folder without reading them.
+        Like os.walk, symlinked folders are not followed and unreadable or missing folders are skipped.
+        :param:
+            dir_groups_to_test: Root folder of the test groups, ending with '/'
+        :returns:
+            Dictionary with tests folder path as key and sorted list of JSON file paths as value
+        """
+        index = {}
+        pending_folders = [dir_groups_to_test]
+        while pending_folders:
+            folder_path = pending_folders.pop()
+            try:
+                with os.scandir(folder_path) as entries:
+                    entries = sorted(entries, key=lambda entry: entry.name)
+            except OSError:
+                continue
+            json_files = [entry.path for entry in entries if entry.is_file() and entry.name.endswith(".json")]
+            if json_files:
+                index[folder_path[len(dir_groups_to_test) :].rstrip('/') + "/"] = json_files
+            sub_folders = [
+                entry.path for entry in entries if entry.is_dir(follow_symlinks=False) and not entry.name.startswith('.')
+            ]
+            pending_folders.extend(reversed(sub_folders))
+        return index
+
+    def get_user_test_groups(self, user_config: dict) -> list:
+        """
+        Method to get the test groups selected by a user
+        :param:
+            user_config: User settings with its 'test_groups' selectors and optional 'exclude_groups' patterns
+        :returns:
+            Paths of the test groups the user will run, in the order they were indexed
+        """
+        return self.group_index.select(user_config['test_groups'], user_config.get('exclude_groups'))
+
+    def select_test_groups(self) -> list:
+        """
+        Method to select the test groups referenced by at least one user
+        :returns:
+            Paths of the test groups some user will run, in the order they were indexed
+        """
+        selected_groups = set()
+        for user_config in self.config.users:
+            selected_groups.update(self.get_user_test_groups(user_config))
+        return [group for group in self.group_index.groups if group in selected_groups]
+
     def read_test_groups(self) -> dict:
         """
-        Recursively reads JSON files inside the given root folder and sub-folders.
+        Reads the JSON files of the test groups referenced by the users inside the given root folder and sub-folders.
+        The folders are indexed first, then only the selected files are parsed, in parallel.
         :returns:
-            Dictionary with tests folder path as key and list of dicts as value
+            Dictionary with tests folder path as key and list of dicts of all its JSON files as value
         tests_metadata sample dict:
             {
                 '1/': [{test json},{test json}]},
@@ -67,54 +147,278 @@ class APITester:
             logger.info("Directory exists. Reading Directory contents...")
             dir_groups_to_test = self.get_dir_groups_to_test(self.config.dir_groups_to_test) if self.config.auto_convert else self.config.dir_groups_to_test
             dir_groups_to_test = dir_groups_to_test + '/' if dir_groups_to_test[-1] != '/' else dir_groups_to_test
-            for subdir, dirs, files in os.walk(dir_groups_to_test):
-                for filename in files:
-                    filepath = os.path.join(subdir, filename)
-                    if filepath.endswith(".json"):
-                        folder_path = os.path.dirname(filepath)
-                        relative_folder_path = (
-                            folder_path[len(dir_groups_to_test) :] + "/" if dir_groups_to_test else folder_path + "/"
-                        )
-                        jsons = read_json_file(filepath)
-                        json_folder_files.update({relative_folder_path: jsons})
+            index = self.index_test_groups(dir_groups_to_test)
+            self.group_index = GroupIndex(list(index))
+            selected_groups = self.select_test_groups()
+            logger.info(f"Loading {len(selected_groups)} of {len(index)} test groups")
+            file_paths = [file_path for group in selected_groups for file_path in index[group]]
+            with ThreadPoolExecutor(max_workers=self.config.loader_workers) as executor:
+                file_jsons = dict(zip(file_paths, executor.map(read_json_file, file_paths)))
+            for group in selected_groups:
+                json_folder_files[group] = []
+                for file_path in index[group]:
+                    jsons = file_jsons[file_path]
+                    json_folder_files[group].extend(jsons if isinstance(jsons, list) else [jsons])
             logger.info("Directory contents read successfully.")
             return json_folder_files
         else:
             raise Exception("Directory does not exist or invalid folder path")
 
+    def plan_user_tests(self, user_id: int, user_config: dict, groups: dict, token_manager: TokenManager) -> tuple:
+        """
+        Method to log a user in on its own api client and plan the API calls of its test groups.
+        The calls keep the user id as their 'auth' key, the authentication headers are added when they are sent.
+        :param:
+            user_id: Position of the user in the users settings
+            user_config: User settings
+            groups: Dictionary with tests folder path as key and list of test JSONs as value
+            token_manager: TokenManager holding the tokens of the users
+        :returns:
+            Tuple of the user's authenticator and list of planned calls as (group, api, tests, job)
+        """
+        authenticator = Authenticator(self.config.authentication_configs, self.client_factory.create())
+        authenticator.add_refresh_hook(partial(token_manager.refresh, user_id))
+        user_token = token_manager.get_token(user_id)
+        authenticator.login(user_token)
+        planned_calls = []
+        for group in self.get_user_test_groups(user_config):
+            for json in groups[group]:
+                api = json['api']
+                user_token = authenticator.is_token_valid(user_token)
+                data = self.parse_request_payload(api.get('data', {}))
+                settings = {
+                            "params": api.get('params', {}),
+                            "json": data,
+                            "auth": user_id,
+                            "timeout": self.get_request_timeout(json['tests']),
+                            }
+                planned_calls.append((group, api, json['tests'], (api['method'], api['uri'], settings)))
+        return authenticator, planned_calls
+
+    def get_request_timeout(self, tests: dict) -> tuple:
+        """
+        Method to get the transport timeout of an API call from the timeout expected by its tests
+        :param:
+            tests: The 'tests' section of a test JSON
+        :returns:
+            Tuple of connect and read timeouts in seconds
+        """
+        read_timeout = tests.get('timeout') or self.config.default_test_settings.get('timeout_seconds') or self.config.read_timeout
+        return (self.config.connect_timeout, read_timeout)
+
+    def run_load_test(self, planned_calls: list, executor: RequestExecutor) -> list:
+        """
+        Method to drive the planned calls of each test group of a user at the load test rate or concurrency
+        :param:
+            planned_calls: List of planned calls of the user as (group, api, tests, job)
+            executor: Executor sending the calls of the user
+        :returns:
+            List of (group, api, tests, sampled responses, latency sampler of the uri) in the planned order
+        """
+        load_tests = []
+        group_calls = {}
+        for planned_call in planned_calls:
+            group_calls.setdefault(planned_call[0], []).append(planned_call)
+        for group, calls in group_calls.items():
+            load_runner = LoadRunner(
+                executor,
+                self.config.load_mode,
+                self.config.load_rps,
+                self.config.load_concurrency,
+                self.config.load_duration,
+                self.config.load_sample_rate,
+                self.config.load_max_samples,
+            )
+            samples = load_runner.run([job for _, _, _, job in calls])
+            for uri, stats in load_runner.summary().items():
+                logger.info(
+                    "Load %s %s: %s calls, %s errors, %.1f rps, p50 %.3fs, p90 %.3fs, p95 %.3fs, p99 %.3fs, max %.3fs",
+                    group, uri, stats['count'], stats['errors'], stats['rps'],
+                    stats['p50'], stats['p90'], stats['p95'], stats['p99'], stats['max'],
+                )
+            for (group, api, tests, _), responses in zip(calls, samples):
+                latency_sampler = LatencySampler.from_histogram(
+                    load_runner.recorder.histograms.get(api['uri'], LatencyHistogram()),
+                    load_runner.recorder.errors.get(api['uri'], 0),
+                )
+                load_tests.append((group, api, tests, responses, latency_sampler))
+        return load_tests
+
     def build_test_data(self) -> tuple:
         """
         Method to get the test_inputs and test_ids for all test JSONs.
+        Every user gets its own api client, users are planned and executed on 'user_workers' threads
+        and their tests are returned in the order of the users. The 'max_in_flight' and 'max_per_host' limits
+        are shared by the executors of all the users, so they hold for the whole run.
+        In load test mode every group is driven at the load rate or concurrency and the tests run on a sample
+        of the responses.
+        In "lazy" collection mode the test_inputs hold ResponseHandle descriptors instead of responses,
+        the requests are then sent while the tests run. The api clients are closed when the run exits.
+        On pytest-xdist workers the collection is lazy and the API calls are split into 'shards_per_worker'
+        shards per worker, the shard of each test is kept in test_shards so all the tests of a shard run on
+        the same worker, which sends only the calls of the shards it runs.
         :returns:
-            List of possible combinations of paths
+            Tuple of test ids and test inputs in the same order
         """
         test_ids = []
         test_inputs = []
+        self.test_shards = []
+        worker_count = get_worker_count()
+        if worker_count and self.config.load_mode != 'off':
+            raise Exception("Load test mode can not be distributed across pytest-xdist workers")
+        deadline = time.monotonic() + self.config.run_deadline if self.config.run_deadline else None
         groups = self.read_test_groups()
-        authenticator = Authenticator(self.config.authentication_configs, get_api_client(self.config))
-        for user_config in self.config.users:
-            user_groups = user_config['test_groups']
-            user_token = user_config.get('token', '')
-            authenticator.login(user_token)
-            for group, test_info in groups.items():
-                for user_group in user_groups:
-                    if user_group in self.split_test_folder_directory(group):
-                        for json in test_info:
-                            api = json['api']
-                            tests = json['tests']
-                            authenticator.is_token_valid(user_token)
-                            data = self.parse_request_payload(api.get('data', {}))
-                            settings = {
-                                        "params": api.get('params', {}),
-                                        "json": data,
-                                        }
-                            api_response = authenticator.api_client.send_request(api['method'], api['uri'], **settings)
-                            for test_type, expected_value in tests.items():
-                                if expected_value:
-                                    test_inputs.append((api_response, {"type": test_type, "value": expected_value}))
-                                    test_ids.append(f"{group} - {api['uri']} - {test_type}")
+        self.client_factory = APIClientFactory(self.config)
+        atexit.register(self.client_factory.close)
+        token_manager = TokenManager(self.config.users, self.config, self.config.token_cache, self.config.token_refresh_margin)
+        token_manager.fetch_all()
+        token_manager.start()
+        memo = RequestMemo(self.config.dedupe_methods) if self.config.deduplicate_requests else None
+        with ThreadPoolExecutor(max_workers=self.config.user_workers) as user_pool:
+            user_plans = list(user_pool.map(
+                lambda user: self.plan_user_tests(*user, groups, token_manager), enumerate(self.config.users)
+            ))
+            auth_headers = lambda user_id: user_plans[user_id][0].get_auth_headers(token_manager.get_token(user_id))
+            max_in_flight = self.config.max_in_flight if self.config.load_mode == 'off' else None
+            limits = RequestLimits(max_in_flight, self.config.max_per_host)
+            executors = [
+                RequestExecutor(
+                    authenticator.api_client,
+                    self.config.max_in_flight,
+                    self.config.max_per_host,
+                    deadline,
+                    auth_headers,
+                    limits,
+                )
+                for authenticator, _ in user_plans
+            ]
+            if self.config.load_mode != 'off':
+                user_load_tests = user_pool.map(self.run_load_test, [calls for _, calls in user_plans], executors)
+                for (authenticator, _), load_tests in zip(user_plans, user_load_tests):
+                    for group, api, tests, samples, latency_sampler in load_tests:
+                        test_cases = self.get_test_cases(tests, latency_sampler)
+                        for test_case in test_cases:
+                            if test_case['type'] in latency_test_types:
+                                test_inputs.append((None, test_case))
+                                test_ids.append(f"{group} - {api['uri']} - {test_case['type']}")
+                        for sample_number, response in enumerate(samples, 1):
+                            for test_case in test_cases:
+                                if test_case['type'] not in latency_test_types:
+                                    test_inputs.append((response, test_case))
+                                    test_ids.append(f"{group} - {api['uri']} - {test_case['type']} - sample {sample_number}")
+                    authenticator.logout()
+                self.test_shards = [None] * len(test_inputs)
+                return test_ids, test_inputs
+            user_jobs = []
+            user_tests = []
+            for user_id, (authenticator, planned_calls) in enumerate(user_plans):
+                jobs = {}
+                planned_tests = []
+                for group, api, tests, job in planned_calls:
+                    job_key = (user_id, len(planned_tests))
+                    if memo and memo.is_cacheable(api):
+                        job_key = memo.fingerprint(job, dict(authenticator.api_client.headers))
+                        if job_key in memo.entries:
+                            memo.hits += 1
+                        else:
+                            memo.misses += 1
+                            memo.entries[job_key] = None
+                            jobs[job_key] = job
+                    else:
+                        jobs[job_key] = job
+                    planned_tests.append((group, api, tests, job_key, job))
+                user_jobs.append(jobs)
+                user_tests.append(planned_tests)
+            responses = {}
+            job_shards = self.get_job_shards(user_jobs, user_tests, worker_count) if worker_count else {}
+            if (self.config.lazy_collection or worker_count) and executors:
+                lazy_responses = LazyResponses(executors[0], self.config.prefetch_window, bool(worker_count))
+                for executor, jobs in zip(executors, user_jobs):
+                    responses.update({
+                        job_key: lazy_responses.add(job, 0, executor, job_shards.get(job_key))
+                        for job_key, job in jobs.items()
+                    })
+                for planned_tests in user_tests:
+                    for group, api, tests, job_key, _ in planned_tests:
+                        responses[job_key].uses += sum(
+                            test_case['type'] not in latency_test_types for test_case in self.get_test_cases(tests)
+                        )
+            else:
+                user_responses = user_pool.map(
+                    lambda user_id: executors[user_id].run(list(user_jobs[user_id].values())), range(len(user_jobs))
+                )
+                for jobs, job_responses in zip(user_jobs, user_responses):
+                    responses.update(zip(jobs, job_responses))
+        if memo:
+            memo.entries.update({job_key: response for job_key, response in responses.items() if isinstance(job_key, str)})
+        for (authenticator, _), executor, planned_tests in zip(user_plans, executors, user_tests):
+            for group, api, tests, job_key, job in planned_tests:
+                for test_case in self.get_test_cases(tests, self.get_latency_sampler(tests, executor, job)):
+                    test_inputs.append((responses[job_key], test_case))
+                    test_ids.append(f"{group} - {api['uri']} - {test_case['type']}")
+                    self.test_shards.append(job_shards.get(job_key))
             authenticator.logout()
+        if memo:
+            logger.info(memo.summary())
         return test_ids, test_inputs
+
+    def get_job_shards(self, user_jobs: list, user_tests: list, worker_count: int) -> dict:
+        """
+        Method to split the planned API calls into shards of balanced weight for the pytest-xdist workers.
+        A call weighs its request, its tests and the calls sent by its latency tests, a deduplicated call
+        being shared by the tests of every user that needs it.
+        :param:
+            user_jobs: Dictionary of job key to job of each user
+            user_tests: List of planned tests of each user as (group, api, tests, job_key, job)
+            worker_count: Number of pytest-xdist workers
+        :returns:
+            Dictionary of job key to shard number, the same on every worker
+        """
+        weights = {job_key: 1 for jobs in user_jobs for job_key in jobs}
+        for planned_tests in user_tests:
+            for group, api, tests, job_key, job in planned_tests:
+                test_cases = self.get_test_cases(tests)
+                weights[job_key] += len(test_cases)
+                if any(test_case['type'] in latency_test_types for test_case in test_cases):
+                    latency_sampler = self.get_latency_sampler(tests, None, job)
+                    weights[job_key] += latency_sampler.warmup + latency_sampler.samples
+        shards = partition(list(weights.values()), worker_count * self.config.shards_per_worker)
+        logger.info(f"Split {len(weights)} API calls into {max(shards, default=-1) + 1} shards for {worker_count} workers")
+        return dict(zip(weights, shards))
+    
+    def get_latency_sampler(self, tests: dict, executor: RequestExecutor, job: tuple) -> LatencySampler:
+        """
+        Method to get the sampler measuring the latency distribution of an API call for its latency tests
+        :param:
+            tests: The 'tests' section of a test JSON, 'latencyWarmup' and 'latencySamples' override the defaults
+            executor: Executor sending the calls
+            job: Tuple of method, uri and keyword arguments for send_request
+        :returns:
+            LatencySampler sending the call when its first latency test runs
+        """
+        warmup = tests.get('latencyWarmup', self.config.default_test_settings.get('latency_warmup', 2))
+        samples = tests.get('latencySamples') or self.config.default_test_settings.get('latency_samples', 20)
+        return LatencySampler(executor, job, warmup, samples)
+
+    def get_test_cases(self, tests: dict, latency_sampler: LatencySampler | None = None) -> list:
+        """
+        Method to get the test cases to run from the tests section of a test JSON
+        :param:
+            tests: The 'tests' section of a test JSON
+            latency_sampler: Sampler shared by the latency test cases (p50, p95, p99, maxLatency) of the call
+        :returns:
+            List of test cases with their type, expected value and the modifiers applying to them
+        """
+        test_cases = []
+        for test_type, expected_value in tests.items():
+            if expected_value and test_type not in test_modifiers:
+                test_case = {"type": test_type, "value": expected_value}
+                if test_type == "jsonSchema" and tests.get("jsonSchemaMode"):
+                    test_case["mode"] = tests["jsonSchemaMode"]
+                if test_type in latency_test_types:
+                    test_case["sampler"] = latency_sampler
+                test_cases.append(test_case)
+        return test_cases
     
     def parse_request_payload(self, data: str | dict) -> dict:
         """
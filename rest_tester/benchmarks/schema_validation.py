@@ -0,0 +1,77 @@
+"""
+This file benchmarks the jsonSchema validation of the sample UserTodos response
+
+Usage: python3 -m rest_tester.benchmarks.schema_validation [number_of_validations]
+"""
+
+import json
+import sys
+import timeit
+
+import jsonschema
+
+from rest_tester.tests.responses import UserTodos
+from rest_tester.utils.validators import get_model_schema, validate_json_schema, validate_model_json
+
+sample_response = {
+    "todos": [{"id": index, "todo": f"Todo {index}", "completed": index % 2 == 0, "userId": 5} for index in range(30)],
+    "total": 30,
+    "skip": 0,
+    "limit": 30,
+}
+
+sample_body = json.dumps(sample_response).encode('utf-8')
+
+
+def uncached() -> None:
+    """
+    Validation as done before the validator cache, rebuilding the schema and the validator on every call.
+    """
+    jsonschema.validate(sample_response, UserTodos.model_json_schema())
+
+
+def cached() -> None:
+    """
+    Validation with the cached model schema and compiled jsonschema validator.
+    """
+    validate_json_schema(sample_response, get_model_schema(UserTodos))
+
+
+def cached_fast() -> None:
+    """
+    Validation with the cached model schema and code generated fastjsonschema validator.
+    """
+    validate_json_schema(sample_response, get_model_schema(UserTodos), 'fastjsonschema')
+
+
+def pydantic_native() -> None:
+    """
+    Validation of the raw body with the cached TypeAdapter of the model.
+    """
+    validate_model_json(sample_body, UserTodos)
+
+
+def run(number: int) -> None:
+    """
+    Runs every available validation path the given number of times and prints the timings.
+
+    Args:
+        number (int): Number of validations per path.
+    """
+    benchmarks = {'uncached': uncached, 'cached': cached, 'pydantic': pydantic_native}
+    try:
+        import fastjsonschema  # noqa: F401
+
+        benchmarks['cached fastjsonschema'] = cached_fast
+    except ImportError:
+        print("fastjsonschema is not installed, skipping its benchmark")
+    baseline = None
+    for name, function in benchmarks.items():
+        function()
+        seconds = timeit.timeit(function, number=number)
+        baseline = baseline or seconds
+        print(f"{name:>22}: {seconds / number * 1e6:9.1f} us per validation, {baseline / seconds:6.1f}x")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
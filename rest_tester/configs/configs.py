@@ -7,17 +7,45 @@ configs = {
         # Default expected HTTP status code for successful requests
         "expected_status_code": 200,
         # Timeout in seconds for each request
-        "timeout_seconds": 10
+        "timeout_seconds": 10,
+        # How jsonSchema tests naming a response class are validated, "jsonschema" through the JSON schema of the
+        # class or "pydantic" directly on the raw body with pydantic-core, can be overridden with "jsonSchemaMode"
+        "json_schema_mode": "jsonschema",
+        # Calls sent before measuring the latency of a call for its p50, p95, p99 and maxLatency tests,
+        # can be overridden with "latencyWarmup"
+        "latency_warmup": 2,
+        # Calls whose latency is measured for the p50, p95, p99 and maxLatency tests of a call,
+        # can be overridden with "latencySamples"
+        "latency_samples": 20
     },
     "http_request_settings": {
-        # Method to use for making requests (e.g., "basic" for simple requests, "session" for persistent sessions)
+        # Method to use for making requests (e.g., "basic" for simple requests, "session" for persistent sessions,
+        # "async" for an asyncio client that keeps many requests in flight from a single thread)
         "method": "session",
         # Base URL for the API under test
         "base_url": "https://dummyjson.com",
         # Whether to verify SSL certificates for HTTPS requests
         "verify_ssl": True,
+        # Seconds to wait for a connection to the server before the request fails
+        "connect_timeout": 5,
+        # Seconds to wait for the response when neither the test nor "timeout_seconds" sets a timeout
+        "read_timeout": 60,
         # List of allowed methods for making requests
-        "allowed_methods": ["basic", "session"]
+        "allowed_methods": ["basic", "session", "async"],
+        # Number of hosts to keep a connection pool for
+        "pool_connections": 10,
+        # Maximum number of connections kept open per host, keep it at least as high as max_in_flight
+        "pool_maxsize": 10,
+        # Whether to reuse connections between requests, TLS handshakes are then paid once per connection
+        "keep_alive": True,
+        # Number of retries for failed connections and for the status codes in retry_status_forcelist
+        "max_retries": 0,
+        # Backoff factor between retries, the n-th retry waits backoff_factor * 2 ** (n - 1) seconds
+        "retry_backoff_factor": 0.5,
+        # Status codes of idempotent requests that should be retried
+        "retry_status_forcelist": [502, 503, 504],
+        # Whether to negotiate HTTP/2 when the server supports it, only used by the "async" method
+        "http2": False
     },
     "auth_settings": {
         # Indicates if the token is encoded
@@ -30,16 +58,26 @@ configs = {
         "token_validation_params": {
             "method": 'get',
             "uri": '/user/me'
-        }
+        },
+        # Seconds before the decoded token expiry at which the token is no longer trusted and a refresh is attempted
+        "token_expiry_margin": 30,
+        # Seconds a token validated by the token validation endpoint is trusted before it is validated again
+        "token_validation_ttl": 300,
+        # Whether tokens acquired by the users' auth providers are cached on disk with their expiry between runs
+        "token_cache": True,
+        # Seconds before the expiry at which the tokens acquired by the auth providers are refreshed in the background
+        "token_refresh_margin": 60
     },
     "user_tokens": [
         # List of users, each with associated tokens and test groups
         {
-            # List of test groups for the user (e.g., paths to test cases)
-            "test_groups": ["group1/"]
+            # List of test groups for the user (e.g., paths to test cases or glob patterns like "*/users/")
+            "test_groups": ["group1/"],
+            # List of test groups left out of the user's test groups
+            "exclude_groups": []
         },
         {
-            # Token for the user
+            # Token for the user, or "auth" settings to acquire it (e.g., {"provider": "login", "data": {...}})
             "token": "<place token here>",
             # List of test groups for the user
             "test_groups": ["group2/"]
@@ -56,9 +94,63 @@ configs = {
         "log_level": "DEBUG",
         # Log format to use for logging output
         "log_format": "3",
+        # "text" to log to the console only, "structured" to also write JSON lines to 'log_file' through a queue
+        "log_mode": "text",
+        # File the JSON lines are written to in "structured" log mode
+        "log_file": "rest_tester.log.jsonl",
+        # Maximum number of characters of the headers and params logged per request, 0 for no limit
+        "log_body_preview": 256,
+        # Fraction of the requests whose sending and response are logged, errors are always logged
+        "log_sample_rate": 1.0,
         # Directory path where test groups are located
         "dir_groups_to_test": "/app/rest_tester/tests/public_api/",
         # Whether to directly convert and use Openapi spec file if given
-        "auto_convert": False
+        "auto_convert": False,
+        # Number of threads reading the JSON files of the test groups referenced by the users
+        "loader_workers": 8,
+        # Whether to skip converting the spec again when neither it nor the converter changed since the last run
+        "conversion_cache": True,
+        # Number of processes generating the sample params and payloads while converting an OpenAPI spec
+        "conversion_workers": 1,
+        # Seed making the generated sample data reproducible, None for different samples on every conversion
+        "conversion_seed": None,
+        # Whether to read the paths of an OpenAPI spec incrementally instead of loading the whole spec in memory,
+        # JSON specs need the optional 'ijson' package for this
+        "stream_specs": False,
+        # Seconds after which no more requests are sent and the remaining calls fail, None means no deadline
+        "run_deadline": None,
+        # Number of users planned and executed at the same time, each on its own api client
+        "user_workers": 1,
+        # Maximum number of requests sent at the same time by all the users, 1 sends them one at a time
+        "max_in_flight": 1,
+        # Maximum number of requests sent at the same time to a single host by all the users, None for no limit
+        "max_per_host": None,
+        # "eager" sends every request while collecting the tests, "lazy" sends each request when its tests run
+        # and releases the response once they are done, keeping memory bounded on large suites
+        "collection_mode": "eager",
+        # Number of requests to send ahead of the running test in "lazy" mode, 0 disables prefetching
+        "prefetch_window": 0,
+        # Number of shards the API calls are split into per pytest-xdist worker when running with "make test-parallel"
+        "shards_per_worker": 2,
+        # Whether identical requests (same method, uri, params, body and auth headers) are sent only once per run
+        "deduplicate_requests": False,
+        # Methods whose identical requests are deduplicated, a single test can opt out with "dedupe": false in "api"
+        "dedupe_methods": ["get", "head", "options"],
+        # Engine validating the jsonSchema tests with cached validators, "jsonschema" or the code generated
+        # "fastjsonschema" (needs the optional 'fastjsonschema' package)
+        "schema_engine": "jsonschema",
+        # "off" sends every test request once, "rps" sends the requests of each group in a loop at "load_rps"
+        # requests per second, "concurrency" keeps "load_concurrency" requests in flight, for "load_duration" seconds
+        "load_mode": "off",
+        # Target requests per second of each group in "rps" load mode
+        "load_rps": 10,
+        # Requests in flight in "concurrency" load mode, maximum requests in flight in "rps" load mode
+        "load_concurrency": 10,
+        # Seconds each group is load tested for
+        "load_duration": 30,
+        # Fraction of the load test responses of each request on which its tests are evaluated
+        "load_sample_rate": 0.01,
+        # Maximum number of load test responses per request on which its tests are evaluated
+        "load_max_samples": 5
     }
 }
\ No newline at end of file
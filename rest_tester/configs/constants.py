@@ -7,3 +7,15 @@ postman_id_name = '_postman_id'
 openapi_id_name = 'openapi'
 
 openapi_default_tag = 'default'
+
+test_modifiers = ['jsonSchemaMode', 'latencyWarmup', 'latencySamples']
+
+latency_test_types = {'p50': 50, 'p95': 95, 'p99': 99, 'maxLatency': 100}
+
+converter_version = '4'
+
+conversion_cache_dir = '.rest_tester_cache'
+
+token_cache_file = 'tokens.json'
+
+token_fetch_workers = 16
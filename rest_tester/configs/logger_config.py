@@ -18,6 +18,9 @@ config_dict = {
         "3": {
             "format": "[%(asctime)s]-[%(levelname)s]-[%(message)s]-ln:[%(lineno)-d] in %(module)s\n",
         },
+        "json": {
+            "()": "rest_tester.utils.structured_logging.JsonLinesFormatter",
+        },
     },
     "handlers": {
         "detailedConsoleHandler": {
@@ -34,3 +37,13 @@ config_dict = {
         }
     },
 }
+
+if cfg['execution_settings'].get('log_mode') == 'structured':
+    config_dict["handlers"]["jsonLinesFileHandler"] = {
+        "class": "logging.FileHandler",
+        "level": cfg['execution_settings']['log_level'],
+        "formatter": "json",
+        "filename": cfg['execution_settings'].get('log_file', 'rest_tester.log.jsonl'),
+        "encoding": "utf-8",
+    }
+    config_dict["loggers"]["rest_tester"]["handlers"].append("jsonLinesFileHandler")
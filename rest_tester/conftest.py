@@ -2,6 +2,8 @@
 This file is the starting point of pytest package
 """
 
+import re
+import json
 from base64 import b64decode
 
 import pytest
@@ -178,9 +180,64 @@ def pytest_html_results_summary(prefix):
     </script>                               
         """)['content']])
 
+def get_latency_distribution_html(histogram) -> str:
+    """
+    Renders the latency distribution of a LatencyHistogram as an HTML table with its percentiles and a bar per range.
+
+    :param histogram: The LatencyHistogram of a latency test.
+    :type histogram: LatencyHistogram
+    :return: The HTML of the distribution.
+    :rtype: str
+    """
+    percentiles = [(name, histogram.value_at_percentile(percent)) for name, percent in
+                   [('p50', 50), ('p90', 90), ('p95', 95), ('p99', 99), ('p99.9', 99.9), ('max', 100)]]
+    summary = ', '.join(f'{name} {value * 1000:.1f} ms' for name, value in percentiles)
+    distribution = histogram.distribution()
+    highest_count = max((count for _, count in distribution), default=1)
+    rows = ''.join(
+        f'<tr><td>&le; {upper * 1000:.1f} ms</td><td>{count}</td>'
+        f'<td><div style="background:#5bc0de;height:10px;width:{200 * count // highest_count}px"></div></td></tr>'
+        for upper, count in distribution
+    )
+    return (
+        f'<div class="latency-distribution"><p>{histogram.count} calls, mean {histogram.mean * 1000:.1f} ms, {summary}</p>'
+        f'<table><tr><th>Latency</th><th>Calls</th><th></th></tr>{rows}</table></div>'
+    )
+
+timing_columns = ['DNS', 'Connect', 'TLS', 'TTFB', 'Download', 'Connection']
+
+def get_timing_cells(timings: dict | None) -> list:
+    """
+    Formats the timing breakdown of a request as the cells of the timing columns, in milliseconds.
+
+    :param timings: The 'timings' of the response, None if the request has none.
+    :type timings: dict
+    :return: The cells of the DNS, Connect, TLS, TTFB, Download and Connection columns.
+    :rtype: list
+    """
+    if not timings:
+        return ['N/A'] * len(timing_columns)
+    cells = [f"{timings[phase] * 1000:.1f} ms" if timings.get(phase) is not None else '-'
+             for phase in ['dns', 'connect', 'tls', 'ttfb', 'download']]
+    return cells + ['reused' if timings.get('reused') else 'new']
+
+def pytest_configure(config):
+    """
+    Makes pytest-xdist schedule the tests by their xdist_group, so all the tests of a shard run on the same worker
+    and every API call is sent by one worker only. The workers parse the original command line, so they are
+    switched to group scheduling as well.
+
+    :param config: The pytest config object.
+    :type config: pytest.Config
+    """
+    if hasattr(config, "workerinput"):
+        config.option.loadgroup = True
+    elif getattr(config.option, "numprocesses", None):
+        config.option.dist = "loadgroup"
+
 def pytest_html_results_table_header(cells):
     """
-    Takes a list of cells and modifies it by filtering out cells containing 'Links', moving the testId cell to the beginning, and inserting 'Test Type', 'Expected', and 'Actual' headers.
+    Takes a list of cells and modifies it by filtering out cells containing 'Links', moving the testId cell to the beginning, and inserting 'Test Type', 'Expected', 'Actual' and the request timing headers.
     """
     cells[:] = [cell for cell in cells if 'Links' not in cell]
     test_index = next(i for i, cell in enumerate(cells) if 'data-column-type="testId"' in cell)
@@ -188,6 +245,8 @@ def pytest_html_results_table_header(cells):
     cells.insert(1, '<th>Test Type</th>')
     cells.insert(2, '<th>Expected</th>')
     cells.insert(3, '<th>Actual</th>') 
+    for position, phase in enumerate(timing_columns, 4):
+        cells.insert(position, f'<th>{phase}</th>')
 
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
@@ -217,10 +276,16 @@ def pytest_runtest_makereport(item, call):
             report.extras.append(extras.text(expected_col.args[0], name='Expected'))
         if actual_col:
             report.extras.append(extras.text(actual_col.args[0], name='Actual'))
+        timings = item.get_closest_marker("timings")
+        if timings:
+            report.extras.append(extras.text(json.dumps(timings.args[0]), name='Timings'))
+        distribution = item.get_closest_marker("latency_distribution")
+        if distribution:
+            report.extras.append(extras.html(get_latency_distribution_html(distribution.args[0])))
 
 def pytest_html_results_table_row(report, cells):
     """
-    Takes a report object and a list of cells, modifies the list of cells by filtering out cells containing 'class="col-links"', moving the cell containing 'class="col-testId"' to the beginning, and inserting cells with the values of 'Test Type', 'Expected', and 'Actual'.
+    Takes a report object and a list of cells, modifies the list of cells by filtering out cells containing 'class="col-links"', moving the cell containing 'class="col-testId"' to the beginning without the '@shardN' suffix of pytest-xdist groups, and inserting cells with the values of 'Test Type', 'Expected', and 'Actual'.
 
     :param report: A pytest report object.
     :type report: pytest.Report
@@ -232,14 +297,19 @@ def pytest_html_results_table_row(report, cells):
     type_col = next((x for x in extra if x.get('name') == 'Test Type'), {}).get('content', 'N/A')
     expected_col = next((x for x in extra if x.get('name') == 'Expected'), {}).get('content', 'N/A')
     actual_col = next((x for x in extra if x.get('name') == 'Actual'), {}).get('content', 'N/A')
+    timings_col = next((x for x in extra if x.get('name') == 'Timings'), {}).get('content', '')
 
     type_col = b64decode(type_col.split(",")[1]).decode('utf-8') if type_col.startswith('data:') else type_col
     expected_col = b64decode(expected_col.split(",")[1]).decode('utf-8') if expected_col.startswith('data:') else expected_col
     actual_col = b64decode(actual_col.split(",")[1]).decode('utf-8') if actual_col.startswith('data:') else actual_col
+    timings_col = b64decode(timings_col.split(",")[1]).decode('utf-8') if timings_col.startswith('data:') else timings_col
 
     cells[:] = [cell for cell in cells if 'class="col-links"' not in cell]
     test_index = next(i for i, cell in enumerate(cells) if 'class="col-testId"' in cell)
-    cells.insert(0, cells.pop(test_index).replace('rest_tester/main.py::test_api[', '').replace(f' - {type_col}]',''))
+    test_id_cell = re.sub(r'\]@shard\d+', ']', cells.pop(test_index))
+    cells.insert(0, test_id_cell.replace('rest_tester/main.py::test_api[', '').replace(f' - {type_col}]',''))
     cells.insert(1, f'<td>{type_col}</td>')
     cells.insert(2, f'<td>{expected_col}</td>')
-    cells.insert(3, f'<td>{actual_col}</td>')                  
+    cells.insert(3, f'<td>{actual_col}</td>')
+    for position, timing_cell in enumerate(get_timing_cells(json.loads(timings_col) if timings_col else None), 4):
+        cells.insert(position, f'<td>{timing_cell}</td>')                  
@@ -5,6 +5,9 @@ This file configures the logger to be used as per Dictconfig inside configs
 import logging.config
 
 from rest_tester.configs import logger_config
+from rest_tester.utils.structured_logging import start_log_queue
 
 logging.config.dictConfig(logger_config.config_dict)
 logger = logging.getLogger(__name__)
+if logger_config.cfg['execution_settings'].get('log_mode') == 'structured':
+    log_listener = start_log_queue(logging.getLogger('rest_tester'))
@@ -3,30 +3,68 @@ This file is the starting point of this application
 """
 
 import jsonschema
+import pydantic
 
 import pytest
 import json
 
 from rest_tester.configs.configs import configs
+from rest_tester.configs.constants import latency_test_types
 from rest_tester.logger import logger
 from rest_tester.apitester import APITester
+from rest_tester.modules.execution_module import FailedResponse, ResponseHandle
 from rest_tester.utils.utils import *
+from rest_tester.utils.validators import get_model_schema, validate_json_schema, validate_model_json
 
 
 test_runner = APITester(configs)
 test_ids, test_inputs = test_runner.build_test_data()
+test_inputs = [
+    test_input if shard is None else pytest.param(*test_input, marks=pytest.mark.xdist_group(f"shard{shard}"))
+    for test_input, shard in zip(test_inputs, test_runner.test_shards)
+]
 
 @pytest.mark.parametrize("response, test", test_inputs, ids=test_ids)
 def test_api(response, test, request):
     """
     Generic test function to check single json at a time
     """
-    json_response = get_json(response)
-
     request.node.add_marker(pytest.mark.test_type(test["type"]))
 
+    if test["type"] in latency_test_types:
+        logger.info("Testing %s latency", test['type'])
+        latency_sampler = test["sampler"]
+        histogram = latency_sampler.measure()
+        actual_latency = histogram.value_at_percentile(latency_test_types[test["type"]])
+        request.node.add_marker(pytest.mark.expected(str(test["value"])))
+        request.node.add_marker(pytest.mark.actual(str(actual_latency)))
+        request.node.add_marker(pytest.mark.latency_distribution(histogram))
+        assert histogram.count, f"No latency samples were recorded for {test['type']}, the call was never sent"
+        assert not latency_sampler.errors, f"{latency_sampler.errors} of {histogram.count} latency calls failed"
+        assert (
+            actual_latency <= test["value"]
+        ), f"Expected {test['type']} latency: {test['value']}, Actual {test['type']} latency: {actual_latency}"
+        return
+
+    if isinstance(response, ResponseHandle):
+        request.addfinalizer(response.release)
+        response = response.acquire()
+
+    if isinstance(response, FailedResponse):
+        if test["type"] == "timeout":
+            expected_timeout = test["value"] or test_runner.config.default_test_settings['timeout_seconds']
+            request.node.add_marker(pytest.mark.expected(str(expected_timeout)))
+            request.node.add_marker(pytest.mark.actual(str(response.elapsed.total_seconds())))
+        pytest.fail(
+            f"Request {response.method} {response.url} failed after {response.elapsed.total_seconds():.3f}s: {response.reason}"
+        )
+    timings = getattr(response, "timings", None)
+    if timings:
+        request.node.add_marker(pytest.mark.timings(timings))
+    json_response = get_json(response)
+
     if test["type"] == "timeout":
-        logger.info(f"Testing timeout for {response.url}")
+        logger.info("Testing timeout for %s", response.url)
         expected_timeout = test["value"] or test_runner.config.default_test_settings['timeout_seconds']
         if expected_timeout:
             request.node.add_marker(pytest.mark.expected(str(expected_timeout)))  # Replace with actual expected value logic
@@ -36,7 +74,7 @@ def test_api(response, test, request):
             ), f"Expected timeout: {expected_timeout}, Actual timeout: {response.elapsed.total_seconds()} Response: {json_response}"
 
     if test["type"] == "statusCode":
-        logger.info(f"Testing status code for {response.url} ")
+        logger.info("Testing status code for %s", response.url)
         expected_status_code = test["value"] or test_runner.config.default_test_settings['expected_status_code']
         if expected_status_code:
             request.node.add_marker(pytest.mark.expected(str(expected_status_code)))
@@ -46,16 +84,21 @@ def test_api(response, test, request):
             ), f"Expected status code: {expected_status_code}, Actual status code: {response.status_code} Response: {json_response}"
     
     if test["type"] == "jsonSchema":
-        logger.info(f"Testing json schema for {response.url} ")
+        logger.info("Testing json schema for %s", response.url)
+        class_, class_name = None, 'Response'
         if isinstance(test["value"], str):
             class_name = test["value"]
             class_ = get_class(class_name, "rest_tester.tests.responses")
-        expected_json_schema = class_.model_json_schema() if class_ else test["value"]
+        expected_json_schema = get_model_schema(class_) if class_ else test["value"]
+        json_schema_mode = test.get("mode") or test_runner.config.default_test_settings.get('json_schema_mode')
         if expected_json_schema and json_response:
             request.node.add_marker(pytest.mark.expected(json.dumps(expected_json_schema)))
             try:
-                jsonschema.validate(json_response, expected_json_schema)
+                if class_ and json_schema_mode == 'pydantic':
+                    validate_model_json(response.content, class_, test_runner.config.schema_engine)
+                else:
+                    validate_json_schema(json_response, expected_json_schema, test_runner.config.schema_engine)
                 request.node.add_marker(pytest.mark.actual(json.dumps(expected_json_schema)))
-            except jsonschema.exceptions.ValidationError as e:
+            except (jsonschema.exceptions.ValidationError, pydantic.ValidationError) as e:
                 request.node.add_marker(pytest.mark.actual(json.dumps(get_json_schema(json_response, class_name))))
                 pytest.fail(f"JSON Schema validation failed: {str(e)}\n Response: {json_response}")
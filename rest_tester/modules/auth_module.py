@@ -2,11 +2,38 @@
 This file has Authenticator class and its properties
 """
 
-import datetime
+import time
 import base64, binascii
 import json,re
+from functools import lru_cache
 
 from rest_tester.logger import logger
+from rest_tester.utils.structured_logging import Preview
+
+
+@lru_cache(maxsize=1024)
+def decode_jwt_claims(token: str) -> dict:
+    """
+    Decodes the claims of a JWT from its payload segment, the signature is not verified.
+
+    Args:
+        token (str): The JWT made of the header, payload and signature segments separated by '.'.
+
+    Returns:
+        dict: The claims of the token, shared between calls for the same token.
+
+    Raises:
+        ValueError: If the token is not a JWT or its payload is not a JSON object.
+    """
+    segments = token.split('.')
+    if len(segments) != 3:
+        raise ValueError(f"JWT must have 3 segments, found {len(segments)}")
+    payload = segments[1]
+    claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+    if not isinstance(claims, dict):
+        raise ValueError("JWT payload is not a JSON object")
+    return claims
+
 
 class Authenticator:
     """
@@ -24,6 +51,9 @@ class Authenticator:
         """
         self.authentication_configs = authentication_configs
         self.api_client = api_client
+        self.token_expiry = {}
+        self.login_headers = set()
+        self.refresh_hooks = []
 
     @staticmethod
     def safe_format(template, **kwargs):
@@ -57,14 +87,29 @@ class Authenticator:
         Returns:
             None
         """
+        formatted_headers = self.get_auth_headers(token)
+        self.api_client.headers.update(formatted_headers)
+        self.login_headers.update(formatted_headers)
+
+    def get_auth_headers(self, token: str) -> dict:
+        """
+        Formats the 'auth_headers' of the authentication configurations with the given token.
+
+        Parameters:
+            token (str): The token of the user
+
+        Returns:
+            dict: The authentication headers, empty if there is no token.
+        """
+        auth_headers = {}
         if token:
             for header_template in self.authentication_configs['auth_headers']:
-                formatted_headers = {header: self.safe_format(value, **{'token': token}) for header, value in header_template.items()}
-                self.api_client.headers.update(formatted_headers)
+                auth_headers.update({header: self.safe_format(value, **{'token': token}) for header, value in header_template.items()})
+        return auth_headers
 
     def logout(self):
         """
-        Logs out the user from the current session.
+        Logs out the user from the current session by removing the authentication headers added by login.
 
         Parameters:
             self (Authenticator): The instance of the Authenticator class.
@@ -72,58 +117,123 @@ class Authenticator:
         Returns:
             None
         """
-        pass
+        for header in self.login_headers:
+            self.api_client.headers.pop(header, None)
+        self.login_headers.clear()
         
-    def is_token_valid(self, token: str) -> None:
+    def add_refresh_hook(self, hook) -> None:
+        """
+        Registers a hook called when a token expired or is about to expire.
+
+        Parameters:
+            hook (callable): Called with the current token, returns a new token or None if it cannot refresh it.
+
+        Returns:
+            None
+        """
+        self.refresh_hooks.append(hook)
+
+    def get_token_expiry(self, token: str) -> float | None:
+        """
+        Validates the token and returns the time until which it is known to be valid.
+
+        For encoded tokens this is the decoded 'exp' time, for other tokens the 'token_validation_params'
+        endpoint is called and the token is trusted for 'token_validation_ttl' seconds.
+
+        Parameters:
+            token (str): The token to be checked
+
+        Returns:
+            float: Timestamp until which the token is valid, None if the token is invalid.
+        """
+        if self.authentication_configs.get('token_encoded', ''):
+            payload = self.decode_token(self.authentication_configs.get('encoding_format', ''), token)
+            if isinstance(payload, dict) and isinstance(payload.get('exp'), (int, float)):
+                return payload['exp']
+            return None
+        token_validation_params = self.authentication_configs['token_validation_params']
+        settings = {
+                    "params": token_validation_params.get('params', {}),
+                    "json": token_validation_params.get('data', {}),
+                    }
+        response = self.api_client.send_request(token_validation_params['method'], token_validation_params['uri'], **settings)
+        if response.status_code == 200:
+            return time.time() + self.authentication_configs.get('token_validation_ttl', 300)
+        return None
+
+    def refresh_token(self, token: str) -> str | None:
+        """
+        Asks the refresh hooks for a new token and logs in with the first one returned.
+
+        Parameters:
+            token (str): The expired or expiring token
+
+        Returns:
+            str: The new token, None if no hook could refresh the token.
+        """
+        for hook in self.refresh_hooks:
+            new_token = hook(token)
+            if new_token and new_token != token:
+                logger.info("Token refreshed by refresh hook")
+                self.token_expiry.pop(token, None)
+                self.login(new_token)
+                return new_token
+        return None
+
+    def is_token_valid(self, token: str, refresh: bool = True) -> str:
         """
         Checks if the token is valid.
 
-        This function checks if the token provided in the user login settings is valid.
+        This function checks if the token provided in the user login settings is valid. The validity is cached per
+        token until its expiry minus 'token_expiry_margin' seconds, then the refresh hooks are asked for a new token
+        before the old one expires.
 
         Parameters:
             self (Authenticator): The Authenticator instance.
             token (str): The token to be checked
+            refresh (bool): Whether the refresh hooks may replace an expiring token.
 
         Returns:
-            None
+            str: The valid token, which is a new one if it was refreshed.
 
         Raises:
             Exception: If the provided token has expired.
 
         """
-        if token:
-            if self.authentication_configs.get('token_encoded', ''):
-                token = self.decode_token(self.authentication_configs.get('encoding_format', ''), token)
-                token_expiry_time = datetime.datetime.fromtimestamp(token['exp'])
-                if datetime.datetime.now() < token_expiry_time:
-                    return
-            else:
-                token_validation_params = self.authentication_configs['token_validation_params']
-                settings = {
-                            "params": token_validation_params.get('params', {}),
-                            "json": token_validation_params.get('data', {}),
-                            }
-                response = self.api_client.send_request(token_validation_params['method'], token_validation_params['uri'], **settings)
-                if response.status_code == 200:
-                    return
+        if not token:
+            return token
+        now = time.time()
+        if self.token_expiry.get(token, 0) > now:
+            return token
+        expiry = self.get_token_expiry(token)
+        margin = self.authentication_configs.get('token_expiry_margin', 30)
+        if expiry is None or expiry - margin <= now:
+            new_token = self.refresh_token(token) if refresh else None
+            if new_token:
+                return self.is_token_valid(new_token, refresh=False)
+        if expiry is None or expiry <= now:
             raise Exception('Provided token expired, add new token and restart test...')
+        self.token_expiry[token] = expiry - margin if expiry - margin > now else expiry
+        return token
 
     def decode_token(self, type: str, token: str) -> dict:
         """
         Decode the provided token based on the specified encoding type.
 
         Args:
-            type (str): The encoding type of the token. Currently, only 'base64' is supported.
+            type (str): The encoding type of the token, 'jwt' or 'base64'.
             token (str): The token to be decoded
 
         Returns:
             dict: The decoded token payload as a dictionary.
         """
         try:
+            if type == 'jwt':
+                return dict(decode_jwt_claims(token))
             if type == 'base64':
-                logger.info(f"Decoding token: {token}")
+                logger.info("Decoding token: %s", Preview(token, 12))
                 payload_raw = base64.urlsafe_b64decode(token+'==')
                 payload_json = re.findall(r"{.*?}", str(payload_raw))[1]
                 return json.loads(payload_json)
-        except (IndexError, json.JSONDecodeError, binascii.Error) as error:
-            logger.info(f"Error decoding token: {error}")
\ No newline at end of file
+        except (IndexError, ValueError, binascii.Error) as error:
+            logger.info("Error decoding token: %s", error)
\ No newline at end of file
@@ -0,0 +1,464 @@
+"""
+This file has the RequestExecutor class which sends the planned API calls
+"""
+
+import json
+import time
+import asyncio
+import contextlib
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import httpx
+import requests
+
+from rest_tester.logger import logger
+
+
+class FailedResponse:
+    """
+    This class stands for the response of an API call which failed at the transport level (e.g., a connect or read
+    timeout, or the run deadline), so the tests of the call fail with the error and its timing instead of hanging.
+    """
+
+    def __init__(self, method: str, url: str, error: Exception | str, elapsed: float):
+        """
+        Initialize the FailedResponse.
+
+        Args:
+            method (str): HTTP method of the call.
+            url (str): Url of the call.
+            error (Exception | str): The transport error.
+            elapsed (float): Seconds spent on the call before it failed.
+        """
+        self.method = method
+        self.url = url
+        self.error = error
+        self.reason = str(error) or type(error).__name__
+        self.elapsed = datetime.timedelta(seconds=elapsed)
+        self.status_code = None
+        self.content = b''
+        self.text = ''
+        self.headers = {}
+
+    def __repr__(self) -> str:
+        return f"FailedResponse({self.method} {self.url}: {self.reason})"
+
+    def json(self):
+        raise ValueError(f"No response body, the request failed: {self.reason}")
+
+
+class RequestLimits:
+    """
+    This class holds the limits on the requests in flight, shared by the executors of all the users of a run so
+    the limits hold for the whole run: one semaphore for all the requests and one per host. The requests sent
+    from the event loop of the "async" clients are limited by asyncio semaphores of the same sizes.
+    """
+
+    def __init__(self, max_in_flight: int | None = 1, max_per_host: int | None = None):
+        """
+        Initialize the RequestLimits.
+
+        Args:
+            max_in_flight (int): Maximum number of requests sent at the same time, None means no limit
+                (e.g., in load test mode, where the load concurrency drives the requests).
+            max_per_host (int): Maximum number of requests sent at the same time to a single host, None means no limit.
+        """
+        self.max_in_flight = max_in_flight
+        self.max_per_host = max_per_host
+        self.in_flight = threading.BoundedSemaphore(max_in_flight) if max_in_flight else None
+        self.async_in_flight = asyncio.Semaphore(max_in_flight) if max_in_flight else None
+        self._host_limits = {}
+        self._async_host_limits = {}
+        self._lock = threading.Lock()
+
+    def get_host_limit(self, host: str) -> threading.BoundedSemaphore | None:
+        """
+        Returns the semaphore limiting the in-flight requests for the given host.
+
+        Args:
+            host (str): Host name with port.
+
+        Returns:
+            threading.BoundedSemaphore: Semaphore shared by all requests to the host, None if there is no limit.
+        """
+        if not self.max_per_host:
+            return None
+        with self._lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._host_limits[host]
+
+    def get_async_host_limit(self, host: str) -> asyncio.Semaphore | None:
+        """
+        Returns the asyncio semaphore limiting the in-flight requests for the given host on the event loop.
+
+        Args:
+            host (str): Host name with port.
+
+        Returns:
+            asyncio.Semaphore: Semaphore shared by all requests to the host, None if there is no limit.
+        """
+        if not self.max_per_host:
+            return None
+        with self._lock:
+            if host not in self._async_host_limits:
+                self._async_host_limits[host] = asyncio.Semaphore(self.max_per_host)
+            return self._async_host_limits[host]
+
+
+class RequestExecutor:
+    """
+    This class sends a list of planned API calls either one at a time or concurrently, keeping the input order.
+    """
+
+    def __init__(
+        self,
+        api_client,
+        max_in_flight: int = 1,
+        max_per_host: int | None = None,
+        deadline: float | None = None,
+        auth_headers=None,
+        limits: RequestLimits | None = None,
+    ):
+        """
+        Initialize the RequestExecutor with the api client and concurrency limits.
+
+        Args:
+            api_client: The api client used to send the requests.
+            max_in_flight (int): Maximum number of requests sent at the same time, 1 means serial execution.
+            max_per_host (int): Maximum number of requests sent at the same time to a single host, None means no limit.
+            deadline (float): time.monotonic() value after which no request is sent, None means no deadline.
+            auth_headers (callable): Called with the 'auth' key of a planned call when it is sent, returns the
+                current authentication headers of its user.
+            limits (RequestLimits): Limits shared with the executors of the other users, built from max_in_flight
+                and max_per_host if None.
+        """
+        self.api_client = api_client
+        self.max_in_flight = max(1, max_in_flight or 1)
+        self.limits = limits or RequestLimits(self.max_in_flight, max_per_host)
+        self.max_per_host = self.limits.max_per_host
+        self.deadline = deadline
+        self.auth_headers = auth_headers
+
+    def get_host(self, uri: str) -> str:
+        """
+        Returns the host the given uri will be sent to.
+
+        Args:
+            uri (str): API endpoint of the request.
+
+        Returns:
+            str: Host name with port of the request url.
+        """
+        return urlparse(self.api_client.base_url + uri).netloc
+
+    def get_failed_response(self, job: tuple, error: Exception | str, elapsed: float) -> FailedResponse:
+        """
+        Returns the FailedResponse of a planned API call which failed at the transport level.
+
+        Args:
+            job (tuple): Tuple of method, uri and keyword arguments for send_request.
+            error (Exception | str): The transport error.
+            elapsed (float): Seconds spent on the call before it failed.
+
+        Returns:
+            FailedResponse: The response standing for the failed call.
+        """
+        method, uri, _ = job
+        failed_response = FailedResponse(method, self.api_client.base_url + uri, error, elapsed)
+        logger.error("%s %s failed after %.3fs: %s", method, uri, elapsed, failed_response.reason)
+        return failed_response
+
+    def limit_timeout(self, job: tuple) -> tuple | None:
+        """
+        Caps the timeout of a planned API call to the time left before the run deadline.
+
+        Args:
+            job (tuple): Tuple of method, uri and keyword arguments for send_request.
+
+        Returns:
+            tuple: The job with its timeout capped, None if the deadline has passed.
+        """
+        if self.deadline is None:
+            return job
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        method, uri, settings = job
+        connect_timeout, read_timeout = settings.get('timeout') or (None, None)
+        timeout = (min(connect_timeout or remaining, remaining), min(read_timeout or remaining, remaining))
+        return method, uri, {**settings, 'timeout': timeout}
+
+    def prepare(self, job: tuple) -> tuple | None:
+        """
+        Prepares a planned API call right before it is sent: its timeout is capped to the run deadline and the
+        'auth' key of the call is replaced by the current authentication headers of its user, so tokens refreshed
+        after the call was planned are used.
+
+        Args:
+            job (tuple): Tuple of method, uri and keyword arguments for send_request.
+
+        Returns:
+            tuple: The job to send, None if the deadline has passed.
+        """
+        limited_job = self.limit_timeout(job)
+        if limited_job is None or 'auth' not in limited_job[2]:
+            return limited_job
+        method, uri, settings = limited_job
+        settings = {key: value for key, value in settings.items() if key != 'auth'}
+        if self.auth_headers and job[2]['auth'] is not None:
+            settings['headers'] = {**settings.get('headers', {}), **self.auth_headers(job[2]['auth'])}
+        return method, uri, settings
+
+    def send(self, job: tuple):
+        """
+        Sends a single planned API call respecting the in-flight and per host limits and the run deadline.
+
+        Args:
+            job (tuple): Tuple of method, uri and keyword arguments for send_request.
+
+        Returns:
+            The HTTP response object, or a FailedResponse if the call failed at the transport level.
+        """
+        prepared_job = self.prepare(job)
+        if prepared_job is None:
+            return self.get_failed_response(job, TimeoutError("Run deadline exceeded"), 0.0)
+        method, uri, settings = prepared_job
+        in_flight = self.limits.in_flight or contextlib.nullcontext()
+        host_limit = self.limits.get_host_limit(self.get_host(uri)) or contextlib.nullcontext()
+        with in_flight, host_limit:
+            start = time.perf_counter()
+            try:
+                return self.api_client.send_request(method, uri, **settings)
+            except (requests.RequestException, httpx.HTTPError) as error:
+                return self.get_failed_response(job, error, time.perf_counter() - start)
+
+    def run(self, jobs: list) -> list:
+        """
+        Sends all the given API calls and returns their responses.
+
+        Args:
+            jobs (list): List of tuples of method, uri and keyword arguments for send_request.
+
+        Returns:
+            list: Responses in the same order as the given jobs.
+        """
+        if self.max_in_flight == 1 or len(jobs) <= 1:
+            return [self.send(job) for job in jobs]
+        if hasattr(self.api_client, 'send_requests'):
+            logger.info("Sending %s requests from the event loop with %s in flight", len(jobs), self.max_in_flight)
+            return self.api_client.send_requests(jobs, self.limits, self.prepare, self.get_failed_response)
+        logger.info("Sending %s requests with %s in flight", len(jobs), self.max_in_flight)
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            return list(executor.map(self.send, jobs))
+
+
+class LazyResponses:
+    """
+    This class keeps the planned API calls of a lazy collection and prefetches a bounded window of them
+    ahead of the test being executed. When the calls are split into shards, the whole shard of a call is
+    prefetched instead, the first time one of its responses is needed.
+    """
+
+    def __init__(self, executor: RequestExecutor, prefetch_window: int = 0, shard_prefetch: bool = False):
+        """
+        Initialize the LazyResponses with the executor used to send the requests.
+
+        Args:
+            executor (RequestExecutor): Executor used to send the planned API calls.
+            prefetch_window (int): Number of API calls to send ahead of the running test, each on its own thread,
+                0 disables prefetching. The requests in flight are limited by the executors.
+            shard_prefetch (bool): Whether the calls of a shard are all sent when its first response is needed.
+        """
+        self.executor = executor
+        self.prefetch_window = prefetch_window or 0
+        self.shard_prefetch = shard_prefetch
+        self.handles = []
+        self.shards = {}
+        self._started_shards = set()
+        self._lock = threading.Lock()
+        self._prefetch_pool = None
+        if self.prefetch_window or self.shard_prefetch:
+            workers = self.prefetch_window or executor.max_in_flight
+            self._prefetch_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='prefetch')
+
+    def add(
+        self, job: tuple, uses: int, executor: RequestExecutor | None = None, shard: int | None = None
+    ) -> "ResponseHandle":
+        """
+        Adds a planned API call to the collection.
+
+        Args:
+            job (tuple): Tuple of method, uri and keyword arguments for send_request.
+            uses (int): Number of tests which need the response of this call.
+            executor (RequestExecutor): Executor sending this call (e.g., the one of the user's client),
+                the executor of the collection if None.
+            shard (int): Shard of the call, None if the calls are not sharded.
+
+        Returns:
+            ResponseHandle: Handle used by the tests to get the response.
+        """
+        handle = ResponseHandle(self, len(self.handles), job, uses, executor or self.executor, shard)
+        self.handles.append(handle)
+        if shard is not None:
+            self.shards.setdefault(shard, []).append(handle)
+        return handle
+
+    def prefetch_after(self, index: int) -> None:
+        """
+        Starts sending the API calls in the prefetch window following the given position, or all the calls
+        of its shard if they were not started yet.
+
+        Args:
+            index (int): Position of the handle whose response is being acquired.
+        """
+        if self._prefetch_pool:
+            handle = self.handles[index]
+            if self.shard_prefetch and handle.shard is not None:
+                with self._lock:
+                    if handle.shard in self._started_shards:
+                        return
+                    self._started_shards.add(handle.shard)
+                for shard_handle in [handle, *self.shards[handle.shard]]:
+                    shard_handle.start(self._prefetch_pool)
+                return
+            for handle in self.handles[index + 1 : index + 1 + self.prefetch_window]:
+                handle.start(self._prefetch_pool)
+
+
+class ResponseHandle:
+    """
+    This class is a lightweight descriptor of a planned API call. The request is sent when a test first needs
+    its response, or earlier by the prefetcher, and the response is released once every test using it is done.
+    """
+
+    def __init__(
+        self,
+        collection: LazyResponses,
+        index: int,
+        job: tuple,
+        uses: int,
+        executor: RequestExecutor,
+        shard: int | None = None,
+    ):
+        """
+        Initialize the ResponseHandle.
+
+        Args:
+            collection (LazyResponses): Collection the handle belongs to.
+            index (int): Position of the handle in the collection.
+            job (tuple): Tuple of method, uri and keyword arguments for send_request.
+            uses (int): Number of tests which need the response of this call.
+            executor (RequestExecutor): Executor sending the call.
+            shard (int): Shard of the call, None if the calls are not sharded.
+        """
+        self.collection = collection
+        self.executor = executor
+        self.index = index
+        self.job = job
+        self.uses = uses
+        self.shard = shard
+        self._future = None
+        self._response = None
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        method, uri, _ = self.job
+        return f"ResponseHandle({method} {uri})"
+
+    def start(self, pool: ThreadPoolExecutor) -> None:
+        """
+        Starts sending the request in the given pool unless it was already sent or released.
+
+        Args:
+            pool (ThreadPoolExecutor): Pool used to send the request in the background.
+        """
+        with self._lock:
+            if self._future is None and self._response is None and self.uses > 0:
+                self._future = pool.submit(self.executor.send, self.job)
+
+    def acquire(self):
+        """
+        Returns the response of the planned API call, sending the request if it was not prefetched.
+
+        Returns:
+            The HTTP response object.
+        """
+        self.collection.prefetch_after(self.index)
+        with self._lock:
+            if self._response is None:
+                if self._future is not None:
+                    self._response = self._future.result()
+                    self._future = None
+                else:
+                    self._response = self.executor.send(self.job)
+            return self._response
+
+    def release(self) -> None:
+        """
+        Marks one of the tests using the response as done, dropping the response after the last one.
+        """
+        with self._lock:
+            self.uses -= 1
+            if self.uses <= 0:
+                self._response = None
+
+
+class RequestMemo:
+    """
+    This class remembers the planned API calls by their fingerprint, so identical idempotent calls are sent
+    once per run and their response is shared by every test and user that needs it.
+    """
+
+    def __init__(self, methods: list):
+        """
+        Initialize the RequestMemo with the HTTP methods which can be deduplicated.
+
+        Args:
+            methods (list): HTTP methods whose identical calls are sent only once (e.g., 'get', 'head').
+        """
+        self.methods = {method.lower() for method in methods}
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def fingerprint(job: tuple, auth_headers: dict | None = None) -> str:
+        """
+        Returns a canonical fingerprint of a planned API call.
+
+        Args:
+            job (tuple): Tuple of method, uri and keyword arguments for send_request.
+            auth_headers (dict): Authentication headers of the user of the call when it is planned.
+
+        Returns:
+            str: Fingerprint made of the method, uri, params, body and headers of the call.
+        """
+        method, uri, settings = job
+        headers = {**settings.get('headers', {}), **(auth_headers or {})}
+        return json.dumps(
+            [method.lower(), uri, settings.get('params'), settings.get('json'), headers],
+            sort_keys=True,
+            default=str,
+        )
+
+    def is_cacheable(self, api: dict) -> bool:
+        """
+        Checks whether the given API call may share its response.
+
+        Args:
+            api (dict): The 'api' section of a test JSON, 'dedupe': false opts the call out.
+
+        Returns:
+            bool: True if the method is deduplicated and the call did not opt out.
+        """
+        return api['method'].lower() in self.methods and api.get('dedupe', True)
+
+    def summary(self) -> str:
+        """
+        Returns a one line summary of the memo usage.
+        """
+        return f"Request deduplication: {self.hits} hits, {self.misses} misses, {len(self.entries)} unique requests"
@@ -0,0 +1,238 @@
+"""
+This file has the LoadRunner class which drives the API calls of a test group at a target rate or concurrency,
+and the LatencySampler class which measures the latency distribution of a single API call
+"""
+
+import time
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from rest_tester.logger import logger
+from rest_tester.modules.execution_module import FailedResponse, RequestExecutor
+from rest_tester.utils.latency_histogram import LatencyHistogram
+
+load_percentiles = [50, 90, 95, 99]
+
+
+class LatencyRecorder:
+    """
+    This class keeps the latencies of the load test calls in a LatencyHistogram per uri.
+    """
+
+    def __init__(self):
+        self.histograms = {}
+        self.errors = {}
+        self._lock = threading.Lock()
+
+    def record(self, uri: str, latency: float, failed: bool = False) -> None:
+        """
+        Records the latency of one call.
+
+        Args:
+            uri (str): API endpoint of the call.
+            latency (float): Seconds from the intended send time of the call to its response.
+            failed (bool): Whether the call failed at the transport level.
+        """
+        with self._lock:
+            histogram = self.histograms.setdefault(uri, LatencyHistogram())
+            if failed:
+                self.errors[uri] = self.errors.get(uri, 0) + 1
+        histogram.record(latency)
+
+    def summary(self, duration: float) -> dict:
+        """
+        Returns the statistics of the recorded latencies.
+
+        Args:
+            duration (float): Seconds the load test ran for.
+
+        Returns:
+            dict: Count, errors, achieved rate, percentiles and maximum in seconds per uri.
+        """
+        summary = {}
+        for uri, histogram in self.histograms.items():
+            summary[uri] = {
+                'count': histogram.count,
+                'errors': self.errors.get(uri, 0),
+                'rps': histogram.count / duration if duration else 0.0,
+                **{f'p{percent}': histogram.value_at_percentile(percent) for percent in load_percentiles},
+                'max': histogram.value_at_percentile(100),
+            }
+        return summary
+
+
+class LatencySampler:
+    """
+    This class measures the latency distribution of a planned API call by sending it repeatedly, one call at a time,
+    after a few warmup calls. The calls are sent once, when the first latency test of the call needs them, and the
+    distribution is shared by all the latency tests of the call.
+    """
+
+    def __init__(self, executor: RequestExecutor | None, job: tuple | None, warmup: int = 0, samples: int = 20):
+        """
+        Initialize the LatencySampler.
+
+        Args:
+            executor (RequestExecutor): Executor sending the calls.
+            job (tuple): Tuple of method, uri and keyword arguments for send_request.
+            warmup (int): Number of calls sent before measuring, their latency is not recorded.
+            samples (int): Number of calls whose latency is recorded.
+        """
+        self.executor = executor
+        self.job = job
+        self.warmup = warmup
+        self.samples = samples
+        self.histogram = None
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_histogram(cls, histogram: LatencyHistogram, errors: int = 0) -> "LatencySampler":
+        """
+        Returns a sampler of an already measured distribution (e.g., the one of a load test).
+        """
+        sampler = cls(None, None, 0, histogram.count)
+        sampler.histogram = histogram
+        sampler.errors = errors
+        return sampler
+
+    def measure(self) -> LatencyHistogram:
+        """
+        Returns the latency distribution of the call, sending the calls on first use.
+
+        Returns:
+            LatencyHistogram: The latencies of the measured calls.
+        """
+        with self._lock:
+            if self.histogram is None:
+                for _ in range(self.warmup):
+                    self.executor.send(self.job)
+                histogram = LatencyHistogram()
+                for _ in range(self.samples):
+                    start = time.perf_counter()
+                    response = self.executor.send(self.job)
+                    histogram.record(time.perf_counter() - start)
+                    self.errors += isinstance(response, FailedResponse)
+                self.histogram = histogram
+            return self.histogram
+
+
+class LoadRunner:
+    """
+    This class sends the API calls of a test group over and over for a duration, either at a target rate with an
+    open-loop scheduler or with a fixed number of calls in flight. In "rps" mode latencies are measured from the
+    time each call was scheduled, so a slow server cannot hide its latency by delaying the calls (coordinated
+    omission). A sample of the responses is kept so the tests can be evaluated on them.
+    """
+
+    def __init__(
+        self,
+        executor: RequestExecutor,
+        mode: str = 'rps',
+        rps: float = 10,
+        concurrency: int = 10,
+        duration: float = 30,
+        sample_rate: float = 0.01,
+        max_samples: int = 5,
+    ):
+        """
+        Initialize the LoadRunner.
+
+        Args:
+            executor (RequestExecutor): Executor sending the calls.
+            mode (str): "rps" to send 'rps' calls per second, "concurrency" to keep 'concurrency' calls in flight.
+            rps (float): Target number of calls per second in "rps" mode.
+            concurrency (int): Number of calls in flight in "concurrency" mode, maximum in flight in "rps" mode.
+            duration (float): Seconds the calls are sent for.
+            sample_rate (float): Fraction of the responses of each call kept for the tests.
+            max_samples (int): Maximum number of responses kept per call.
+        """
+        if mode not in ('rps', 'concurrency'):
+            raise ValueError(f"Invalid load mode: {mode}")
+        self.executor = executor
+        self.mode = mode
+        self.rps = rps
+        self.concurrency = max(1, concurrency or 1)
+        self.duration = duration
+        self.sample_interval = max(1, round(1 / sample_rate)) if sample_rate else None
+        self.max_samples = max_samples
+        self.recorder = LatencyRecorder()
+        self.elapsed = 0.0
+        self._counts = []
+        self._samples = []
+        self._lock = threading.Lock()
+
+    def send(self, jobs: list, index: int, intended_start: float) -> None:
+        """
+        Sends one call, records its latency from the intended start and keeps the response if it is sampled.
+
+        Args:
+            jobs (list): The planned calls of the group.
+            index (int): Position of the call to send in the jobs.
+            intended_start (float): time.perf_counter() value at which the call was meant to be sent.
+        """
+        _, uri, _ = jobs[index]
+        response = self.executor.send(jobs[index])
+        self.recorder.record(uri, time.perf_counter() - intended_start, isinstance(response, FailedResponse))
+        with self._lock:
+            count = self._counts[index]
+            self._counts[index] += 1
+            sampled = self.sample_interval and count % self.sample_interval == 0
+            if sampled and len(self._samples[index]) < self.max_samples:
+                self._samples[index].append(response)
+
+    def run_open_loop(self, jobs: list) -> None:
+        interval = 1 / self.rps
+        total_calls = int(self.duration * self.rps)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='load') as pool:
+            for call_number in range(total_calls):
+                intended_start = start + call_number * interval
+                delay = intended_start - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(self.send, jobs, call_number % len(jobs), intended_start)
+
+    def run_closed_loop(self, jobs: list) -> None:
+        end = time.perf_counter() + self.duration
+        call_numbers = itertools.count()
+        call_numbers_lock = threading.Lock()
+
+        def worker():
+            while time.perf_counter() < end:
+                with call_numbers_lock:
+                    call_number = next(call_numbers)
+                self.send(jobs, call_number % len(jobs), time.perf_counter())
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='load') as pool:
+            for _ in range(self.concurrency):
+                pool.submit(worker)
+
+    def run(self, jobs: list) -> list:
+        """
+        Sends the given calls in a round robin for the duration.
+
+        Args:
+            jobs (list): List of tuples of method, uri and keyword arguments for send_request.
+
+        Returns:
+            list: The sampled responses of each call, in the same order as the given jobs.
+        """
+        self._counts = [0] * len(jobs)
+        self._samples = [[] for _ in jobs]
+        if jobs:
+            logger.info("Load testing %s calls in %s mode for %ss", len(jobs), self.mode, self.duration)
+            start = time.perf_counter()
+            if self.mode == 'rps':
+                self.run_open_loop(jobs)
+            else:
+                self.run_closed_loop(jobs)
+            self.elapsed = time.perf_counter() - start
+        return self._samples
+
+    def summary(self) -> dict:
+        """
+        Returns the latency statistics per uri of the last run.
+        """
+        return self.recorder.summary(self.elapsed)
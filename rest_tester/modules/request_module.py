@@ -2,12 +2,178 @@
 This file has the RequestSender class with its methods
 """
 
+import time
+import socket
+import asyncio
+import contextlib
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlparse
+
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.retry import Retry
 from rest_tester.logger import logger
+from rest_tester.utils.structured_logging import Preview, request_sampler
+
+request_timings = threading.local()
+ 
+def get_request_timings(start: float, end: float, phases: dict) -> dict:
+    """
+    Builds the timing breakdown of a request from the perf_counter() times of its phases.
+ 
+    Args:
+        start (float): Time the request started.
+        end (float): Time the response body was read.
+        phases (dict): Durations of 'dns', 'connect' and 'tls' of a new connection, and the times
+            'request_sent' and 'headers_received', missing phases are left as None.
+ 
+    Returns:
+        dict: Seconds spent in 'dns', 'connect', 'tls', 'ttfb' (from the request sent to the response headers),
+            'download' (reading the body) and 'total', and whether the connection was 'reused' from the pool.
+    """
+    request_sent = phases.get('request_sent')
+    headers_received = phases.get('headers_received')
+    return {
+        'dns': phases.get('dns'),
+        'connect': phases.get('connect'),
+        'tls': phases.get('tls'),
+        'ttfb': headers_received - request_sent if request_sent and headers_received else None,
+        'download': end - headers_received if headers_received else None,
+        'total': end - start,
+        'reused': 'connect' not in phases,
+    }
+ 
+class TimedConnectionMixin:
+    """
+    Mixin of the urllib3 connection classes recording the DNS, connect and TLS durations of new connections and
+    the times the request is sent and its response headers are received, for the request sent by the current thread.
+    """
+ 
+    def _new_conn(self) -> socket.socket:
+        phases = getattr(request_timings, 'phases', None)
+        if phases is None:
+            return super()._new_conn()
+        start = time.perf_counter()
+        dns_host = self._dns_host
+        try:
+            addresses = list(dict.fromkeys(info[4][0] for info in socket.getaddrinfo(dns_host, self.port, type=socket.SOCK_STREAM)))
+        except socket.gaierror:
+            addresses = [dns_host]
+        resolved = time.perf_counter()
+        phases['dns'] = resolved - start
+        try:
+            for position, address in enumerate(addresses):
+                self._dns_host = address
+                try:
+                    sock = super()._new_conn()
+                    break
+                except NewConnectionError:
+                    if position == len(addresses) - 1:
+                        raise
+        finally:
+            self._dns_host = dns_host
+        phases['connect'] = time.perf_counter() - resolved
+        return sock
+ 
+    def request(self, *args, **kwargs) -> None:
+        super().request(*args, **kwargs)
+        phases = getattr(request_timings, 'phases', None)
+        if phases is not None:
+            phases['request_sent'] = time.perf_counter()
+ 
+    def getresponse(self):
+        response = super().getresponse()
+        phases = getattr(request_timings, 'phases', None)
+        if phases is not None:
+            phases['headers_received'] = time.perf_counter()
+        return response
+ 
+class TimedHTTPConnection(TimedConnectionMixin, HTTPConnection):
+    pass
+ 
+class TimedHTTPSConnection(TimedConnectionMixin, HTTPSConnection):
+    def connect(self) -> None:
+        start = time.perf_counter()
+        super().connect()
+        phases = getattr(request_timings, 'phases', None)
+        if phases is not None and 'connect' in phases:
+            phases['tls'] = max(0.0, time.perf_counter() - start - phases['dns'] - phases['connect'])
+ 
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+ 
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+ 
+class TimedHTTPAdapter(HTTPAdapter):
+    """
+    This adapter creates its connections from the timed urllib3 connection classes.
+    """
+ 
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {'http': TimedHTTPConnectionPool, 'https': TimedHTTPSConnectionPool}
+ 
+def send_timed_request(session: requests.Session, method: str, url: str, **kwargs) -> requests.Response:
+    """
+    Sends a request with the session, setting the timing breakdown of the request as the 'timings' of the response.
+ 
+    Args:
+        session (requests.Session): Session with a TimedHTTPAdapter mounted.
+        method (str): HTTP method (e.g., 'GET', 'POST').
+        url (str): Url of the request.
+        **kwargs: Additional arguments to pass to the requests method.
+ 
+    Returns:
+        requests.Response: The HTTP response object.
+    """
+    request_timings.phases = phases = {}
+    start = time.perf_counter()
+    try:
+        response = session.request(method, url, **kwargs)
+        response.timings = get_request_timings(start, time.perf_counter(), phases)
+        return response
+    finally:
+        request_timings.phases = None
+ 
+def build_session(config) -> requests.Session:
+    """
+    Builds a session whose connection pools, keep-alive and retries follow the configurations.
+ 
+    Args:
+        config (dict): Configuration dictionary containing the connection pool settings.
+ 
+    Returns:
+        requests.Session: Session with the configured adapter mounted for http and https.
+    """
+    session = requests.Session()
+    retries = Retry(
+        total=config.max_retries,
+        read=False,
+        backoff_factor=config.retry_backoff_factor,
+        status_forcelist=config.retry_status_forcelist,
+        raise_on_status=False,
+    )
+    adapter = TimedHTTPAdapter(
+        pool_connections=config.pool_connections, pool_maxsize=config.pool_maxsize, max_retries=retries
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if not config.keep_alive:
+        session.headers['Connection'] = 'close'
+    if config.http2:
+        logger.warning('HTTP/2 is only supported by the "async" request method, using HTTP/1.1')
+    return session
  
 class APIClient:
     """
     This class handles HTTP requests using the requests library and configurations provided.
+    Connections are pooled, but no cookies are kept between requests.
     """
  
     def __init__(self, config):
@@ -17,7 +183,8 @@ class APIClient:
         Args:
             config (dict): Configuration dictionary containing 'base_url', 'verify_ssl', and optional 'headers'.
         """
-        self.session = requests.Session()
+        self.session = build_session(config)
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
         self.base_url = config.base_url
         self.verify_ssl = config.verify_ssl
         self.headers = {}
@@ -29,48 +196,225 @@ class APIClient:
         Args:
             method (str): HTTP method (e.g., 'GET', 'POST').
             endpoint (str): API endpoint to send the request to.
-            **kwargs: Additional arguments to pass to the requests method.
+            **kwargs: Additional arguments to pass to the requests method, 'headers' are added to the client headers.
  
         Returns:
             requests.Response: The HTTP response object.
         """
         url = self.base_url + endpoint
+        headers = {**self.headers, **kwargs.pop('headers', {})}
+        request_id, sampled = request_sampler.next_request()
+        request_fields = {'request_id': request_id, 'method': method, 'url': url}
         try:
-            logger.info(f'Sending {method} request to {url} with headers {self.headers} and params {kwargs}')
-            with requests.request(method, url, verify=self.verify_ssl, headers=self.headers, **kwargs) as response:
-                logger.info(f'Received response: {response.status_code} for {url}')
+            if sampled:
+                logger.info('Sending %s request to %s with headers %s and params %s', method, url, Preview(headers),
+                            Preview(kwargs), extra=request_fields)
+            with send_timed_request(self.session, method, url, verify=self.verify_ssl, headers=headers, **kwargs) as response:
+                if sampled:
+                    logger.info('Received response: %s for %s', response.status_code, url, extra={
+                        **request_fields, 'status_code': response.status_code, 'elapsed': response.timings['total']})
                 return response
         except requests.exceptions.RequestException as e:
-            logger.error(f'Error occurred during request to {url}: {e}')
+            logger.error('Error occurred during request to %s: %s', url, e, extra=request_fields)
             raise
  
+    def close(self) -> None:
+        """
+        Close the pooled connections of the session.
+        """
+        self.session.close()
+ 
 class SessionAPIClient(APIClient):
     """
-    This class handles HTTP requests using a persistent session.
+    This class handles HTTP requests using a persistent session, cookies are kept between requests.
+    Requests are sent by the send_request of APIClient.
     """
  
-    def send_request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+    def __init__(self, config):
         """
-        Send an HTTP request using a session.
+        Initialize the SessionAPIClient with configurations, keeping the cookies APIClient drops.
+ 
+        Args:
+            config (dict): Configuration dictionary containing 'base_url', 'verify_ssl', and optional 'headers'.
+        """
+        super().__init__(config)
+        self.session.cookies.set_policy(DefaultCookiePolicy())
+ 
+def start_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Starts a new event loop running forever on a daemon thread.
+ 
+    Returns:
+        asyncio.AbstractEventLoop: The running event loop.
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name='async-api-client', daemon=True).start()
+    return loop
+ 
+class AsyncAPIClient:
+    """
+    This class handles HTTP requests using an asyncio based client running on its own event loop.
+    Redirects are followed like the requests based clients do.
+    """
+ 
+    def __init__(self, config, loop: asyncio.AbstractEventLoop | None = None):
+        """
+        Initialize the AsyncAPIClient with configurations and start its event loop thread.
+ 
+        Args:
+            config (dict): Configuration dictionary containing 'base_url', 'verify_ssl', and optional 'headers'.
+            loop (asyncio.AbstractEventLoop): Running event loop shared with other clients, a new one is started if None.
+        """
+        self.base_url = config.base_url
+        self.verify_ssl = config.verify_ssl
+        self.http2 = config.http2
+        self.headers = {}
+        self.limits = httpx.Limits(
+            max_connections=config.pool_connections * config.pool_maxsize,
+            max_keepalive_connections=config.pool_connections * config.pool_maxsize if config.keep_alive else 0,
+        )
+        self.max_retries = config.max_retries
+        self.client = None
+        self.owns_loop = loop is None
+        self.loop = loop or start_event_loop()
+ 
+    def get_client(self) -> httpx.AsyncClient:
+        """
+        Returns the underlying client, creating it inside the event loop on first use.
+ 
+        Returns:
+            httpx.AsyncClient: The client shared by all requests of this instance.
+        """
+        if self.client is None:
+            transport = httpx.AsyncHTTPTransport(
+                verify=self.verify_ssl, http2=self.http2, limits=self.limits, retries=self.max_retries
+            )
+            self.client = httpx.AsyncClient(transport=transport, follow_redirects=True)
+        return self.client
+ 
+    async def async_send_request(self, method: str, endpoint: str, **kwargs) -> httpx.Response:
+        """
+        Send an HTTP request from the event loop.
  
         Args:
             method (str): HTTP method (e.g., 'GET', 'POST').
             endpoint (str): API endpoint to send the request to.
-            **kwargs: Additional arguments to pass to the requests method.
+            **kwargs: Additional arguments to pass to the request method, 'headers' are added to the client headers.
  
         Returns:
-            requests.Response: The HTTP response object.
+            httpx.Response: The HTTP response object.
         """
         url = self.base_url + endpoint
+        headers = {**self.headers, **kwargs.pop('headers', {})}
+        if isinstance(kwargs.get('timeout'), tuple):
+            connect_timeout, read_timeout = kwargs['timeout']
+            kwargs['timeout'] = httpx.Timeout(read_timeout, connect=connect_timeout)
+        events = {}
+
+        async def trace(event_name: str, info: dict) -> None:
+            events[event_name.split('.', 1)[1] if event_name.startswith('http') else event_name] = time.perf_counter()
+
+        request_id, sampled = request_sampler.next_request()
+        request_fields = {'request_id': request_id, 'method': method, 'url': url}
         try:
-            logger.info(f'Sending {method} request to {url} with headers {self.headers} and params {kwargs}')
-            with self.session.request(method, url, verify=self.verify_ssl, headers=self.headers, **kwargs) as response:
-                logger.info(f'Received response: {response.status_code} for {url}')
-                return response
-        except requests.exceptions.RequestException as e:
-            logger.error(f'Error occurred during request to {url}: {e}')
+            if sampled:
+                logger.info('Sending %s request to %s with headers %s and params %s', method, url, Preview(headers),
+                            Preview(kwargs), extra=request_fields)
+            start = time.perf_counter()
+            response = await self.get_client().request(
+                method, url, headers=headers, extensions={'trace': trace}, **kwargs
+            )
+            response.timings = get_request_timings(start, time.perf_counter(), self.get_trace_phases(events))
+            if sampled:
+                logger.info('Received response: %s for %s', response.status_code, url, extra={
+                    **request_fields, 'status_code': response.status_code, 'elapsed': response.timings['total']})
+            return response
+        except httpx.HTTPError as e:
+            logger.error('Error occurred during request to %s: %s', url, e, extra=request_fields)
             raise
  
+    @staticmethod
+    def get_trace_phases(events: dict) -> dict:
+        """
+        Returns the phases of a request from the times of its httpcore trace events. The DNS lookup is part of the
+        'connect' phase, httpcore does not trace it on its own.
+ 
+        Args:
+            events (dict): perf_counter() time of each trace event, without the 'http11.' or 'http2.' prefix.
+ 
+        Returns:
+            dict: The phases for get_request_timings.
+        """
+        phases = {}
+        if 'connection.connect_tcp.complete' in events:
+            phases['connect'] = events['connection.connect_tcp.complete'] - events['connection.connect_tcp.started']
+        if 'connection.start_tls.complete' in events:
+            phases['tls'] = events['connection.start_tls.complete'] - events['connection.start_tls.started']
+        phases['request_sent'] = events.get('send_request_body.complete')
+        phases['headers_received'] = events.get('receive_response_headers.complete')
+        return phases
+ 
+    def send_request(self, method: str, endpoint: str, **kwargs) -> httpx.Response:
+        """
+        Send an HTTP request and wait for its response.
+ 
+        Args:
+            method (str): HTTP method (e.g., 'GET', 'POST').
+            endpoint (str): API endpoint to send the request to.
+            **kwargs: Additional arguments to pass to the request method, 'headers' are added to the client headers.
+ 
+        Returns:
+            httpx.Response: The HTTP response object.
+        """
+        return asyncio.run_coroutine_threadsafe(self.async_send_request(method, endpoint, **kwargs), self.loop).result()
+ 
+    def send_requests(self, jobs: list, limits, prepare=None, on_error=None) -> list:
+        """
+        Send many HTTP requests concurrently from the event loop.
+ 
+        Args:
+            jobs (list): List of tuples of method, endpoint and keyword arguments for the request.
+            limits (RequestLimits): Limits on the requests in flight, overall and per host, shared with the
+                requests of the other clients on the event loop.
+            prepare (callable): Called with each job when it is about to be sent, returns the job to send or None
+                to fail it without sending (e.g., once a deadline passed).
+            on_error (callable): Called with the job, the transport error and the elapsed seconds of a failed
+                request, its result replaces the response. Errors are raised if None.
+ 
+        Returns:
+            list: Responses in the same order as the given jobs.
+        """
+        async def gather():
+            async def send(job):
+                in_flight = limits.async_in_flight or contextlib.nullcontext()
+                host_limit = limits.get_async_host_limit(urlparse(self.base_url + job[1]).netloc) or contextlib.nullcontext()
+                async with in_flight, host_limit:
+                    prepared_job = prepare(job) if prepare else job
+                    if prepared_job is None:
+                        return on_error(job, TimeoutError("Run deadline exceeded"), 0.0)
+                    method, endpoint, settings = prepared_job
+                    start = time.perf_counter()
+                    try:
+                        return await self.async_send_request(method, endpoint, **settings)
+                    except httpx.HTTPError as error:
+                        if on_error is None:
+                            raise
+                        return on_error(job, error, time.perf_counter() - start)
+
+            return await asyncio.gather(*(send(job) for job in jobs))
+
+        return asyncio.run_coroutine_threadsafe(gather(), self.loop).result()
+ 
+    def close(self) -> None:
+        """
+        Close the underlying client and stop the event loop thread.
+        """
+        if self.client is not None:
+            asyncio.run_coroutine_threadsafe(self.client.aclose(), self.loop).result()
+            self.client = None
+        if self.owns_loop:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+ 
 def get_api_client(config):
     """
     Factory function to get the appropriate API client based on the configuration.
@@ -84,8 +428,58 @@ def get_api_client(config):
     api_clients = {
         'basic': APIClient,
         'session': SessionAPIClient,
+        'async': AsyncAPIClient,
     }
     api_client_class = api_clients.get(config.request_method)
     if not api_client_class:
         raise ValueError(f"Invalid request method: {config.request_method}")
     return api_client_class(config)
+ 
+class APIClientFactory:
+    """
+    This class builds isolated api clients, each with its own connection pool and headers, so users can run in
+    parallel without sharing authentication headers. The "async" clients share one event loop thread, which is
+    stopped when the factory is closed.
+    """
+ 
+    def __init__(self, config):
+        """
+        Initialize the APIClientFactory with configurations.
+ 
+        Args:
+            config (dict): Configuration dictionary containing 'request_method' and other settings.
+        """
+        self.config = config
+        self.loop = None
+        self.clients = []
+        self._lock = threading.Lock()
+ 
+    def create(self):
+        """
+        Builds a new api client.
+ 
+        Returns:
+            APIClient: A new instance of the api client class selected by 'request_method'.
+        """
+        if self.config.request_method != 'async':
+            api_client = get_api_client(self.config)
+        else:
+            with self._lock:
+                if self.loop is None:
+                    self.loop = start_event_loop()
+            api_client = AsyncAPIClient(self.config, self.loop)
+        with self._lock:
+            self.clients.append(api_client)
+        return api_client
+ 
+    def close(self) -> None:
+        """
+        Close every api client built by the factory and stop the shared event loop thread.
+        """
+        with self._lock:
+            clients, self.clients = self.clients, []
+        for api_client in clients:
+            api_client.close()
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.loop = None
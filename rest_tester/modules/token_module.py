@@ -0,0 +1,392 @@
+"""
+This file has the token providers which acquire and refresh the user tokens, and the TokenManager keeping them
+"""
+
+import os
+import json
+import time
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from rest_tester.logger import logger
+from rest_tester.configs.constants import conversion_cache_dir, token_cache_file, token_fetch_workers
+from rest_tester.modules.auth_module import decode_jwt_claims
+from rest_tester.utils.conversion_cache import get_content_hash
+
+
+class TokenProvider(ABC):
+    """
+    Base class of the token providers. A provider returns the token of a user as a dict with its 'token',
+    its optional 'refresh_token' and its 'expires_at' timestamp, None when the expiry is unknown.
+    """
+
+    cacheable = True
+
+    def __init__(self, settings: dict, config):
+        """
+        Initialize the TokenProvider.
+
+        Args:
+            settings (dict): The 'auth' settings of the user.
+            config: Options of the run, used for the base url and SSL verification.
+        """
+        self.settings = settings
+        self.config = config
+
+    @abstractmethod
+    def fetch(self) -> dict:
+        """
+        Acquires a new token.
+
+        Returns:
+            dict: The token info with 'token', 'refresh_token' and 'expires_at'.
+        """
+
+    def refresh(self, token_info: dict) -> dict:
+        """
+        Refreshes the given token, acquiring a new one unless the provider supports refresh tokens.
+
+        Args:
+            token_info (dict): The current token info.
+
+        Returns:
+            dict: The new token info.
+        """
+        return self.fetch()
+
+    def send(self, method: str, uri: str, **kwargs) -> dict:
+        """
+        Sends a request to the token endpoint and returns its JSON body.
+
+        Args:
+            method (str): HTTP method of the token endpoint.
+            uri (str): Absolute url or API endpoint relative to the base url.
+            **kwargs: Additional arguments for requests.request (e.g., 'json', 'data').
+
+        Returns:
+            dict: The JSON body of the response.
+        """
+        url = uri if uri.startswith(('http://', 'https://')) else self.config.base_url + uri
+        response = requests.request(
+            method, url, verify=self.config.verify_ssl, timeout=self.settings.get('timeout', 30), **kwargs
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def get_token_info(self, payload: dict, token_field: str, refresh_token_field: str, expires_in_field: str) -> dict:
+        """
+        Builds the token info from the JSON body of a token endpoint.
+
+        The expiry is taken from the expires in field of the body, or from the 'exp' claim if the token is a JWT.
+
+        Args:
+            payload (dict): The JSON body of the token endpoint.
+            token_field (str): Name of the field holding the token.
+            refresh_token_field (str): Name of the field holding the refresh token.
+            expires_in_field (str): Name of the field holding the lifetime of the token in seconds.
+
+        Returns:
+            dict: The token info with 'token', 'refresh_token' and 'expires_at'.
+        """
+        token = payload[token_field]
+        expires_at = None
+        if payload.get(expires_in_field):
+            expires_at = time.time() + float(payload[expires_in_field])
+        else:
+            try:
+                expires_at = decode_jwt_claims(token).get('exp')
+            except ValueError:
+                pass
+        return {'token': token, 'refresh_token': payload.get(refresh_token_field), 'expires_at': expires_at}
+
+
+class StaticTokenProvider(TokenProvider):
+    """
+    This class returns the static token configured for the user.
+    """
+
+    cacheable = False
+
+    def __init__(self, settings: dict, config, token: str):
+        """
+        Initialize the StaticTokenProvider with the token of the user.
+        """
+        super().__init__(settings, config)
+        self.token = token
+
+    def fetch(self) -> dict:
+        return {'token': self.token, 'refresh_token': None, 'expires_at': None}
+
+
+class LoginTokenProvider(TokenProvider):
+    """
+    This class acquires the token from a login endpoint with the user credentials (e.g., dummyjson '/auth/login')
+    and refreshes it through the refresh endpoint when one is configured.
+    """
+
+    def fetch(self) -> dict:
+        payload = self.send(
+            self.settings.get('method', 'post'), self.settings.get('uri', '/auth/login'), json=self.settings['data']
+        )
+        return self.get_login_token_info(payload)
+
+    def refresh(self, token_info: dict) -> dict:
+        refresh_uri = self.settings.get('refresh_uri')
+        if not (refresh_uri and token_info.get('refresh_token')):
+            return self.fetch()
+        refresh_token_field = self.settings.get('refresh_token_field', 'refreshToken')
+        data = {**self.settings.get('refresh_data', {}), refresh_token_field: token_info['refresh_token']}
+        try:
+            payload = self.send(self.settings.get('refresh_method', 'post'), refresh_uri, json=data)
+        except (requests.RequestException, ValueError) as error:
+            logger.info("Token refresh failed, logging in again: %s", error)
+            return self.fetch()
+        return self.get_login_token_info(payload)
+
+    def get_login_token_info(self, payload: dict) -> dict:
+        return self.get_token_info(
+            payload,
+            self.settings.get('token_field', 'accessToken'),
+            self.settings.get('refresh_token_field', 'refreshToken'),
+            self.settings.get('expires_in_field', 'expiresIn'),
+        )
+
+
+class OAuth2TokenProvider(TokenProvider):
+    """
+    Base class of the OAuth2 token providers, sending form encoded grants to the 'token_url'.
+    """
+
+    def request_token(self, grant: dict) -> dict:
+        """
+        Sends a grant to the token endpoint and returns the token info.
+
+        Args:
+            grant (dict): The grant parameters (e.g., 'grant_type', 'refresh_token').
+
+        Returns:
+            dict: The token info with 'token', 'refresh_token' and 'expires_at'.
+        """
+        data = {**grant, 'client_id': self.settings.get('client_id')}
+        if self.settings.get('client_secret'):
+            data['client_secret'] = self.settings['client_secret']
+        if self.settings.get('scope'):
+            data['scope'] = self.settings['scope']
+        payload = self.send('post', self.settings['token_url'], data=data)
+        return self.get_token_info(payload, 'access_token', 'refresh_token', 'expires_in')
+
+    def refresh(self, token_info: dict) -> dict:
+        if not token_info.get('refresh_token'):
+            return self.fetch()
+        try:
+            return self.request_token({'grant_type': 'refresh_token', 'refresh_token': token_info['refresh_token']})
+        except (requests.RequestException, ValueError) as error:
+            logger.info("Token refresh failed, requesting a new token: %s", error)
+            return self.fetch()
+
+
+class ClientCredentialsTokenProvider(OAuth2TokenProvider):
+    """
+    This class acquires the token with the OAuth2 client credentials grant.
+    """
+
+    def fetch(self) -> dict:
+        return self.request_token({'grant_type': 'client_credentials'})
+
+
+class RefreshTokenProvider(OAuth2TokenProvider):
+    """
+    This class acquires the token with the OAuth2 refresh token grant from the configured refresh token.
+    """
+
+    def fetch(self) -> dict:
+        return self.request_token({'grant_type': 'refresh_token', 'refresh_token': self.settings['refresh_token']})
+
+
+def get_token_provider(user_config: dict, config) -> TokenProvider:
+    """
+    Returns the token provider of a user.
+
+    Args:
+        user_config (dict): The user settings, with its optional 'auth' settings and static 'token'.
+        config: Options of the run.
+
+    Returns:
+        TokenProvider: The provider selected by the 'provider' of the 'auth' settings, static by default.
+    """
+    settings = user_config.get('auth') or {}
+    provider = settings.get('provider', 'static')
+    if provider == 'static':
+        return StaticTokenProvider(settings, config, user_config.get('token', ''))
+    elif provider == 'login':
+        return LoginTokenProvider(settings, config)
+    elif provider == 'client_credentials':
+        return ClientCredentialsTokenProvider(settings, config)
+    elif provider == 'refresh_token':
+        return RefreshTokenProvider(settings, config)
+    raise ValueError(f"Unknown token provider: {provider}")
+
+
+class TokenManager:
+    """
+    This class acquires the tokens of all the users concurrently, keeps them in a disk cache with their expiry
+    and refreshes them in the background before they expire.
+    """
+
+    def __init__(self, users: list, config, cache: bool = True, refresh_margin: float = 60):
+        """
+        Initialize the TokenManager.
+
+        Args:
+            users (list): The user settings of the run.
+            config: Options of the run.
+            cache (bool): Whether the acquired tokens are kept on disk between runs.
+            refresh_margin (float): Seconds before the expiry at which a token is refreshed.
+        """
+        self.providers = [get_token_provider(user_config, config) for user_config in users]
+        self.tokens = [None] * len(self.providers)
+        self.cache_path = None
+        if cache and any(provider.cacheable for provider in self.providers):
+            self.cache_path = os.path.abspath(os.path.join(conversion_cache_dir, token_cache_file))
+        self.refresh_margin = refresh_margin
+        self._lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+        self._refresh_locks = [threading.Lock() for _ in self.providers]
+        self._stop = threading.Event()
+        self._thread = None
+
+    def get_cache_key(self, user_id: int) -> str:
+        return get_content_hash([type(self.providers[user_id]).__name__, self.providers[user_id].settings])
+
+    def is_due(self, token_info: dict | None) -> bool:
+        """
+        Checks whether a token is missing or expires within the refresh margin.
+        """
+        if not token_info or not token_info.get('token'):
+            return True
+        expires_at = token_info.get('expires_at')
+        return expires_at is not None and expires_at - self.refresh_margin <= time.time()
+
+    def load_cache(self) -> dict:
+        if not self.cache_path or not os.path.isfile(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as cache_file:
+                return json.load(cache_file)
+        except (OSError, json.JSONDecodeError) as error:
+            logger.info("Ignoring unreadable token cache %s: %s", self.cache_path, error)
+            return {}
+
+    def save_cache(self) -> None:
+        """
+        Writes the acquired tokens to the disk cache, readable only by the current user.
+        Nothing is written when no user has a token from a login or OAuth2 provider. The cache is written to a
+        unique temporary file first and then replaced, so pytest-xdist workers saving at the same time
+        never read a partly written cache.
+        """
+        if not self.cache_path:
+            return
+        with self._cache_lock:
+            cached_tokens = self.load_cache()
+            for user_id, provider in enumerate(self.providers):
+                if provider.cacheable and self.tokens[user_id]:
+                    cached_tokens[self.get_cache_key(user_id)] = self.tokens[user_id]
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            file_descriptor, temporary_path = tempfile.mkstemp(
+                suffix='.tmp', prefix=os.path.basename(self.cache_path) + '.', dir=os.path.dirname(self.cache_path)
+            )
+            with os.fdopen(file_descriptor, 'w', encoding='utf-8') as cache_file:
+                json.dump(cached_tokens, cache_file)
+            os.replace(temporary_path, self.cache_path)
+
+    def fetch(self, user_id: int) -> dict:
+        provider = self.providers[user_id]
+        try:
+            return provider.fetch()
+        except (requests.RequestException, KeyError, ValueError) as error:
+            raise Exception(f"Cannot acquire the token of user {user_id} with {type(provider).__name__}: {error}")
+
+    def fetch_all(self) -> None:
+        """
+        Acquires the tokens of all the users, reusing the cached tokens which are not due for refresh.
+        """
+        cached_tokens = self.load_cache()
+        pending_users = []
+        for user_id, provider in enumerate(self.providers):
+            token_info = cached_tokens.get(self.get_cache_key(user_id)) if provider.cacheable else None
+            if self.is_due(token_info):
+                pending_users.append(user_id)
+            else:
+                self.tokens[user_id] = token_info
+        if pending_users:
+            logger.info("Acquiring tokens for %s users", len(pending_users))
+            with ThreadPoolExecutor(max_workers=min(len(pending_users), token_fetch_workers)) as executor:
+                for user_id, token_info in zip(pending_users, executor.map(self.fetch, pending_users)):
+                    self.tokens[user_id] = token_info
+            self.save_cache()
+
+    def get_token(self, user_id: int) -> str:
+        with self._lock:
+            return self.tokens[user_id]['token']
+
+    def refresh(self, user_id: int, expired_token: str | None = None) -> str:
+        """
+        Refreshes the token of a user and returns the new token. The token endpoint is called outside of the
+        manager lock, so the tokens of the other users can be read meanwhile, and only once for concurrent
+        refreshes of the same user. Bound to a user id, it is the refresh hook of the user's Authenticator.
+
+        Args:
+            user_id (int): Position of the user in the users settings.
+            expired_token (str): The token to replace, nothing is refreshed if it was already replaced.
+
+        Returns:
+            str: The current token of the user.
+        """
+        with self._refresh_locks[user_id]:
+            with self._lock:
+                current_info = self.tokens[user_id]
+            if expired_token is not None and current_info and current_info['token'] != expired_token:
+                return current_info['token']
+            token_info = self.providers[user_id].refresh(current_info)
+            with self._lock:
+                self.tokens[user_id] = token_info
+            self.save_cache()
+            return token_info['token']
+
+    def refresh_due(self) -> float:
+        """
+        Refreshes the tokens which are due and returns the seconds until the next one is due. A failed refresh is
+        logged and retried on the next pass, and tokens refreshed without a known expiry are not refreshed again.
+        """
+        next_due = 60.0
+        for user_id, token_info in enumerate(self.tokens):
+            if token_info and token_info.get('expires_at') is not None and self.providers[user_id].cacheable:
+                try:
+                    if self.is_due(token_info):
+                        self.refresh(user_id, token_info['token'])
+                except Exception as error:
+                    logger.error("Background refresh of the token of user %s failed: %s", user_id, error)
+                    continue
+                expires_at = self.tokens[user_id].get('expires_at')
+                if expires_at is not None:
+                    next_due = min(next_due, expires_at - self.refresh_margin - time.time())
+        return max(next_due, 1.0)
+
+    def start(self) -> None:
+        """
+        Starts refreshing the expiring tokens on a background thread.
+        """
+        if self._thread is None and any(token_info and token_info.get('expires_at') for token_info in self.tokens):
+            self._thread = threading.Thread(target=self.run, name='token-refresh', daemon=True)
+            self._thread.start()
+
+    def run(self) -> None:
+        while not self._stop.wait(self.refresh_due()):
+            pass
+
+    def stop(self) -> None:
+        self._stop.set()
@@ -16,6 +16,42 @@ class Options:
     def verify_ssl(self):
         return self.options['http_request_settings'].get('verify_ssl', True)
     
+    @property
+    def connect_timeout(self):
+        return self.options['http_request_settings'].get('connect_timeout', 5)
+    
+    @property
+    def read_timeout(self):
+        return self.options['http_request_settings'].get('read_timeout', 60)
+    
+    @property
+    def pool_connections(self):
+        return self.options['http_request_settings'].get('pool_connections', 10)
+    
+    @property
+    def pool_maxsize(self):
+        return self.options['http_request_settings'].get('pool_maxsize', 10)
+    
+    @property
+    def keep_alive(self):
+        return self.options['http_request_settings'].get('keep_alive', True)
+    
+    @property
+    def max_retries(self):
+        return self.options['http_request_settings'].get('max_retries', 0)
+    
+    @property
+    def retry_backoff_factor(self):
+        return self.options['http_request_settings'].get('retry_backoff_factor', 0)
+    
+    @property
+    def retry_status_forcelist(self):
+        return self.options['http_request_settings'].get('retry_status_forcelist', [])
+    
+    @property
+    def http2(self):
+        return self.options['http_request_settings'].get('http2', False)
+    
     @property
     def dir_groups_to_test(self):
         return self.options['execution_settings']['dir_groups_to_test']
@@ -24,10 +60,102 @@ class Options:
     def auto_convert(self):
         return self.options['execution_settings'].get('auto_convert', False)
     
+    @property
+    def loader_workers(self):
+        return self.options['execution_settings'].get('loader_workers', 8)
+    
+    @property
+    def conversion_cache(self):
+        return self.options['execution_settings'].get('conversion_cache', True)
+    
+    @property
+    def conversion_workers(self):
+        return self.options['execution_settings'].get('conversion_workers', 1)
+    
+    @property
+    def conversion_seed(self):
+        return self.options['execution_settings'].get('conversion_seed')
+    
+    @property
+    def stream_specs(self):
+        return self.options['execution_settings'].get('stream_specs', False)
+    
+    @property
+    def run_deadline(self):
+        return self.options['execution_settings'].get('run_deadline')
+    
+    @property
+    def user_workers(self):
+        return self.options['execution_settings'].get('user_workers', 1)
+    
+    @property
+    def max_in_flight(self):
+        return self.options['execution_settings'].get('max_in_flight', 1)
+    
+    @property
+    def max_per_host(self):
+        return self.options['execution_settings'].get('max_per_host')
+    
+    @property
+    def lazy_collection(self):
+        return self.options['execution_settings'].get('collection_mode', 'eager') == 'lazy'
+    
+    @property
+    def prefetch_window(self):
+        return self.options['execution_settings'].get('prefetch_window', 0)
+    
+    @property
+    def shards_per_worker(self):
+        return self.options['execution_settings'].get('shards_per_worker', 2)
+    
+    @property
+    def deduplicate_requests(self):
+        return self.options['execution_settings'].get('deduplicate_requests', False)
+    
+    @property
+    def dedupe_methods(self):
+        return self.options['execution_settings'].get('dedupe_methods', ['get', 'head', 'options'])
+    
+    @property
+    def load_mode(self):
+        return self.options['execution_settings'].get('load_mode', 'off')
+    
+    @property
+    def load_rps(self):
+        return self.options['execution_settings'].get('load_rps', 10)
+    
+    @property
+    def load_concurrency(self):
+        return self.options['execution_settings'].get('load_concurrency', 10)
+    
+    @property
+    def load_duration(self):
+        return self.options['execution_settings'].get('load_duration', 30)
+    
+    @property
+    def load_sample_rate(self):
+        return self.options['execution_settings'].get('load_sample_rate', 0.01)
+    
+    @property
+    def load_max_samples(self):
+        return self.options['execution_settings'].get('load_max_samples', 5)
+    
+    @property
+    def schema_engine(self):
+        return self.options['execution_settings'].get('schema_engine', 'jsonschema')
+    
     @property
     def authentication_configs(self):
         return self.options['auth_settings']
     
+    @property
+    def token_cache(self):
+        return self.options['auth_settings'].get('token_cache', True)
+    
+    @property
+    def token_refresh_margin(self):
+        return self.options['auth_settings'].get('token_refresh_margin', 60)
+    
     @property
     def users(self):
         return self.options['user_tokens']
@@ -0,0 +1,129 @@
+"""
+This file contains the ConversionCache class which lets the OpenAPI/Postman converters skip unchanged work
+"""
+
+import os
+import json
+import hashlib
+
+from rest_tester.logger import logger
+from rest_tester.configs.constants import converter_version, conversion_cache_dir
+
+
+def get_content_hash(content) -> str:
+    """
+    Returns a hash of the given JSON serialisable content.
+
+    Args:
+        content: Any JSON serialisable value.
+
+    Returns:
+        str: SHA-256 of the canonical JSON of the content.
+    """
+    return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def get_file_hash(file_path: str) -> str:
+    """
+    Returns a hash of the given file, read in chunks.
+
+    Args:
+        file_path (str): Path of the file.
+
+    Returns:
+        str: SHA-256 of the file content.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ConversionCache:
+    """
+    This class keeps a manifest of a converted spec file, with the hash of the spec, the converter version, the
+    options changing the converted output and the hash of each generated group, so unchanged specs and groups
+    are not converted again.
+    """
+
+    def __init__(self, spec_path: str, options: dict | None = None):
+        """
+        Initialize the ConversionCache and load the manifest of the given spec file if any.
+
+        Args:
+            spec_path (str): Path of the OpenAPI spec or Postman collection.
+            options (dict): Conversion options changing the generated groups (e.g., 'conversion_seed'),
+                a manifest written with other options is not reused.
+        """
+        self.spec_path = spec_path
+        self.options = options or {}
+        self.manifest_path = os.path.join(
+            os.path.dirname(spec_path), conversion_cache_dir, os.path.basename(spec_path) + '.manifest.json'
+        )
+        self.spec_hash = get_file_hash(spec_path)
+        self.manifest = {}
+        self.groups = {}
+        if os.path.isfile(self.manifest_path):
+            try:
+                with open(self.manifest_path, 'r', encoding='utf-8') as manifest_file:
+                    self.manifest = json.load(manifest_file)
+            except (OSError, json.JSONDecodeError) as error:
+                logger.info(f"Ignoring unreadable conversion manifest {self.manifest_path}: {error}")
+        if self.manifest.get('converter_version') == converter_version and self.manifest.get('options', {}) == self.options:
+            self.groups = self.manifest.get('groups', {})
+
+    @property
+    def root_dir(self) -> str | None:
+        return self.manifest.get('root_dir')
+
+    def is_fresh(self) -> bool:
+        """
+        Checks whether the spec was already converted by this converter version with the same options and its
+        output still exists.
+
+        Returns:
+            bool: True if the conversion can be skipped.
+        """
+        return (
+            self.manifest.get('spec_hash') == self.spec_hash
+            and self.manifest.get('converter_version') == converter_version
+            and self.manifest.get('options', {}) == self.options
+            and bool(self.root_dir)
+            and all(os.path.isfile(path) for path in self.groups)
+        )
+
+    def is_group_unchanged(self, group_file: str, group_hash: str) -> bool:
+        """
+        Checks whether a group was generated from the same source and its file still exists.
+
+        Args:
+            group_file (str): Path of the tests.json of the group.
+            group_hash (str): Hash of the source the group is generated from.
+
+        Returns:
+            bool: True if the group does not need to be generated again.
+        """
+        return self.groups.get(group_file) == group_hash and os.path.isfile(group_file)
+
+    def save(self, root_dir: str, groups: dict) -> None:
+        """
+        Writes the manifest of the finished conversion.
+
+        Args:
+            root_dir (str): Root directory of the converted test groups.
+            groups (dict): Hash of the source of each generated tests.json, by its path.
+        """
+        self.manifest = {
+            'spec_hash': self.spec_hash,
+            'converter_version': converter_version,
+            'options': self.options,
+            'root_dir': root_dir,
+            'groups': groups,
+        }
+        self.groups = groups
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        temporary_path = self.manifest_path + '.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as manifest_file:
+            json.dump(self.manifest, manifest_file, indent=4)
+        os.replace(temporary_path, self.manifest_path)
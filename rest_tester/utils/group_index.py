@@ -0,0 +1,109 @@
+"""
+This file has the GroupIndex class which resolves the test groups selected by the users
+"""
+
+from fnmatch import fnmatchcase
+
+glob_characters = set('*?[')
+
+
+class GroupIndex:
+    """
+    This class keeps the test group paths in a prefix trie built once, so the groups selected by a list of
+    prefixes or glob patterns are resolved with one walk of the trie instead of splitting every group path.
+    """
+
+    def __init__(self, groups: list):
+        """
+        Initialize the GroupIndex with the paths of all the test groups.
+
+        Args:
+            groups (list): Paths of the test groups ending with '/' (e.g., 'group1/', 'group1/users/').
+        """
+        self.groups = list(groups)
+        self.root = {'children': {}, 'groups': []}
+        self._selections = {}
+        for position, group in enumerate(self.groups):
+            node = self.root
+            for segment in self.split(group):
+                node = node['children'].setdefault(segment, {'children': {}, 'groups': []})
+            node['groups'].append(position)
+
+    @staticmethod
+    def split(path: str) -> list:
+        """
+        Splits a group path or selector into its folder names, the root group '/' being the single name ''.
+        """
+        return path.rstrip('/').split('/')
+
+    def collect(self, node: dict, positions: set) -> None:
+        """
+        Adds the positions of all the groups in the subtree of the given node.
+        """
+        pending_nodes = [node]
+        while pending_nodes:
+            node = pending_nodes.pop()
+            positions.update(node['groups'])
+            pending_nodes.extend(node['children'].values())
+
+    def match(self, selector: str) -> set:
+        """
+        Returns the positions of the groups selected by a prefix or glob selector.
+        A selector selects every group inside the folders it matches, '*' matches one folder name and
+        '**' matches any number of folder names.
+
+        Args:
+            selector (str): Group path prefix or glob pattern (e.g., 'group1/', '*/users/', '**/admin/').
+
+        Returns:
+            set: Positions of the selected groups.
+        """
+        positions = set()
+        segments = self.split(selector)
+        if not glob_characters.intersection(selector):
+            node = self.root
+            for segment in segments:
+                node = node['children'].get(segment)
+                if node is None:
+                    return positions
+            self.collect(node, positions)
+            return positions
+        pending = [(self.root, 0)]
+        seen = set()
+        while pending:
+            node, depth = pending.pop()
+            if (id(node), depth) in seen:
+                continue
+            seen.add((id(node), depth))
+            if depth == len(segments):
+                self.collect(node, positions)
+                continue
+            segment = segments[depth]
+            if segment == '**':
+                pending.append((node, depth + 1))
+                pending.extend((child, depth) for child in node['children'].values())
+            elif glob_characters.intersection(segment):
+                pending.extend(
+                    (child, depth + 1) for name, child in node['children'].items() if fnmatchcase(name, segment)
+                )
+            elif segment in node['children']:
+                pending.append((node['children'][segment], depth + 1))
+        return positions
+
+    def select(self, selectors: list, exclude: list | None = None) -> list:
+        """
+        Returns the groups selected by any of the selectors and by none of the exclude patterns.
+
+        Args:
+            selectors (list): Group path prefixes or glob patterns to include.
+            exclude (list): Group path prefixes or glob patterns to leave out.
+
+        Returns:
+            list: Paths of the selected groups, in the order they were indexed.
+        """
+        key = (tuple(selectors), tuple(exclude or ()))
+        if key not in self._selections:
+            positions = set().union(*(self.match(selector) for selector in selectors))
+            positions.difference_update(*(self.match(pattern) for pattern in exclude or ()))
+            self._selections[key] = [self.groups[position] for position in sorted(positions)]
+        return self._selections[key]
@@ -0,0 +1,119 @@
+"""
+This file contains the LatencyHistogram class which records latencies in compact log-linear buckets
+"""
+
+import threading
+
+
+class LatencyHistogram:
+    """
+    This class records latencies in HDR-style log-linear buckets: values are kept exactly below 2^precision_bits
+    microseconds and with a relative error under 1 / 2^(precision_bits - 1) above, so memory only grows with the
+    range of the latencies and not with their number.
+    """
+
+    def __init__(self, precision_bits: int = 8):
+        """
+        Initialize an empty LatencyHistogram.
+
+        Args:
+            precision_bits (int): Number of bits of each bucket value, 8 keeps the error under 0.8%.
+        """
+        self.precision_bits = precision_bits
+        self.half_bucket_count = 1 << (precision_bits - 1)
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self._lock = threading.Lock()
+
+    def get_index(self, value: int) -> int:
+        """
+        Returns the bucket index of a value in microseconds.
+        """
+        exponent = max(0, value.bit_length() - self.precision_bits)
+        return value if exponent == 0 else exponent * self.half_bucket_count + (value >> exponent)
+
+    def get_highest_value(self, index: int) -> int:
+        """
+        Returns the highest value in microseconds falling into the bucket of the given index.
+        """
+        if index < 2 * self.half_bucket_count:
+            return index
+        exponent = index // self.half_bucket_count - 1
+        sub_bucket = index - exponent * self.half_bucket_count
+        return ((sub_bucket + 1) << exponent) - 1
+
+    def record(self, seconds: float) -> None:
+        """
+        Records one latency.
+
+        Args:
+            seconds (float): The latency in seconds.
+        """
+        value = max(0, round(seconds * 1_000_000))
+        index = self.get_index(value)
+        with self._lock:
+            self.counts[index] = self.counts.get(index, 0) + 1
+            self.count += 1
+            self.total += value
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, histogram: "LatencyHistogram") -> None:
+        """
+        Adds the latencies of another histogram with the same precision to this one.
+        """
+        with self._lock:
+            for index, count in histogram.counts.items():
+                self.counts[index] = self.counts.get(index, 0) + count
+            self.count += histogram.count
+            self.total += histogram.total
+            if histogram.count:
+                self.min = histogram.min if self.min is None else min(self.min, histogram.min)
+                self.max = histogram.max if self.max is None else max(self.max, histogram.max)
+
+    def value_at_percentile(self, percentile: float) -> float:
+        """
+        Returns the latency at or below which the given percentage of the recorded latencies fall.
+
+        Args:
+            percentile (float): Percentage between 0 and 100, 100 returns the maximum.
+
+        Returns:
+            float: The latency in seconds, 0.0 if nothing was recorded.
+        """
+        if not self.count:
+            return 0.0
+        if percentile >= 100:
+            return self.max / 1_000_000
+        rank = max(1, -(-self.count * percentile // 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self.get_highest_value(index), self.max) / 1_000_000
+        return self.max / 1_000_000
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count / 1_000_000 if self.count else 0.0
+
+    def distribution(self, max_rows: int = 20) -> list:
+        """
+        Returns the recorded latencies grouped in at most max_rows consecutive ranges.
+
+        Args:
+            max_rows (int): Maximum number of ranges.
+
+        Returns:
+            list: Tuples of the highest latency in seconds and the number of latencies of each range.
+        """
+        buckets = [(self.get_highest_value(index), self.counts[index]) for index in sorted(self.counts)]
+        rows_size = -(-len(buckets) // max_rows) if buckets else 1
+        distribution = []
+        for start in range(0, len(buckets), rows_size):
+            rows = buckets[start : start + rows_size]
+            distribution.append((min(rows[-1][0], self.max) / 1_000_000, sum(count for _, count in rows)))
+        return distribution
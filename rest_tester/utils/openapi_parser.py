@@ -6,71 +6,232 @@ import os
 import json
 import yaml
 import sys
+import random
+import hashlib
+import textwrap
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from faker import Faker
 from jsf import JSF
 from rest_tester.logger import logger
 from rest_tester.configs.constants import openapi_default_tag
+from rest_tester.utils.conversion_cache import ConversionCache, get_content_hash
+from rest_tester.utils.spec_reader import read_spec_sections, iter_spec_section
 
-def resolve_references(schema: dict, components: dict) -> dict:
+literal_keywords = ('example', 'examples', 'default', 'enum', 'const')
+
+schema_map_keywords = ('properties', 'patternProperties', 'dependentSchemas', '$defs', 'definitions')
+
+class ReferenceResolver:
+    """
+    Resolves the '$ref' pointers of an OpenAPI document recursively through nested '$ref', 'allOf', 'oneOf',
+    'anyOf', 'items', 'properties' and any other sub-schema. Each component is resolved once and memoized by its
+    pointer, and a component referring back to itself is cut at the cycle.
+    """
+
+    def __init__(self, components: dict):
+        """
+        Initialize the ReferenceResolver with the components of the document.
+
+        Args:
+            components (dict): The components dictionary.
+        """
+        self.components = components
+        self.resolved = {}
+        self.resolving = set()
+
+    def resolve_pointer(self, ref: str) -> dict:
+        """
+        Resolves a '#/components/...' pointer, returning the memoized result if it was already resolved.
+
+        Args:
+            ref (str): The reference pointer.
+
+        Returns:
+            dict: The fully resolved component.
+        """
+        if ref in self.resolved:
+            return self.resolved[ref]
+        if ref in self.resolving:
+            logger.info(f"Cyclic reference {ref} is not expanded further.")
+            return {"type": "object"}
+        parts = [part.replace('~1', '/').replace('~0', '~') for part in ref.split('/')]
+        if parts[:2] != ['#', 'components']:
+            raise ValueError(f"Reference {ref} is not a components reference.")
+        target = self.components
+        for key in parts[2:]:
+            target = target.get(key) if isinstance(target, dict) else None
+            if target is None:
+                raise ValueError(f"Reference {ref} not found in components.")
+        self.resolving.add(ref)
+        try:
+            self.resolved[ref] = self.resolve(target)
+        finally:
+            self.resolving.discard(ref)
+        return self.resolved[ref]
+
+    def merge_all_of(self, schema: dict) -> dict:
+        """
+        Merges the sub-schemas of an 'allOf' and the properties next to it into a single object schema.
+
+        Args:
+            schema (dict): The schema containing the 'allOf' keyword.
+
+        Returns:
+            dict: The merged schema.
+        """
+        merged = {"type": "object", "properties": {}, "required": []}
+        siblings = {key: self.resolve_value(key, value) for key, value in schema.items() if key != "allOf"}
+        for sub_resolved in [self.resolve(sub_schema) for sub_schema in schema["allOf"]] + [siblings]:
+            if sub_resolved:
+                merged["properties"].update(sub_resolved.get("properties", {}))
+                merged["required"] += [key for key in sub_resolved.get("required", []) if key not in merged["required"]]
+        merged.update({key: value for key, value in siblings.items() if key not in ("properties", "required")})
+        return merged
+
+    def resolve_value(self, key: str, value):
+        """
+        Resolves the value of a keyword, leaving literal values such as examples untouched.
+        The values of a map of names to schemas (e.g., 'properties') are all schemas, even the ones whose name
+        is a literal keyword such as 'default'.
+        """
+        if key in schema_map_keywords and isinstance(value, dict):
+            return self.resolve_map(value)
+        return value if key in literal_keywords else self.resolve(value)
+
+    def resolve_map(self, value: dict) -> dict:
+        """
+        Resolves every value of a map of names to schemas or OpenAPI objects (e.g., 'properties' or 'responses').
+        """
+        return {name: self.resolve(item) for name, item in value.items()}
+
+    def resolve(self, schema):
+        """
+        Resolves all the references inside the given schema.
+
+        Args:
+            schema: The JSON schema, or any part of the OpenAPI document, to resolve.
+
+        Returns:
+            The resolved schema.
+        """
+        if isinstance(schema, list):
+            return [self.resolve(item) for item in schema]
+        if not isinstance(schema, dict):
+            return schema
+        if isinstance(schema.get("$ref"), str):
+            return self.resolve_pointer(schema["$ref"])
+        if isinstance(schema.get("allOf"), list):
+            return self.merge_all_of(schema)
+        return {key: self.resolve_value(key, value) for key, value in schema.items()}
+
+def resolve_references(schema: dict, components: dict, resolver: ReferenceResolver | None = None) -> dict:
     """
     Resolves references in a JSON schema by following the '$ref' keyword.
 
     Args:
         schema (dict): The JSON schema to resolve.
         components (dict): The components dictionary.
+        resolver (ReferenceResolver): Optional resolver shared between schemas, so each component is resolved once.
 
     Returns:
         dict: The resolved schema.
     """
-    if isinstance(schema, dict) and "$ref" in schema:
-        ref = schema["$ref"]
-        ref_path = ref.split("/")[1:]  # Split the reference by '/'
-        ref_schema = components['schemas']
-        for key in ref_path:
-            result_schema = ref_schema.get(key, None)
-            if result_schema is None:
-                continue
-        if result_schema is None: 
-            raise ValueError(f"Reference {ref} not found in components.")
-        return result_schema
-    elif isinstance(schema, dict) and "allOf" in schema:
-        resolved = {"type": "object", "properties": {}, "required": []}
-        for sub_schema in schema["allOf"]:
-            sub_resolved = resolve_references(sub_schema, components)
-            if sub_resolved:
-                resolved["properties"].update(sub_resolved.get("properties", {}))
-                resolved["required"] = list(set(resolved["required"] + sub_resolved.get("required", [])))
-        resolved.update({k: v for k, v in schema.items() if k != "allOf"})
-        return resolved
-    elif isinstance(schema, dict):
-        return schema
-    else:
+    if not isinstance(schema, dict):
         return {}
+    return (resolver or ReferenceResolver(components)).resolve(schema)
     
-def generate_sample_data(schema: dict) -> dict:
+@lru_cache(maxsize=1024)
+def get_sample_generator(schema_json: str) -> JSF:
+    """
+    Returns the JSF generator of a schema, built once per schema in each process.
+
+    Args:
+        schema_json (str): The canonical JSON of the schema.
+
+    Returns:
+        JSF: The generator of sample data for the schema.
+    """
+    return JSF(json.loads(schema_json))
+
+def get_sample_seed(seed: int | None, *keys: str) -> int | None:
+    """
+    Derives the seed of a single sample from the conversion seed and the keys identifying the sample,
+    so a sample does not depend on the order or process it is generated in.
+
+    Args:
+        seed (int): The seed of the conversion, None for random samples.
+        *keys (str): Keys identifying the sample, such as its path, method and field.
+
+    Returns:
+        int: The seed of the sample, None if the conversion is not seeded.
+    """
+    if seed is None:
+        return None
+    return int(hashlib.sha256(json.dumps([seed, *keys]).encode('utf-8')).hexdigest()[:16], 16)
+
+def generate_sample_data(schema: dict, seed: int | None = None) -> dict:
     """
     Generates sample data based on the given schema.
 
     Args:
         schema (dict): The schema to generate sample data from.
+        seed (int): Optional seed making the generated data reproducible.
 
     Returns:
         dict: The generated sample data.
     """
-    faker = JSF(schema)
+    faker = get_sample_generator(json.dumps(schema, sort_keys=True))
+    if seed is not None:
+        random.seed(seed)
+        Faker.seed(seed)
     return faker.generate()
+
+def generate_sample_task(task: tuple) -> dict:
+    """
+    Generates the sample data of a task of the generate phase.
+
+    Args:
+        task (tuple): Tuple of the schema and the seed of the sample.
+
+    Returns:
+        dict: The generated sample data.
+    """
+    schema, seed = task
+    return generate_sample_data(schema, seed)
+
+def generate_samples(tasks: list, workers: int = 1, pool: ProcessPoolExecutor | None = None) -> list:
+    """
+    Generates the sample data of all the tasks, across a pool of processes if more than one worker is given.
+
+    Args:
+        tasks (list): List of tuples of the schema and the seed of each sample.
+        workers (int): Number of processes generating the samples, 1 generates them in this process.
+        pool (ProcessPoolExecutor): Optional pool reused between calls instead of starting a new one.
+
+    Returns:
+        list: The generated sample data in the same order as the tasks.
+    """
+    if pool is not None and len(tasks) > 1:
+        return list(pool.map(generate_sample_task, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(generate_sample_task, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+    return [generate_sample_task(task) for task in tasks]
     
-def generate_sample_data_for_payload(schema_name: str, components: dict) -> dict:
+def generate_sample_data_for_payload(schema_name: str, components: dict, resolver: ReferenceResolver | None = None) -> dict:
     """
     Generates sample data for a payload based on the given schema name and components.
 
     Args:
         schema_name (str): The name of the schema used to generate the payload.
         components (dict): The components dictionary containing the schema references.
+        resolver (ReferenceResolver): Optional resolver shared between schemas.
 
     Returns:
         dict: The generated sample data for the payload.
     """
-    resolved_schema = resolve_references(schema_name, components)
+    resolved_schema = resolve_references(schema_name, components, resolver)
     return generate_sample_data(resolved_schema)
 
 def generate_sample_data_for_param(param_schema: dict) -> dict:
@@ -140,36 +301,229 @@ def extract_responses_schema(responses: dict) -> dict:
     response_content = responses.get('200', {}).get('content', {}).get('application/json', {})
     return response_content.get('schema', {})
 
-def create_dir_and_json(api_details: dict, tag: str, parent_dir: str) -> None:
+def create_dir_and_json(api_details: dict, tag: str, parent_dir: str) -> str:
     """
     Creates a directory based on the tag, and saves the provided API details in a JSON file within that directory.
 
     Args:
         api_details: The API details to be saved in the JSON file.
-        tag: The tag used to create the directory name.
+        tag: The tag used to create the directory.
         parent_dir: The parent directory where the new directory will be created.
 
     Returns:
-        None
+        str: Path of the written JSON file.
     """
-    tag_dir = tag.replace(' ', '_')
-    full_dir = os.path.join(parent_dir, tag_dir)
+    full_dir = os.path.join(parent_dir, tag.replace(' ', '_'))
     os.makedirs(full_dir, exist_ok=True)
     
-    with open(os.path.join(full_dir, 'tests.json'), 'w') as json_file:
+    json_path = os.path.join(full_dir, 'tests.json')
+    with open(json_path, 'w') as json_file:
         json.dump(api_details, json_file, indent=4)
+    return json_path
+
+class TestsJsonWriter:
+    """
+    Writes a tests.json file chunk by chunk, giving the same file as create_dir_and_json without holding
+    all the API details in memory.
+    """
+
+    def __init__(self, tag: str, parent_dir: str):
+        """
+        Initialize the TestsJsonWriter and start the JSON file of the tag.
+
+        Args:
+            tag: The tag used to create the directory.
+            parent_dir: The parent directory where the new directory will be created.
+        """
+        full_dir = os.path.join(parent_dir, tag.replace(' ', '_'))
+        os.makedirs(full_dir, exist_ok=True)
+        self.json_path = os.path.join(full_dir, 'tests.json')
+        self.count = 0
+        with open(self.json_path, 'w') as json_file:
+            json_file.write('[')
+
+    def write(self, api_details: list) -> None:
+        """
+        Appends the given API details to the JSON file in a single write.
+        """
+        parts = []
+        for api_detail in api_details:
+            parts.append(',\n' if self.count else '\n')
+            parts.append(textwrap.indent(json.dumps(api_detail, indent=4), '    '))
+            self.count += 1
+        with open(self.json_path, 'a') as json_file:
+            json_file.write(''.join(parts))
+
+    def close(self) -> None:
+        """
+        Ends the JSON file.
+        """
+        with open(self.json_path, 'a') as json_file:
+            json_file.write('\n]' if self.count else ']')
+
+def create_api_detail(path: str, method: str, operation: dict, resolver: ReferenceResolver) -> tuple:
+    """
+    Creates the test JSON of a single operation, with the resolved schemas its sample params and payload
+    are generated from.
+
+    Args:
+        path (str): The path of the operation.
+        method (str): The HTTP method of the operation.
+        operation (dict): The operation object of the OpenAPI specification.
+        resolver (ReferenceResolver): The resolver of the components of the specification.
+
+    Returns:
+        tuple: The test JSON of the operation and the schemas of its 'api' fields needing sample data.
+    """
+    params_schema = extract_params_schema(resolver.resolve(operation.get('parameters', [])))
+    request_body_schema = extract_request_body_schema(resolver.resolve(operation.get('requestBody', {})))
+    responses_schema = extract_responses_schema(resolver.resolve_map(operation.get('responses', {})))
+
+    sample_schemas = {}
+    if params_schema:
+        sample_schemas["param"] = params_schema
+    
+    if request_body_schema:
+        sample_schemas["data"] = resolve_references(request_body_schema, resolver.components, resolver)
+
+    if responses_schema:
+        responses_schema = resolve_references(responses_schema, resolver.components, resolver)
+    
+    api_detail = {
+        "api": {
+            "uri": path,
+            "method": method,
+            "param": params_schema,
+            "data": request_body_schema
+        },
+        "tests": {
+            "statusCode": 200,
+            "timeout": 10,
+            "jsonSchema": responses_schema
+        }
+    }
+    return api_detail, sample_schemas
+
+def convert_from_openapi_streaming(
+    openapi_path: str,
+    cache: ConversionCache | None = None,
+    workers: int = 1,
+    seed: int | None = None,
+    chunk_size: int = 256,
+) -> str:
+    """
+    Converts an OpenAPI specification file to a set of API test groups without loading its paths in memory.
+    A first pass over the paths hashes the operations of every tag, a second pass converts the operations of
+    the changed tags chunk by chunk and appends them to the JSON file of their tag, once per tag and chunk.
 
-def convert_from_openapi(test_groups: str) -> str:
+    Args:
+        openapi_path (str): The path to the OpenAPI specification file.
+        cache (ConversionCache): Optional cache of a previous conversion.
+        workers (int): Number of processes generating the sample data.
+        seed (int): Optional seed making the sample data reproducible.
+        chunk_size (int): Number of operations converted at once.
+
+    Returns:
+        str: The root directory where the converted test groups are saved.
+    """
+    sections = read_spec_sections(openapi_path, ['info', 'components'])
+    title = sections.get('info', {}).get('title', 'OpenAPI_Spec')
+    root_dir = os.path.dirname(openapi_path) + title.replace(' ', '_')
+    os.makedirs(root_dir, exist_ok=True)
+
+    components = sections.get('components', {})
+    components_hash = get_content_hash(components)
+    resolver = ReferenceResolver(components)
+
+    tag_digests = {}
+    for path, methods in iter_spec_section(openapi_path, 'paths'):
+        for method, operation in methods.items():
+            tag = operation.get('tags', [openapi_default_tag])[0]
+            if tag not in tag_digests:
+                tag_digests[tag] = hashlib.sha256(get_content_hash([root_dir, components_hash, seed]).encode('utf-8'))
+            tag_digests[tag].update(get_content_hash([path, method, operation]).encode('utf-8'))
+
+    group_hashes = {}
+    writers = {}
+    for tag, digest in tag_digests.items():
+        json_path = os.path.join(root_dir, tag.replace(' ', '_'), 'tests.json')
+        group_hashes[json_path] = digest.hexdigest()
+        if cache and cache.is_group_unchanged(json_path, group_hashes[json_path]):
+            logger.info(f"Skipping unchanged tag '{tag}'")
+        else:
+            writers[tag] = TestsJsonWriter(tag, root_dir)
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 and writers else None
+
+    def write_chunk(chunk):
+        details = []
+        sample_tasks = []
+        sample_targets = []
+        for tag, path, method, operation in chunk:
+            api_detail, sample_schemas = create_api_detail(path, method, operation, resolver)
+            for field, schema in sample_schemas.items():
+                sample_tasks.append((schema, get_sample_seed(seed, path, method, field)))
+                sample_targets.append((api_detail, field))
+            details.append((tag, api_detail))
+        for (api_detail, field), sample in zip(sample_targets, generate_samples(sample_tasks, workers, pool)):
+            api_detail["api"][field] = sample
+        tag_details = {}
+        for tag, api_detail in details:
+            tag_details.setdefault(tag, []).append(api_detail)
+        for tag, api_details in tag_details.items():
+            writers[tag].write(api_details)
+
+    try:
+        chunk = []
+        for path, methods in iter_spec_section(openapi_path, 'paths') if writers else []:
+            for method, operation in methods.items():
+                tag = operation.get('tags', [openapi_default_tag])[0]
+                if tag in writers:
+                    chunk.append((tag, path, method, operation))
+            if len(chunk) >= chunk_size:
+                write_chunk(chunk)
+                chunk = []
+        write_chunk(chunk)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        for writer in writers.values():
+            writer.close()
+
+    if cache:
+        cache.save(root_dir, group_hashes)
+
+    logger.info(f"OpenAPI specification '{title}' has been processed.")
+
+    return root_dir
+
+def convert_from_openapi(
+    test_groups: str,
+    cache: ConversionCache | None = None,
+    workers: int = 1,
+    seed: int | None = None,
+    stream: bool = False,
+) -> str:
     """
     Converts an OpenAPI specification file to a set of API test groups.
+    The operations are parsed and resolved first, then all the sample data is generated at once.
 
     Args:
         test_groups (str): The path to the OpenAPI specification file.
+        cache (ConversionCache): Optional cache of a previous conversion, tags whose operations and components
+            did not change are not generated again.
+        workers (int): Number of processes generating the sample data.
+        seed (int): Optional seed making the sample data reproducible, the output is then the same
+            whatever the number of workers.
+        stream (bool): Whether to read the paths of the specification incrementally, see
+            convert_from_openapi_streaming.
 
     Returns:
         str: The root directory where the converted test groups are saved.
     """
     openapi_path = test_groups
+    if stream:
+        return convert_from_openapi_streaming(openapi_path, cache, workers, seed)
 
     with open(openapi_path, 'r') as file:
         if openapi_path.endswith('.yaml'):
@@ -181,47 +535,44 @@ def convert_from_openapi(test_groups: str) -> str:
     root_dir += openapi_spec.get('info', {}).get('title', 'OpenAPI_Spec').replace(' ', '_')
     os.makedirs(root_dir, exist_ok=True)
 
-    api_details_by_tag = {}
+    operations_by_tag = {}
     components = openapi_spec.get('components', {})
 
     for path, methods in openapi_spec.get('paths', {}).items():
         for method, operation in methods.items():
-            params_schema = extract_params_schema(operation.get('parameters', []))
-            request_body_schema = extract_request_body_schema(operation.get('requestBody', {}))
-            responses_schema = extract_responses_schema(operation.get('responses', {}))
-            
             tag = operation.get('tags', [openapi_default_tag])[0]
-
-            if params_schema:
-                params_schema = generate_sample_data_for_param(params_schema)
-            
-            if request_body_schema:
-                request_body_schema = generate_sample_data_for_payload(request_body_schema, components)
-
-            if responses_schema:
-                responses_schema = resolve_references(responses_schema, components)
-            
-            api_detail = {
-                "api": {
-                    "uri": path,
-                    "method": method,
-                    "param": params_schema,
-                    "data": request_body_schema
-                },
-                "tests": {
-                    "statusCode": 200,
-                    "timeout": 10,
-                    "jsonSchema": responses_schema
-                }
-            }
-            
-            if tag not in api_details_by_tag:
-                api_details_by_tag[tag] = []
-            api_details_by_tag[tag].append(api_detail)
-
-    for tag, details in api_details_by_tag.items():
+            operations_by_tag.setdefault(tag, []).append((path, method, operation))
+
+    components_hash = get_content_hash(components)
+    resolver = ReferenceResolver(components)
+    group_hashes = {}
+    details_by_tag = {}
+    sample_tasks = []
+    sample_targets = []
+    for tag, operations in operations_by_tag.items():
+        json_path = os.path.join(root_dir, tag.replace(' ', '_'), 'tests.json')
+        group_hashes[json_path] = get_content_hash([root_dir, components_hash, seed, operations])
+        if cache and cache.is_group_unchanged(json_path, group_hashes[json_path]):
+            logger.info(f"Skipping unchanged tag '{tag}'")
+            continue
+        details_by_tag[tag] = []
+        for path, method, operation in operations:
+            api_detail, sample_schemas = create_api_detail(path, method, operation, resolver)
+            for field, schema in sample_schemas.items():
+                sample_tasks.append((schema, get_sample_seed(seed, path, method, field)))
+                sample_targets.append((api_detail, field))
+            details_by_tag[tag].append(api_detail)
+
+    logger.info(f"Generating {len(sample_tasks)} samples with {workers} worker(s)")
+    for (api_detail, field), sample in zip(sample_targets, generate_samples(sample_tasks, workers)):
+        api_detail["api"][field] = sample
+
+    for tag, details in details_by_tag.items():
         create_dir_and_json(details, tag, root_dir)
 
+    if cache:
+        cache.save(root_dir, group_hashes)
+
     logger.info(f"OpenAPI specification '{openapi_spec.get('info', {}).get('title', 'OpenAPI_Spec')}' has been processed.")
     
     return root_dir
@@ -6,8 +6,14 @@ import os
 import re
 import json
 import sys
+import time
 from rest_tester.logger import logger
 from postmanparser import Collection
+from postmanparser.item import Item, ItemGroup
+from postmanparser.url import Url
+from rest_tester.utils.conversion_cache import ConversionCache, get_content_hash
+
+json_write_buffer_size = 1024 * 1024
 
 def remove_placeholders(uri: str) -> str:
     """
@@ -32,7 +38,7 @@ def extract_query_params(request: Collection) -> list:
         list: A list of dictionaries representing the extracted query parameters.
     """
     params = []
-    if request.url.query:
+    if isinstance(request.url, Url) and request.url.query:
         for param in request.url.query:
             params.append({
                 param.key: param.value
@@ -57,49 +63,96 @@ def extract_body_data(request: Collection) -> list|str:
             data = request.body.raw
     return data
 
-def create_dir_and_json(item: Collection, parent_dir: str) -> None:
+def create_api_detail(item: Item) -> dict:
+    """
+    Creates the test JSON of a single request item.
+
+    Args:
+        item (Item): The request item of the collection.
+
+    Returns:
+        dict: The test JSON of the request.
+    """
+    request = item.request
+    if isinstance(request, str):
+        uri, method, params, data = request, 'get', [], []
+    else:
+        uri = request.url.raw if isinstance(request.url, Url) else request.url
+        method = request.method
+        params = extract_query_params(request)
+        data = extract_body_data(request)
+    return {
+        "api": {
+            "uri": remove_placeholders(uri),
+            "method": method.lower(),
+            "param": params,
+            "data": data
+        },
+        "tests": {
+            "statusCode": 200,
+            "timeout": 10
+        }
+    }
+
+def iter_item_groups(items: list, root_dir: str):
+    """
+    Walks the folder tree of a collection without recursion, yielding the requests of each folder.
+    Folders are visited depth first in collection order, requests at the top level belong to the root directory.
+
+    Args:
+        items (list): The top level items of the collection.
+        root_dir (str): The root directory mirroring the collection.
+
+    Yields:
+        tuple: The directory of the folder and the request items directly inside it.
     """
-    Creates a directory and a JSON file containing API details for each sub-item in the given item.
+    stack = [(root_dir, items)]
+    while stack:
+        group_dir, group_items = stack.pop()
+        yield group_dir, [item for item in group_items if isinstance(item, Item)]
+        sub_groups = [item for item in group_items if isinstance(item, ItemGroup)]
+        for sub_group in reversed(sub_groups):
+            sub_dir = os.path.join(group_dir, sub_group.name.replace(' ', '_').replace(os.sep, '_'))
+            stack.append((sub_dir, sub_group.item or []))
+
+def create_dir_and_json(
+    api_details: list, group_dir: str, cache: ConversionCache | None = None, indent: int | None = None
+) -> tuple:
+    """
+    Creates the group directory and its JSON file containing the given API details.
     
     Args:
-        item (object): The item containing sub-items.
-        parent_dir (str): The parent directory where the group directory will be created.
+        api_details (list): The test JSONs of the group.
+        group_dir (str): The directory of the group.
+        cache (ConversionCache): Optional cache of a previous conversion, unchanged groups are not written again.
+        indent (int): Indentation of the JSON file, None writes compact JSON.
     
     Returns:
-        None
+        tuple: Path of the JSON file and hash of its API details.
     """
-    group_dir = os.path.join(parent_dir, item.name.replace(' ', '_'))
     os.makedirs(group_dir, exist_ok=True)
-    
-    api_details = []
-    
-    for sub_item in item.item:
-        uri = remove_placeholders(sub_item.request.url.raw)
-        params = extract_query_params(sub_item.request)
-        data = extract_body_data(sub_item.request)
-        api_detail = {
-            "api": {
-                "uri": uri,
-                "method": sub_item.request.method.lower(),
-                "param": params,
-                "data": data
-            },
-            "tests": {
-                "statusCode": 200,
-                "timeout": 10
-            }
-        }
-        api_details.append(api_detail)
-    
-    with open(os.path.join(group_dir, 'tests.json'), 'w') as json_file:
-        json.dump(api_details, json_file, indent=4)
+    json_path = os.path.join(group_dir, 'tests.json')
+    group_hash = get_content_hash([indent, api_details])
+    if cache and cache.is_group_unchanged(json_path, group_hash):
+        logger.info(f"Skipping unchanged group '{group_dir}'")
+        return json_path, group_hash
 
-def convert_from_postman(test_groups_path: str) -> str:
+    separators = None if indent else (',', ':')
+    with open(json_path, 'w', buffering=json_write_buffer_size) as json_file:
+        json_file.write(json.dumps(api_details, indent=indent, separators=separators))
+    return json_path, group_hash
+
+def convert_from_postman(
+    test_groups_path: str, cache: ConversionCache | None = None, indent: int | None = None
+) -> str:
     """
     Converts a Postman collection to a directory structure containing API details.
+    Nested folders are mirrored as nested group directories in a single pass over the collection.
     
     Args:
         test_groups_path (str): The path to the Postman collection file.
+        cache (ConversionCache): Optional cache of a previous conversion, unchanged groups are not written again.
+        indent (int): Indentation of the JSON files, None writes compact JSON.
     
     Returns:
         str: The root directory where the converted collection is stored.
@@ -112,11 +165,20 @@ def convert_from_postman(test_groups_path: str) -> str:
     root_dir += collection.info.name.replace(' ', '_')
     os.makedirs(root_dir, exist_ok=True)
 
-    for item in collection.item:
-        if item.item:
-            create_dir_and_json(item, root_dir)
-        else:
-            logger.info('\nNo requests in this group')
+    group_hashes = {}
+    for group_dir, items in iter_item_groups(collection.item, root_dir):
+        if not items:
+            continue
+        started = time.perf_counter()
+        api_details = [create_api_detail(item) for item in items]
+        json_path, group_hash = create_dir_and_json(api_details, group_dir, cache, indent)
+        group_hashes[json_path] = group_hash
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        folder = os.path.relpath(group_dir, root_dir)
+        logger.info(f"Converted folder '{folder}' with {len(items)} requests in {elapsed_ms:.1f} ms")
+
+    if cache:
+        cache.save(root_dir, group_hashes)
 
     logger.info(f"Collection '{collection.info.name}' has been processed.")
 
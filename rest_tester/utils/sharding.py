@@ -0,0 +1,39 @@
+"""
+This file contains the helpers splitting the planned API calls into shards for the pytest-xdist workers
+"""
+
+import os
+import heapq
+
+
+def get_worker_count() -> int:
+    """
+    Returns the number of pytest-xdist workers of the run.
+
+    Returns:
+        int: The number of workers, 0 if the tests are not collected by a pytest-xdist worker.
+    """
+    if not os.environ.get('PYTEST_XDIST_WORKER'):
+        return 0
+    return int(os.environ.get('PYTEST_XDIST_WORKER_COUNT', 1))
+
+
+def partition(weights: list, shard_count: int) -> list:
+    """
+    Splits weighted items into shards of balanced total weight, heaviest items first, each one going to the
+    lightest shard so far. Ties are broken by position, so every worker computes the same partition.
+
+    Args:
+        weights (list): Weight of each item (e.g., number of requests and tests of an API call).
+        shard_count (int): Number of shards.
+
+    Returns:
+        list: Shard number of each item, in the order of the weights.
+    """
+    shard_loads = [(0, shard) for shard in range(max(1, shard_count))]
+    shards = [0] * len(weights)
+    for position in sorted(range(len(weights)), key=lambda position: (-weights[position], position)):
+        load, shard = heapq.heappop(shard_loads)
+        shards[position] = shard
+        heapq.heappush(shard_loads, (load + weights[position], shard))
+    return shards
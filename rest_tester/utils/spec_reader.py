@@ -0,0 +1,223 @@
+"""
+This file contains functions to detect and incrementally read OpenAPI specs and Postman collections
+"""
+
+import re
+import json
+
+import yaml
+
+from rest_tester.logger import logger
+from rest_tester.configs.constants import openapi_id_name, postman_id_name
+
+spec_head_size = 64 * 1024
+
+openapi_key_pattern = re.compile(r'(^|[{,])\s*["\']?' + openapi_id_name + r'["\']?\s*:', re.MULTILINE)
+
+yaml_loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+yaml_constructor = yaml.constructor.SafeConstructor()
+
+yaml_resolver = yaml.resolver.Resolver()
+
+
+def detect_spec_format(spec_path: str, head_size: int = spec_head_size) -> str | None:
+    """
+    Detects the format of a spec file by reading only its head.
+
+    Args:
+        spec_path (str): Path of the spec file.
+        head_size (int): Number of characters read from the start of the file.
+
+    Returns:
+        str: 'postman' or 'openapi', None if the head does not tell.
+    """
+    with open(spec_path, 'r', encoding='utf-8', errors='ignore') as file:
+        head = file.read(head_size)
+    if f'"{postman_id_name}"' in head:
+        return 'postman'
+    if openapi_key_pattern.search(head):
+        return 'openapi'
+    return None
+
+
+def is_json_spec(spec_path: str) -> bool:
+    return spec_path.endswith('.json')
+
+
+def get_ijson():
+    """
+    Returns the ijson module if it is installed, None otherwise.
+    """
+    try:
+        import ijson
+
+        return ijson
+    except ImportError:
+        logger.warning("ijson is not installed, JSON specs are loaded fully in memory")
+        return None
+
+
+def construct_yaml_scalar(event: yaml.ScalarEvent):
+    """
+    Constructs the Python value of a YAML scalar event, resolving its type like yaml.safe_load does.
+    """
+    tag = event.tag
+    if tag is None or tag == '!':
+        tag = yaml_resolver.resolve(yaml.ScalarNode, event.value, event.implicit)
+    node = yaml.ScalarNode(tag, event.value, style=event.style)
+    constructor = yaml_constructor.yaml_constructors.get(tag)
+    return constructor(yaml_constructor, node) if constructor else event.value
+
+
+def build_yaml_node(events, event, anchors: dict):
+    """
+    Builds the Python value of the YAML node starting at the given event, consuming its events.
+
+    Args:
+        events: Iterator of the remaining YAML events.
+        event: The first event of the node.
+        anchors (dict): Values of the anchors seen so far, by anchor name.
+
+    Returns:
+        The Python value of the node.
+    """
+    if isinstance(event, yaml.AliasEvent):
+        return anchors[event.anchor]
+    if isinstance(event, yaml.ScalarEvent):
+        value = construct_yaml_scalar(event)
+    elif isinstance(event, yaml.SequenceStartEvent):
+        value = []
+        for item_event in events:
+            if isinstance(item_event, yaml.SequenceEndEvent):
+                break
+            value.append(build_yaml_node(events, item_event, anchors))
+    elif isinstance(event, yaml.MappingStartEvent):
+        value = {}
+        for key_event in events:
+            if isinstance(key_event, yaml.MappingEndEvent):
+                break
+            key = build_yaml_node(events, key_event, anchors)
+            item = build_yaml_node(events, next(events), anchors)
+            if key == '<<':
+                for merged in item if isinstance(item, list) else [item]:
+                    for merged_key, merged_value in merged.items():
+                        value.setdefault(merged_key, merged_value)
+            else:
+                value[key] = item
+    else:
+        raise ValueError(f"Unexpected YAML event {event}")
+    if getattr(event, 'anchor', None):
+        anchors[event.anchor] = value
+    return value
+
+
+def is_yaml_anchor(event) -> bool:
+    return not isinstance(event, yaml.AliasEvent) and bool(getattr(event, 'anchor', None))
+
+
+def skip_yaml_node(events, event, anchors: dict | None = None) -> None:
+    """
+    Consumes the events of the YAML node starting at the given event without building it. The anchored nodes
+    inside it are still built into the given anchors, so aliases in the sections read later can use them.
+    """
+    if anchors is not None and is_yaml_anchor(event):
+        build_yaml_node(events, event, anchors)
+        return
+    depth = 1 if isinstance(event, (yaml.SequenceStartEvent, yaml.MappingStartEvent)) else 0
+    while depth:
+        event = next(events)
+        if anchors is not None and is_yaml_anchor(event):
+            build_yaml_node(events, event, anchors)
+        elif isinstance(event, (yaml.SequenceStartEvent, yaml.MappingStartEvent)):
+            depth += 1
+        elif isinstance(event, (yaml.SequenceEndEvent, yaml.MappingEndEvent)):
+            depth -= 1
+
+
+def iter_yaml_top_level(events):
+    """
+    Iterates over the keys of the top level mapping of a YAML document. The caller must build or skip the
+    value starting at the yielded event before asking for the next key.
+
+    Args:
+        events: Iterator of the YAML events of the document.
+
+    Yields:
+        tuple: The key and the first event of its value.
+    """
+    for event in events:
+        if isinstance(event, yaml.MappingStartEvent):
+            break
+    for event in events:
+        if isinstance(event, yaml.MappingEndEvent):
+            return
+        yield build_yaml_node(events, event, {}), next(events)
+
+
+def read_spec_sections(spec_path: str, keys: list) -> dict:
+    """
+    Reads only the given top level sections of a spec file, streaming over the others.
+
+    Args:
+        spec_path (str): Path of the JSON or YAML spec file.
+        keys (list): Top level keys to read (e.g., 'info', 'components').
+
+    Returns:
+        dict: The read sections by key, missing sections are left out.
+    """
+    sections = {}
+    with open(spec_path, 'rb') as file:
+        if is_json_spec(spec_path):
+            ijson = get_ijson()
+            if ijson is None:
+                spec = json.load(file)
+                return {key: spec[key] for key in keys if key in spec}
+            for key in keys:
+                file.seek(0)
+                for value in ijson.items(file, key, use_float=True):
+                    sections[key] = value
+                    break
+            return sections
+        events = yaml.parse(file, Loader=yaml_loader)
+        anchors = {}
+        for key, value_event in iter_yaml_top_level(events):
+            if key in keys:
+                sections[key] = build_yaml_node(events, value_event, anchors)
+            else:
+                skip_yaml_node(events, value_event, anchors)
+    return sections
+
+
+def iter_spec_section(spec_path: str, key: str):
+    """
+    Iterates over the items of a top level mapping of a spec file, building one item at a time. The anchors
+    of the whole YAML document are tracked, so the items may use aliases of anchors defined in other sections.
+
+    Args:
+        spec_path (str): Path of the JSON or YAML spec file.
+        key (str): Top level key of the mapping (e.g., 'paths').
+
+    Yields:
+        tuple: The key and the value of each item of the mapping.
+    """
+    with open(spec_path, 'rb') as file:
+        if is_json_spec(spec_path):
+            ijson = get_ijson()
+            if ijson is None:
+                yield from json.load(file).get(key, {}).items()
+                return
+            yield from ijson.kvitems(file, key, use_float=True)
+            return
+        events = yaml.parse(file, Loader=yaml_loader)
+        anchors = {}
+        for top_level_key, value_event in iter_yaml_top_level(events):
+            if top_level_key != key or not isinstance(value_event, yaml.MappingStartEvent):
+                skip_yaml_node(events, value_event, anchors)
+                continue
+            for item_event in events:
+                if isinstance(item_event, yaml.MappingEndEvent):
+                    break
+                item_key = build_yaml_node(events, item_event, anchors)
+                yield item_key, build_yaml_node(events, next(events), anchors)
+            return
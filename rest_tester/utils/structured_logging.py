@@ -0,0 +1,119 @@
+"""
+This file contains the helpers of the structured logging mode: size-capped previews, per-request sampling,
+the JSON lines formatter and the queue moving the log output off the request threads
+"""
+
+import json
+import queue
+import atexit
+import logging
+import datetime
+import itertools
+from logging.handlers import QueueHandler, QueueListener
+
+from rest_tester.configs.configs import configs
+
+structured_fields = ['request_id', 'method', 'url', 'status_code', 'elapsed']
+
+
+class Preview:
+    """
+    This class is a lazy, size-capped text of a logged value (e.g., request headers or body). The text is only
+    built if the log record is emitted, and is cut after 'log_body_preview' characters.
+    """
+
+    __slots__ = ('value', 'limit')
+
+    def __init__(self, value, limit: int | None = None):
+        """
+        Initialize the Preview.
+
+        Args:
+            value: The value to log.
+            limit (int): Maximum number of characters, 'log_body_preview' if None, 0 for no limit.
+        """
+        self.value = value
+        self.limit = configs['execution_settings'].get('log_body_preview', 256) if limit is None else limit
+
+    def __str__(self) -> str:
+        text = str(self.value)
+        if self.limit and len(text) > self.limit:
+            return f"{text[:self.limit]}...({len(text) - self.limit} more characters)"
+        return text
+
+    __repr__ = __str__
+
+
+class RequestSampler:
+    """
+    This class numbers the requests and decides which of them are logged, keeping one request in every
+    1 / sample_rate so the sent and received records of a request are kept or dropped together.
+    """
+
+    def __init__(self, sample_rate: float = 1.0):
+        """
+        Initialize the RequestSampler.
+
+        Args:
+            sample_rate (float): Fraction of the requests which are logged, 0 logs none.
+        """
+        self.interval = max(1, round(1 / sample_rate)) if sample_rate else None
+        self._request_ids = itertools.count(1)
+
+    def next_request(self) -> tuple:
+        """
+        Returns the id of a new request and whether it is logged.
+        """
+        request_id = next(self._request_ids)
+        return request_id, bool(self.interval) and (request_id - 1) % self.interval == 0
+
+
+request_sampler = RequestSampler(configs['execution_settings'].get('log_sample_rate', 1.0))
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    This formatter writes every record as one JSON object per line, with the request fields given in 'extra'.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            'level': record.levelname,
+            'module': record.module,
+            'line': record.lineno,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        entry.update({field: getattr(record, field) for field in structured_fields if hasattr(record, field)})
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    This handler puts the records on the queue as they are, so their message is formatted on the listener thread
+    instead of the thread sending the requests. The logged arguments must not be changed after logging them.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def start_log_queue(logger: logging.Logger) -> QueueListener:
+    """
+    Moves the handlers of the given logger behind a queue emptied by a background listener thread.
+
+    Args:
+        logger (logging.Logger): The logger whose handlers are moved.
+
+    Returns:
+        QueueListener: The started listener, stopped when the process exits.
+    """
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *logger.handlers, respect_handler_level=True)
+    logger.handlers = [DeferredQueueHandler(log_queue)]
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
@@ -2,12 +2,21 @@
 This file contains commonly used utility functions
 """
 
+import copy
 import json
 import yaml
 import requests
+from functools import lru_cache
 
 from rest_tester.logger import logger
 
+try:
+    import orjson
+
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
 def get_json(response: requests.Response) -> dict | None:
     """
     Method to process give response and return its JSON
@@ -20,7 +29,7 @@ def get_json(response: requests.Response) -> dict | None:
         json_response = response.json()
     except Exception as e:
         json_response = None
-        logger.info(f"NON-JSON RESPONSE: {e}")
+        logger.info("NON-JSON RESPONSE: %s", e)
     return json_response
 
 def get_class(class_name: str, module_path: str):
@@ -48,43 +57,90 @@ def read_json_file(filepath: str) -> list:
     :returns:
         List of dictionaries read from given json file
     """
-    with open(filepath, "r", encoding="utf-8") as json_file:
+    jsons = []
+    with open(filepath, "rb") as json_file:
         try:
-            jsons = json.load(json_file)
+            jsons = json_loads(json_file.read())
             logger.info(f"Successfully read: {filepath}")
-        except json.JSONDecodeError as file_error:
+        except ValueError as file_error:
             logger.info("Cannot parse the json file: %s" % str(file_error))
     return jsons
 
+def get_json_shape(value) -> tuple | str:
+    """
+    Method to get the structural shape of the given json, ignoring its values
+    :param:
+        value: Json value for which shape need to be found
+    :returns:
+        Hashable shape of the json, equal for jsons with the same structure
+    """
+    if isinstance(value, dict):
+        return ('object', tuple(sorted((key, get_json_shape(item)) for key, item in value.items())))
+    if isinstance(value, list):
+        return ('array', frozenset(get_json_shape(item) for item in value))
+    if isinstance(value, bool):
+        return 'boolean'
+    if isinstance(value, int):
+        return 'integer'
+    if isinstance(value, float):
+        return 'number'
+    if isinstance(value, str):
+        return 'string'
+    return 'null'
+
+def get_shapes_schema(shapes: frozenset) -> dict:
+    """
+    Method to generate json schema matching any of the given shapes
+    :param:
+        shapes: Set of shapes returned by get_json_shape
+    :returns:
+        Json schema of the merged shapes, objects are merged into one with the keys present in all of them required
+    """
+    schemas = []
+    objects = [shape[1] for shape in shapes if isinstance(shape, tuple) and shape[0] == 'object']
+    arrays = [shape[1] for shape in shapes if isinstance(shape, tuple) and shape[0] == 'array']
+    scalars = {shape for shape in shapes if isinstance(shape, str)}
+    if objects:
+        field_shapes = {}
+        for fields in objects:
+            for key, shape in fields:
+                field_shapes.setdefault(key, set()).add(shape)
+        key_sets = [{key for key, shape in fields} for fields in objects]
+        required = [key for key in field_shapes if all(key in keys for keys in key_sets)]
+        schema = {
+            "type": "object",
+            "properties": {key: get_shapes_schema(frozenset(shape)) for key, shape in field_shapes.items()},
+        }
+        if required:
+            schema["required"] = required
+        schemas.append(schema)
+    if arrays:
+        item_shapes = frozenset().union(*arrays)
+        schemas.append({"type": "array", "items": get_shapes_schema(item_shapes) if item_shapes else {}})
+    if 'number' in scalars:
+        scalars.discard('integer')
+    schemas.extend({"type": scalar} for scalar in sorted(scalars))
+    return schemas[0] if len(schemas) == 1 else {"anyOf": schemas}
+
+@lru_cache(maxsize=1024)
+def get_shape_schema(shape: tuple | str, class_name: str) -> dict:
+    """
+    Method to generate json schema for given shape, memoized so identical shapes are inferred once
+    :param:
+        shape: Shape returned by get_json_shape
+        class_name: suitable class name for the json
+    :returns:
+        Json schema of the shape with given class name as title.
+    """
+    return {"title": class_name, **get_shapes_schema(frozenset([shape]))}
+
 def get_json_schema(response_json, class_name='Response'):
     """
     Method to generate json schema for given json
     :param:
-        response_json: Path where the json file located
+        response_json: Json for which the schema need to be generated
         class_name: suitable class name for the response_json
     :returns:
         Json schema of the given json with given class name.
     """
-    import importlib.util
-    from pathlib import Path
-    from tempfile import TemporaryDirectory
-    from datamodel_code_generator import InputFileType, generate
-    from datamodel_code_generator import DataModelType
-
-    with TemporaryDirectory() as temporary_directory_name:
-        temporary_directory = Path(temporary_directory_name)
-        output = Path(temporary_directory / 'model.py')
-        generate(
-            json.dumps(response_json),
-            input_file_type=InputFileType.Json,
-            input_filename="example.json",
-            output=output,
-            output_model_type=DataModelType.PydanticV2BaseModel,
-            class_name=class_name
-        )
-        spec = importlib.util.spec_from_file_location("model", output)
-        generated_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(generated_module)
-
-        return getattr(generated_module, class_name).model_json_schema()
-    
\ No newline at end of file
+    return copy.deepcopy(get_shape_schema(get_json_shape(response_json), class_name))
@@ -0,0 +1,190 @@
+"""
+This file contains the cached JSON schema validators used by the jsonSchema tests
+"""
+
+import hashlib
+import json
+import threading
+from functools import lru_cache
+
+import jsonschema
+from jsonschema.exceptions import best_match
+from pydantic import TypeAdapter
+
+schema_engines = ('jsonschema', 'fastjsonschema')
+
+json_schema_modes = ('jsonschema', 'pydantic')
+
+_validators = {}
+_validators_lock = threading.Lock()
+
+
+def get_schema_key(schema: dict) -> str:
+    """
+    Returns a hash identifying the given JSON schema.
+
+    Args:
+        schema (dict): The JSON schema.
+
+    Returns:
+        str: SHA-256 of the canonical JSON of the schema.
+    """
+    return hashlib.sha256(json.dumps(schema, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def get_model_schema(class_) -> dict:
+    """
+    Returns the JSON schema of a Pydantic model, generated once per model class.
+
+    Args:
+        class_: The Pydantic model class.
+
+    Returns:
+        dict: The JSON schema of the model.
+    """
+    return class_.model_json_schema()
+
+
+def compile_validator(schema: dict, engine: str):
+    """
+    Compiles a validation function for the given JSON schema.
+
+    Args:
+        schema (dict): The JSON schema to validate against.
+        engine (str): 'jsonschema' or 'fastjsonschema' for a code generated validator.
+
+    Returns:
+        Function taking the instance to validate and raising jsonschema.exceptions.ValidationError on failure.
+    """
+    if engine == 'fastjsonschema':
+        import fastjsonschema
+
+        compiled = fastjsonschema.compile(schema)
+
+        def validate(instance):
+            try:
+                compiled(instance)
+            except fastjsonschema.JsonSchemaValueException as error:
+                raise jsonschema.exceptions.ValidationError(error.message) from error
+
+        return validate
+    if engine != 'jsonschema':
+        raise ValueError(f"Invalid schema engine: {engine}, expected one of {schema_engines}")
+    validator_class = jsonschema.validators.validator_for(schema)
+    validator_class.check_schema(schema)
+    validator = validator_class(schema)
+
+    def validate(instance):
+        error = best_match(validator.iter_errors(instance))
+        if error is not None:
+            raise error
+
+    return validate
+
+
+def get_validator(schema: dict, engine: str = 'jsonschema'):
+    """
+    Returns the compiled validation function for the given JSON schema, compiling it on first use.
+
+    Args:
+        schema (dict): The JSON schema to validate against.
+        engine (str): 'jsonschema' or 'fastjsonschema' for a code generated validator.
+
+    Returns:
+        Function taking the instance to validate and raising jsonschema.exceptions.ValidationError on failure.
+    """
+    key = (engine, get_schema_key(schema))
+    validator = _validators.get(key)
+    if validator is None:
+        with _validators_lock:
+            validator = _validators.get(key)
+            if validator is None:
+                validator = _validators[key] = compile_validator(schema, engine)
+    return validator
+
+
+def validate_json_schema(instance, schema: dict, engine: str = 'jsonschema') -> None:
+    """
+    Validates the instance against the JSON schema using a cached validator.
+
+    Args:
+        instance: The JSON value to validate.
+        schema (dict): The JSON schema to validate against.
+        engine (str): 'jsonschema' or 'fastjsonschema' for a code generated validator.
+
+    Raises:
+        jsonschema.exceptions.ValidationError: If the instance is not valid.
+    """
+    get_validator(schema, engine)(instance)
+
+
+@lru_cache(maxsize=None)
+def get_type_adapter(class_) -> TypeAdapter:
+    """
+    Returns the TypeAdapter of a Pydantic model, built once per model class.
+
+    Args:
+        class_: The Pydantic model class.
+
+    Returns:
+        TypeAdapter: Adapter validating raw JSON against the model.
+    """
+    return TypeAdapter(class_)
+
+
+def has_integer_type(schema) -> bool:
+    """
+    Checks whether a JSON schema, or any schema nested in it, accepts integers.
+
+    Args:
+        schema: The JSON schema or a part of it.
+
+    Returns:
+        bool: True if some 'type' of the schema is 'integer'.
+    """
+    if isinstance(schema, list):
+        return any(has_integer_type(item) for item in schema)
+    if not isinstance(schema, dict):
+        return False
+    schema_type = schema.get('type')
+    if schema_type == 'integer' or (isinstance(schema_type, list) and 'integer' in schema_type):
+        return True
+    return any(has_integer_type(value) for key, value in schema.items() if key not in ('enum', 'const', 'default', 'examples'))
+
+
+@lru_cache(maxsize=None)
+def is_strict_model(class_) -> bool:
+    """
+    Checks whether pydantic strict mode accepts the same bodies as the JSON schema of a model, once per model.
+    Strict mode rejects integral floats (e.g., 1.0 or 1e20) for integer fields, which the JSON schema accepts,
+    so the models with integer fields are validated against their JSON schema instead.
+
+    Args:
+        class_: The Pydantic model class.
+
+    Returns:
+        bool: True if the model is validated with pydantic.
+    """
+    return not has_integer_type(get_model_schema(class_))
+
+
+def validate_model_json(content: bytes | str, class_, engine: str = 'jsonschema') -> None:
+    """
+    Validates the raw JSON body against a Pydantic model with a single validator chosen per model: pydantic-core
+    in strict mode, so values are not coerced, or the JSON schema of the model when strict mode would reject
+    bodies the JSON schema accepts.
+
+    Args:
+        content (bytes | str): The raw JSON body of the response.
+        class_: The Pydantic model class.
+        engine (str): 'jsonschema' or 'fastjsonschema', engine of the JSON schema validation.
+
+    Raises:
+        pydantic.ValidationError: If the body is not valid for a model validated with pydantic.
+        jsonschema.exceptions.ValidationError: If the body is not valid for the JSON schema of the model.
+    """
+    if is_strict_model(class_):
+        get_type_adapter(class_).validate_json(content, strict=True)
+    else:
+        validate_json_schema(json.loads(content), get_model_schema(class_), engine)
@@ -0,0 +1,27 @@
+import json
+
+from rest_tester.apitester import APITester
+from rest_tester.configs.configs import configs
+
+
+def write_group(folder, name='tests.json'):
+    folder.mkdir(parents=True, exist_ok=True)
+    (folder / name).write_text(json.dumps([{"api": {"uri": "/todos", "method": "get"}, "tests": {"statusCode": 200}}]))
+
+
+def test_index_does_not_follow_symlinked_folders(tmp_path):
+    write_group(tmp_path / 'group1')
+    write_group(tmp_path / 'group1' / 'nested', 'b.json')
+    write_group(tmp_path / 'group1' / 'nested', 'a.json')
+    (tmp_path / 'group1' / 'nested' / 'loop').symlink_to(tmp_path / 'group1', target_is_directory=True)
+
+    index = APITester(configs).index_test_groups(str(tmp_path) + '/')
+
+    assert index == {
+        'group1/': [str(tmp_path / 'group1' / 'tests.json')],
+        'group1/nested/': [str(tmp_path / 'group1' / 'nested' / 'a.json'), str(tmp_path / 'group1' / 'nested' / 'b.json')],
+    }
+
+
+def test_index_of_a_missing_root_is_empty(tmp_path):
+    assert APITester(configs).index_test_groups(str(tmp_path / 'missing') + '/') == {}
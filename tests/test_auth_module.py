@@ -0,0 +1,76 @@
+import base64
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from rest_tester.modules.auth_module import Authenticator, decode_jwt_claims
+
+
+def make_jwt(claims):
+    payload = base64.urlsafe_b64encode(json.dumps(claims).encode()).rstrip(b'=').decode()
+    return f'header.{payload}.signature'
+
+
+class ValidationClient:
+    def __init__(self, status_code=200):
+        self.status_code = status_code
+        self.headers = {}
+        self.calls = 0
+
+    def send_request(self, method, endpoint, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(status_code=self.status_code)
+
+
+def get_authenticator(api_client, **authentication_configs):
+    return Authenticator({
+        'auth_headers': [{'Authorization': 'Bearer {token}'}],
+        'token_validation_params': {'uri': '/auth/me', 'method': 'get'},
+        **authentication_configs,
+    }, api_client)
+
+
+def test_token_validity_is_cached_per_token():
+    api_client = ValidationClient()
+    authenticator = get_authenticator(api_client, token_encoded=False, token_validation_ttl=300)
+
+    for token in ['a', 'a', 'b', 'a']:
+        assert authenticator.is_token_valid(token) == token
+
+    assert api_client.calls == 2
+
+
+def test_expiring_tokens_are_replaced_by_the_refresh_hooks():
+    api_client = ValidationClient()
+    authenticator = get_authenticator(api_client, token_encoded=True, encoding_format='jwt', token_expiry_margin=30)
+    expiring_token = make_jwt({'exp': time.time() + 10})
+    new_token = make_jwt({'exp': time.time() + 3600})
+    authenticator.add_refresh_hook(lambda token: None)
+    authenticator.add_refresh_hook(lambda token: new_token if token == expiring_token else None)
+    authenticator.login(expiring_token)
+
+    assert authenticator.is_token_valid(expiring_token) == new_token
+    assert api_client.headers == {'Authorization': f'Bearer {new_token}'}
+    assert api_client.calls == 0
+
+
+def test_expired_tokens_without_refresh_fail():
+    authenticator = get_authenticator(ValidationClient(401), token_encoded=False)
+
+    with pytest.raises(Exception, match='Provided token expired'):
+        authenticator.is_token_valid('revoked')
+
+
+def test_jwt_claims_are_decoded_from_the_payload_segment():
+    claims = {'sub': 'user ü', 'exp': 1700000000}
+
+    assert decode_jwt_claims(make_jwt(claims)) == claims
+    assert decode_jwt_claims(make_jwt(claims)) is decode_jwt_claims(make_jwt(claims))
+
+
+@pytest.mark.parametrize('token', ['not-a-jwt', 'a.b', make_jwt(['not', 'an', 'object']), 'header.%%%.signature'])
+def test_invalid_jwts_raise_value_error(token):
+    with pytest.raises(ValueError):
+        decode_jwt_claims(token)
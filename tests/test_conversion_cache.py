@@ -0,0 +1,61 @@
+from rest_tester.utils.conversion_cache import ConversionCache
+
+
+def write_conversion(tmp_path, options):
+    spec_path = tmp_path / "spec.json"
+    spec_path.write_text('{"openapi": "3.0.0"}')
+    group_file = tmp_path / "converted" / "tests.json"
+    group_file.parent.mkdir(exist_ok=True)
+    group_file.write_text("[]")
+    ConversionCache(str(spec_path), options).save(str(group_file.parent), {str(group_file): "group-hash"})
+    return str(spec_path), str(group_file)
+
+
+def test_conversion_is_reused_with_the_same_options(tmp_path):
+    spec_path, group_file = write_conversion(tmp_path, {"conversion_seed": 1, "stream_specs": False})
+
+    cache = ConversionCache(spec_path, {"conversion_seed": 1, "stream_specs": False})
+
+    assert cache.is_fresh()
+    assert cache.is_group_unchanged(group_file, "group-hash")
+
+
+def test_conversion_is_not_reused_after_the_seed_changes(tmp_path):
+    spec_path, group_file = write_conversion(tmp_path, {"conversion_seed": 1, "stream_specs": False})
+
+    cache = ConversionCache(spec_path, {"conversion_seed": 2, "stream_specs": False})
+
+    assert not cache.is_fresh()
+    assert not cache.is_group_unchanged(group_file, "group-hash")
+
+
+def test_conversion_is_not_reused_after_the_spec_changes(tmp_path):
+    spec_path, group_file = write_conversion(tmp_path, {})
+    (tmp_path / "spec.json").write_text('{"openapi": "3.1.0"}')
+
+    cache = ConversionCache(spec_path, {})
+
+    assert not cache.is_fresh()
+    assert cache.is_group_unchanged(group_file, "group-hash")
+    assert not cache.is_group_unchanged(group_file, "other-hash")
+
+
+def test_conversion_is_not_reused_when_a_group_file_is_missing(tmp_path):
+    spec_path, group_file = write_conversion(tmp_path, {})
+    (tmp_path / "converted" / "tests.json").unlink()
+
+    cache = ConversionCache(spec_path, {})
+
+    assert not cache.is_fresh()
+    assert not cache.is_group_unchanged(group_file, "group-hash")
+
+
+def test_unreadable_manifest_is_ignored(tmp_path):
+    spec_path, _ = write_conversion(tmp_path, {})
+    with open(ConversionCache(spec_path).manifest_path, "w") as manifest_file:
+        manifest_file.write("{not json")
+
+    cache = ConversionCache(spec_path, {})
+
+    assert not cache.is_fresh()
+    assert cache.groups == {}
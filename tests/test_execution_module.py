@@ -0,0 +1,150 @@
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from rest_tester.modules.execution_module import FailedResponse, LazyResponses, RequestExecutor, RequestLimits, RequestMemo
+
+
+class RecordingClient:
+    base_url = 'http://api.test'
+
+    def __init__(self):
+        self.sent_headers = []
+
+    def send_request(self, method, endpoint, **kwargs):
+        self.sent_headers.append(kwargs.get('headers'))
+        return kwargs
+
+
+class OverlapClient:
+    base_url = 'http://api.test'
+
+    def __init__(self, counter):
+        self.counter = counter
+
+    def send_request(self, method, endpoint, **kwargs):
+        with self.counter['lock']:
+            self.counter['in_flight'] += 1
+            self.counter['peak'] = max(self.counter['peak'], self.counter['in_flight'])
+        time.sleep(0.02)
+        with self.counter['lock']:
+            self.counter['in_flight'] -= 1
+        return endpoint
+
+
+class ShuffledClient:
+    base_url = 'http://api.test'
+
+    def send_request(self, method, endpoint, **kwargs):
+        time.sleep(random.uniform(0, 0.01))
+        if endpoint == '/down':
+            raise requests.ConnectionError('connection refused')
+        return endpoint
+
+
+@pytest.mark.parametrize('max_in_flight', [1, 4])
+def test_run_keeps_the_order_of_the_jobs_and_fails_transport_errors(max_in_flight):
+    jobs = [('get', uri, {}) for uri in ['/a', '/down', '/b', '/c', '/d', '/e']]
+
+    responses = RequestExecutor(ShuffledClient(), max_in_flight).run(jobs)
+
+    assert [response for position, response in enumerate(responses) if position != 1] == ['/a', '/b', '/c', '/d', '/e']
+    assert isinstance(responses[1], FailedResponse)
+    assert (responses[1].status_code, responses[1].reason) == (None, 'connection refused')
+
+
+def run_two_users(max_in_flight, max_per_host):
+    counter = {'lock': threading.Lock(), 'in_flight': 0, 'peak': 0}
+    limits = RequestLimits(max_in_flight, max_per_host)
+    executors = [RequestExecutor(OverlapClient(counter), 4, max_per_host, limits=limits) for _ in range(2)]
+    jobs = [('get', f'/todos/{number}', {}) for number in range(8)]
+    with ThreadPoolExecutor(max_workers=2) as user_pool:
+        responses = list(user_pool.map(lambda executor: executor.run(jobs), executors))
+    return counter['peak'], responses
+
+
+def test_max_per_host_holds_across_users():
+    peak, responses = run_two_users(4, 1)
+
+    assert peak == 1
+    assert responses == [[f'/todos/{number}' for number in range(8)]] * 2
+
+
+def test_max_in_flight_holds_across_users():
+    peak, _ = run_two_users(3, None)
+
+    assert 1 < peak <= 3
+
+
+def test_prefetch_runs_the_window_limited_by_max_in_flight():
+    counter = {'lock': threading.Lock(), 'in_flight': 0, 'peak': 0}
+    lazy_responses = LazyResponses(RequestExecutor(OverlapClient(counter), 2), prefetch_window=6)
+    handles = [lazy_responses.add(('get', f'/todos/{number}', {}), 1) for number in range(8)]
+
+    responses = [handle.acquire() for handle in handles]
+
+    assert responses == [f'/todos/{number}' for number in range(8)]
+    assert lazy_responses._prefetch_pool._max_workers == 6
+    assert counter['peak'] == 2
+
+
+def test_auth_headers_are_resolved_when_the_call_is_sent():
+    tokens = {0: 'old-token'}
+    client = RecordingClient()
+    executor = RequestExecutor(client, auth_headers=lambda user_id: {'Authorization': f'Bearer {tokens[user_id]}'})
+    job = ('get', '/user/me', {'params': {}, 'auth': 0})
+
+    executor.send(job)
+    tokens[0] = 'refreshed-token'
+    settings = executor.send(job)
+
+    assert client.sent_headers == [{'Authorization': 'Bearer old-token'}, {'Authorization': 'Bearer refreshed-token'}]
+    assert 'auth' not in settings
+
+
+def test_fingerprint_uses_the_auth_headers_of_the_user():
+    job = ('get', '/user/me', {'params': {}, 'json': {}, 'auth': 0})
+    other_user_job = ('get', '/user/me', {'params': {}, 'json': {}, 'auth': 1})
+
+    same_token = RequestMemo.fingerprint(job, {'Authorization': 'a'}) == RequestMemo.fingerprint(other_user_job, {'Authorization': 'a'})
+    other_token = RequestMemo.fingerprint(job, {'Authorization': 'a'}) == RequestMemo.fingerprint(other_user_job, {'Authorization': 'b'})
+
+    assert same_token and not other_token
+
+
+def test_memo_fingerprint_ignores_key_order_and_caches_idempotent_calls_only():
+    memo = RequestMemo(['GET', 'head'])
+    job = ('GET', '/todos', {'params': {'limit': 1, 'skip': 2}, 'json': {}})
+    same_job = ('get', '/todos', {'json': {}, 'params': {'skip': 2, 'limit': 1}})
+    other_job = ('get', '/todos', {'params': {'limit': 1, 'skip': 3}, 'json': {}})
+
+    assert memo.fingerprint(job) == memo.fingerprint(same_job) != memo.fingerprint(other_job)
+    assert memo.is_cacheable({'method': 'get'}) and memo.is_cacheable({'method': 'HEAD'})
+    assert not memo.is_cacheable({'method': 'post'})
+    assert not memo.is_cacheable({'method': 'get', 'dedupe': False})
+
+
+def test_timeouts_are_capped_to_the_run_deadline():
+    client = RecordingClient()
+    executor = RequestExecutor(client, deadline=time.monotonic() + 5)
+
+    settings = executor.send(('get', '/todos', {'timeout': (10, 2)}))
+    connect_timeout, read_timeout = executor.send(('get', '/todos', {'timeout': None}))['timeout']
+
+    assert settings['timeout'][0] <= 5 and settings['timeout'][1] == 2
+    assert 4 < connect_timeout <= 5 and 4 < read_timeout <= 5
+
+
+def test_calls_after_the_run_deadline_fail_without_being_sent():
+    client = RecordingClient()
+    executor = RequestExecutor(client, 4, deadline=time.monotonic() - 1)
+
+    responses = executor.run([('get', f'/todos/{number}', {}) for number in range(3)])
+
+    assert client.sent_headers == []
+    assert all(isinstance(response, FailedResponse) for response in responses)
+    assert responses[0].reason == 'Run deadline exceeded'
@@ -0,0 +1,25 @@
+import pytest
+
+from rest_tester.utils.group_index import GroupIndex
+
+groups = ['/', 'group1/', 'group1/users/', 'group1/users/admin/', 'group2/', 'group2/users/', 'group3/todos/admin/']
+
+
+@pytest.mark.parametrize('selectors, exclude, expected', [
+    (['group1/'], None, ['group1/', 'group1/users/', 'group1/users/admin/']),
+    (['group1/users'], None, ['group1/users/', 'group1/users/admin/']),
+    (['group'], None, []),
+    (['*/users/'], None, ['group1/users/', 'group1/users/admin/', 'group2/users/']),
+    (['**/admin/'], None, ['group1/users/admin/', 'group3/todos/admin/']),
+    (['group[12]/'], ['**/admin/'], ['group1/', 'group1/users/', 'group2/', 'group2/users/']),
+    (['group2/', 'group1/users/'], None, ['group1/users/', 'group1/users/admin/', 'group2/', 'group2/users/']),
+    (['/'], None, ['/']),
+])
+def test_selectors_match_like_splitting_every_group_path(selectors, exclude, expected):
+    assert GroupIndex(groups).select(selectors, exclude) == expected
+
+
+def test_selections_are_resolved_once():
+    index = GroupIndex(groups)
+
+    assert index.select(['*/users/']) is index.select(['*/users/'])
@@ -0,0 +1,100 @@
+import random
+
+import pytest
+
+from rest_tester.modules.load_module import LatencySampler
+from rest_tester.utils.latency_histogram import LatencyHistogram
+
+
+def test_buckets_are_exact_below_the_precision_and_bounded_above():
+    histogram = LatencyHistogram()
+    for value in range(256):
+        assert histogram.get_highest_value(histogram.get_index(value)) == value
+    for value in random.Random(7).sample(range(256, 60_000_000), 2000):
+        highest = histogram.get_highest_value(histogram.get_index(value))
+        assert value <= highest <= value * (1 + 1 / 128)
+
+
+def test_bucket_indexes_grow_with_the_values():
+    histogram = LatencyHistogram()
+    indexes = [histogram.get_index(value) for value in range(100_000)]
+    assert indexes == sorted(indexes)
+
+
+def test_percentiles_of_a_uniform_distribution():
+    histogram = LatencyHistogram()
+    for millisecond in range(1, 1001):
+        histogram.record(millisecond / 1000)
+    assert histogram.count == 1000
+    assert histogram.mean == pytest.approx(0.5005)
+    assert histogram.value_at_percentile(50) == pytest.approx(0.5, rel=0.008)
+    assert histogram.value_at_percentile(99) == pytest.approx(0.99, rel=0.008)
+    assert histogram.value_at_percentile(0) == pytest.approx(0.001, rel=0.008)
+    assert histogram.value_at_percentile(100) == 1.0
+
+
+def test_percentiles_never_exceed_the_maximum():
+    histogram = LatencyHistogram()
+    histogram.record(0.123457)
+    assert histogram.value_at_percentile(50) == 0.123457
+    assert histogram.value_at_percentile(99.9) == 0.123457
+
+
+def test_empty_histogram():
+    histogram = LatencyHistogram()
+    assert histogram.value_at_percentile(99) == 0.0
+    assert histogram.mean == 0.0
+    assert histogram.distribution() == []
+
+
+def test_merge_adds_the_counts_and_extremes():
+    first, second = LatencyHistogram(), LatencyHistogram()
+    for seconds in [0.01, 0.02]:
+        first.record(seconds)
+    for seconds in [0.005, 0.5]:
+        second.record(seconds)
+    first.merge(second)
+    first.merge(LatencyHistogram())
+    assert first.count == 4
+    assert (first.min, first.max) == (5_000, 500_000)
+    assert first.mean == pytest.approx(0.13375)
+    assert first.value_at_percentile(100) == 0.5
+
+
+def test_distribution_groups_buckets_into_at_most_max_rows():
+    histogram = LatencyHistogram()
+    for millisecond in range(1, 101):
+        histogram.record(millisecond / 1000)
+    distribution = histogram.distribution(max_rows=10)
+    assert len(distribution) <= 10
+    assert sum(count for _, count in distribution) == 100
+    uppers = [upper for upper, _ in distribution]
+    assert uppers == sorted(uppers)
+    assert uppers[-1] == 0.1
+
+
+class CountingExecutor:
+    def __init__(self):
+        self.sent = 0
+
+    def send(self, job):
+        self.sent += 1
+        return job
+
+
+def test_latency_sampler_sends_the_warmup_and_samples_once():
+    executor = CountingExecutor()
+    sampler = LatencySampler(executor, ('GET', '/a'), warmup=2, samples=5)
+    histogram = sampler.measure()
+    assert sampler.measure() is histogram
+    assert executor.sent == 7
+    assert histogram.count == 5
+    assert sampler.errors == 0
+
+
+def test_latency_sampler_from_histogram_does_not_send_calls():
+    histogram = LatencyHistogram()
+    histogram.record(0.01)
+    sampler = LatencySampler.from_histogram(histogram, errors=1)
+    assert sampler.measure() is histogram
+    assert (sampler.samples, sampler.errors) == (1, 1)
@@ -0,0 +1,60 @@
+import time
+import threading
+
+import pytest
+
+from rest_tester.modules.load_module import LoadRunner
+
+
+class SleepingExecutor:
+    def __init__(self, service_time=0.0):
+        self.service_time = service_time
+        self.sent = []
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def send(self, job):
+        with self._lock:
+            self.sent.append(job[1])
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(self.service_time)
+        with self._lock:
+            self.in_flight -= 1
+        return job[1]
+
+
+def test_rps_mode_sends_the_calls_in_a_round_robin_and_samples_responses():
+    executor = SleepingExecutor()
+    load_runner = LoadRunner(executor, 'rps', rps=100, concurrency=4, duration=0.2, sample_rate=0.5, max_samples=3)
+
+    samples = load_runner.run([('get', '/a', {}), ('get', '/b', {})])
+
+    assert sorted(executor.sent) == ['/a'] * 10 + ['/b'] * 10
+    assert samples == [['/a'] * 3, ['/b'] * 3]
+    assert {uri: stats['count'] for uri, stats in load_runner.summary().items()} == {'/a': 10, '/b': 10}
+
+
+def test_rps_mode_measures_latency_from_the_scheduled_time():
+    executor = SleepingExecutor(0.02)
+    load_runner = LoadRunner(executor, 'rps', rps=200, concurrency=1, duration=0.1)
+
+    load_runner.run([('get', '/slow', {})])
+
+    assert load_runner.summary()['/slow']['max'] > 0.2
+
+
+def test_concurrency_mode_keeps_the_calls_in_flight():
+    executor = SleepingExecutor(0.01)
+    load_runner = LoadRunner(executor, 'concurrency', concurrency=3, duration=0.2)
+
+    load_runner.run([('get', '/a', {})])
+
+    assert executor.peak == 3
+    assert load_runner.summary()['/a']['count'] == len(executor.sent)
+
+
+def test_invalid_load_modes_are_rejected():
+    with pytest.raises(ValueError):
+        LoadRunner(SleepingExecutor(), 'burst')
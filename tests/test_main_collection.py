@@ -0,0 +1,112 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+repo_root = Path(__file__).resolve().parents[1]
+
+config_plugin = '''
+import json, os
+from rest_tester.configs.configs import configs
+for section, settings in json.loads(os.environ["REST_TESTER_TEST_CONFIGS"]).items():
+    if isinstance(settings, dict):
+        configs[section].update(settings)
+    else:
+        configs[section] = settings
+'''
+
+
+class JsonHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.paths.append(self.path)
+        body = json.dumps({"path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), JsonHandler)
+    server.paths = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+
+
+def get_base_url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def run_pytest(tmp_path, configs, *arguments):
+    (tmp_path / "config_plugin.py").write_text(config_plugin)
+    environment = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join([str(tmp_path), str(repo_root)]),
+        "REST_TESTER_TEST_CONFIGS": json.dumps(configs),
+    }
+    return subprocess.run(
+        [sys.executable, "-m", "pytest", "-p", "config_plugin", "-p", "no:cacheprovider", *arguments, "-q",
+         str(repo_root / "rest_tester" / "main.py")],
+        cwd=tmp_path, env=environment, capture_output=True, text=True, timeout=120,
+    )
+
+
+def test_load_mode_is_collected(tmp_path, api_server):
+    group_dir = tmp_path / "groups" / "group1"
+    group_dir.mkdir(parents=True)
+    (group_dir / "tests.json").write_text(json.dumps([
+        {"api": {"uri": "/users", "method": "get"}, "tests": {"statusCode": 200, "p95": 1}},
+        {"api": {"uri": "/todos", "method": "get"}, "tests": {"statusCode": 200}},
+    ]))
+    result = run_pytest(tmp_path, {
+        "http_request_settings": {"base_url": get_base_url(api_server)},
+        "auth_settings": {"token_encoded": False, "token_validation_params": {"uri": "/auth/me", "method": "get"}},
+        "user_tokens": [{"token": "abc", "test_groups": ["group1/"]}],
+        "execution_settings": {
+            "dir_groups_to_test": str(tmp_path / "groups") + "/",
+            "log_level": "ERROR",
+            "load_mode": "rps",
+            "load_rps": 20,
+            "load_duration": 0.5,
+            "load_sample_rate": 1.0,
+            "load_max_samples": 2,
+        },
+    }, "--collect-only")
+
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "5 tests collected" in result.stdout
+
+
+def test_lazy_latency_tests_only_send_their_samples(tmp_path, api_server):
+    group_dir = tmp_path / "groups" / "group1"
+    group_dir.mkdir(parents=True)
+    (group_dir / "tests.json").write_text(json.dumps([
+        {"api": {"uri": "/users", "method": "get"}, "tests": {"p95": 5, "latencyWarmup": 0, "latencySamples": 3}},
+        {"api": {"uri": "/todos", "method": "get"}, "tests": {"statusCode": 200, "p50": 5, "latencyWarmup": 0, "latencySamples": 3}},
+    ]))
+    result = run_pytest(tmp_path, {
+        "http_request_settings": {"base_url": get_base_url(api_server)},
+        "auth_settings": {"token_encoded": False, "token_validation_params": {"uri": "/auth/me", "method": "get"}},
+        "user_tokens": [{"token": "abc", "test_groups": ["group1/"]}],
+        "execution_settings": {
+            "dir_groups_to_test": str(tmp_path / "groups") + "/",
+            "log_level": "ERROR",
+            "collection_mode": "lazy",
+            "prefetch_window": 2,
+        },
+    })
+
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "3 passed" in result.stdout
+    assert sorted(path for path in api_server.paths if path != "/auth/me") == ["/todos"] * 4 + ["/users"] * 3
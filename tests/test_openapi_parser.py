@@ -0,0 +1,117 @@
+import json
+
+import pytest
+
+from rest_tester.utils import openapi_parser
+from rest_tester.utils.openapi_parser import (
+    ReferenceResolver,
+    create_dir_and_json,
+    generate_samples,
+    get_sample_generator,
+    get_sample_seed,
+)
+
+components = {
+    "schemas": {
+        "Status": {"type": "string", "enum": ["open", "closed"]},
+        "Setting": {
+            "type": "object",
+            "properties": {
+                "default": {"$ref": "#/components/schemas/Status"},
+                "example": {"$ref": "#/components/schemas/Status"},
+            },
+            "required": ["default"],
+            "example": {"default": {"$ref": "kept as is"}},
+        },
+    }
+}
+
+
+def test_properties_named_like_literal_keywords_are_resolved():
+    resolved = ReferenceResolver(components).resolve({"$ref": "#/components/schemas/Setting"})
+
+    assert resolved["properties"]["default"] == components["schemas"]["Status"]
+    assert resolved["properties"]["example"] == components["schemas"]["Status"]
+    assert resolved["example"] == {"default": {"$ref": "kept as is"}}
+
+
+def test_samples_are_generated_for_properties_named_like_literal_keywords():
+    resolved = ReferenceResolver(components).resolve({"$ref": "#/components/schemas/Setting"})
+    sample = get_sample_generator(json.dumps(resolved, sort_keys=True)).generate()
+
+    assert sample["default"] in ("open", "closed")
+
+
+def test_tests_json_writer_gives_the_same_file_as_create_dir_and_json(tmp_path):
+    api_details = [{"api": {"uri": f"/todos/{number}", "method": "get"}, "tests": {"statusCode": 200}} for number in range(3)]
+    expected_path = create_dir_and_json(api_details, "todos list", str(tmp_path / "expected"))
+    writer = openapi_parser.TestsJsonWriter("todos list", str(tmp_path / "streamed"))
+    writer.write(api_details[:2])
+    writer.write([])
+    writer.write(api_details[2:])
+    writer.close()
+
+    with open(expected_path) as expected_file, open(writer.json_path) as streamed_file:
+        assert streamed_file.read() == expected_file.read()
+
+
+def test_seeded_samples_do_not_depend_on_the_order_or_the_processes():
+    schema = {"type": "object", "properties": {"name": {"type": "string"}, "age": {"type": "integer"}}, "required": ["name", "age"]}
+    tasks = [(schema, get_sample_seed(42, f"/users/{number}", "post", "data")) for number in range(4)]
+
+    serial_samples = generate_samples(tasks)
+    reversed_samples = generate_samples(tasks[::-1])
+    parallel_samples = generate_samples(tasks, workers=2)
+
+    assert serial_samples == reversed_samples[::-1] == parallel_samples
+    assert get_sample_seed(None, "/users", "post", "data") is None
+    assert get_sample_seed(42, "/users", "post", "data") != get_sample_seed(43, "/users", "post", "data")
+
+
+nested_components = {
+    "schemas": {
+        "Id": {"type": "integer"},
+        "Owner": {"type": "object", "properties": {"id": {"$ref": "#/components/schemas/Id"}}, "required": ["id"]},
+        "Named": {"type": "object", "properties": {"name": {"type": "string"}}, "required": ["name"]},
+        "Pet": {
+            "allOf": [{"$ref": "#/components/schemas/Named"}, {"$ref": "#/components/schemas/Owner"}],
+            "properties": {"tags": {"type": "array", "items": {"$ref": "#/components/schemas/Id"}}},
+        },
+        "Node": {"type": "object", "properties": {"children": {"type": "array", "items": {"$ref": "#/components/schemas/Node"}}}},
+        "a~b/c": {"type": "boolean"},
+    }
+}
+
+
+def test_nested_references_are_resolved_and_all_of_is_merged():
+    pet = ReferenceResolver(nested_components).resolve({"$ref": "#/components/schemas/Pet"})
+
+    assert pet["properties"]["name"] == {"type": "string"}
+    assert pet["properties"]["id"] == {"type": "integer"}
+    assert pet["required"] == ["name", "id"]
+    assert pet["properties"]["tags"]["items"] == {"type": "integer"}
+
+
+def test_each_component_is_resolved_once():
+    resolver = ReferenceResolver(nested_components)
+    first = resolver.resolve({"$ref": "#/components/schemas/Owner"})
+    second = resolver.resolve({"oneOf": [{"$ref": "#/components/schemas/Owner"}]})["oneOf"][0]
+
+    assert first is second
+    assert set(resolver.resolved) == {"#/components/schemas/Owner", "#/components/schemas/Id"}
+
+
+def test_cyclic_references_are_cut():
+    node = ReferenceResolver(nested_components).resolve({"$ref": "#/components/schemas/Node"})
+
+    assert node["properties"]["children"]["items"] == {"type": "object"}
+
+
+def test_escaped_and_invalid_pointers():
+    resolver = ReferenceResolver(nested_components)
+
+    assert resolver.resolve({"$ref": "#/components/schemas/a~0b~1c"}) == {"type": "boolean"}
+    with pytest.raises(ValueError):
+        resolver.resolve({"$ref": "#/components/schemas/Missing"})
+    with pytest.raises(ValueError):
+        resolver.resolve({"$ref": "other.yaml#/Pet"})
@@ -0,0 +1,42 @@
+import json
+import os
+
+from rest_tester.utils.postman_parser import convert_from_postman
+
+collection = {
+    "info": {"_postman_id": "1", "name": "Todo Api", "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"},
+    "item": [
+        {"name": "top", "request": {"method": "GET", "url": {"raw": "{{base}}/todos", "query": [{"key": "limit", "value": "1"}]}}},
+        {"name": "users", "item": [
+            {"name": "add", "request": {"method": "POST", "url": "{{base}}/users/add", "body": {"mode": "raw", "raw": "{\"firstName\": \"x\"}"}}},
+            {"name": "nested folder", "item": [
+                {"name": "me", "request": "{{base}}/user/me"},
+                {"name": "deeper", "item": [{"name": "todos", "request": {"method": "GET", "url": {"raw": "{{base}}/users/5/todos"}}}]},
+            ]},
+        ]},
+        {"name": "empty", "item": []},
+    ],
+}
+
+
+def test_nested_folders_are_converted_to_nested_groups(tmp_path):
+    (tmp_path / "specs").mkdir()
+    collection_path = tmp_path / "specs" / "collection.json"
+    collection_path.write_text(json.dumps(collection))
+
+    root_dir = convert_from_postman(str(collection_path))
+
+    groups = {}
+    for folder, _, files in os.walk(root_dir):
+        if 'tests.json' in files:
+            with open(os.path.join(folder, 'tests.json')) as json_file:
+                content = json_file.read()
+            assert '\n' not in content and ', ' not in content
+            groups[os.path.relpath(folder, root_dir)] = [(test['api']['method'], test['api']['uri']) for test in json.loads(content)]
+    assert root_dir == str(tmp_path / "specsTodo_Api")
+    assert groups == {
+        '.': [('get', '/todos')],
+        'users': [('post', '/users/add')],
+        'users/nested_folder': [('get', '/user/me')],
+        'users/nested_folder/deeper': [('get', '/users/5/todos')],
+    }
@@ -0,0 +1,132 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+from rest_tester.conftest import get_timing_cells
+from rest_tester.modules.request_module import APIClientFactory, AsyncAPIClient, get_request_timings
+
+
+class RedirectHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path == '/login':
+            self.send_response(200)
+            self.send_header('Set-Cookie', 'session=abc; Path=/')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.path == '/old':
+            self.send_response(302)
+            self.send_header('Location', '/new')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = json.dumps({'path': self.path, 'cookie': self.headers.get('Cookie')}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), RedirectHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+
+
+def get_config(base_url, request_method):
+    return SimpleNamespace(
+        base_url=base_url, verify_ssl=False, request_method=request_method, http2=False, keep_alive=True,
+        pool_connections=1, pool_maxsize=2, max_retries=0, retry_backoff_factor=0, retry_status_forcelist=[],
+    )
+
+
+@pytest.mark.parametrize('request_method', ['basic', 'session', 'async'])
+def test_redirects_are_followed_with_every_request_method(api_server, request_method):
+    client_factory = APIClientFactory(get_config(api_server, request_method))
+    response = client_factory.create().send_request('get', '/old')
+    client_factory.close()
+
+    assert (response.status_code, response.json()['path']) == (200, '/new')
+
+
+@pytest.mark.parametrize('request_method, cookie', [('basic', None), ('session', 'session=abc')])
+def test_only_session_clients_keep_cookies(api_server, request_method, cookie):
+    client_factory = APIClientFactory(get_config(api_server, request_method))
+    api_client = client_factory.create()
+    api_client.send_request('get', '/login')
+    response = api_client.send_request('get', '/todos', timeout=(5, 5))
+    client_factory.close()
+
+    assert response.json()['cookie'] == cookie
+    assert api_client.session.adapters['http://'].max_retries.read is False
+
+
+def test_closing_the_factory_stops_the_event_loop(api_server):
+    client_factory = APIClientFactory(get_config(api_server, 'async'))
+    api_clients = [client_factory.create() for _ in range(2)]
+    for api_client in api_clients:
+        api_client.send_request('get', '/todos')
+    loop = client_factory.loop
+
+    client_factory.close()
+    for thread in threading.enumerate():
+        if thread.name == 'async-api-client':
+            thread.join(5)
+
+    assert all(api_client.client is None for api_client in api_clients)
+    assert not loop.is_running()
+
+
+def test_request_timings_of_a_new_connection():
+    phases = {'dns': 0.01, 'connect': 0.02, 'tls': 0.03, 'request_sent': 10.0, 'headers_received': 10.5}
+    timings = get_request_timings(9.9, 10.75, phases)
+
+    assert timings == {'dns': 0.01, 'connect': 0.02, 'tls': 0.03, 'ttfb': 0.5, 'download': 0.25,
+                       'total': pytest.approx(0.85), 'reused': False}
+
+
+def test_request_timings_of_a_reused_connection_without_phases():
+    timings = get_request_timings(1.0, 1.5, {})
+
+    assert (timings['ttfb'], timings['download'], timings['reused']) == (None, None, True)
+    assert timings['total'] == 0.5
+
+
+def test_trace_phases_of_the_async_client():
+    events = {'connection.connect_tcp.started': 1.0, 'connection.connect_tcp.complete': 1.25,
+              'send_request_body.complete': 2.0, 'receive_response_headers.complete': 2.5}
+    phases = AsyncAPIClient.get_trace_phases(events)
+
+    assert phases == {'connect': 0.25, 'request_sent': 2.0, 'headers_received': 2.5}
+
+
+@pytest.mark.parametrize('request_method', ['session', 'async'])
+def test_responses_carry_timings_and_reuse_keep_alive_connections(api_server, request_method):
+    client_factory = APIClientFactory(get_config(api_server, request_method))
+    api_client = client_factory.create()
+    first = api_client.send_request('get', '/todos')
+    second = api_client.send_request('get', '/todos')
+    client_factory.close()
+
+    assert (first.timings['reused'], second.timings['reused']) == (False, True)
+    assert first.timings['connect'] is not None and second.timings['connect'] is None
+    assert all(response.timings['ttfb'] >= 0 and response.timings['download'] >= 0 for response in [first, second])
+
+
+def test_timing_cells():
+    timings = {'dns': None, 'connect': 0.0012, 'tls': None, 'ttfb': 0.02, 'download': 0.0001, 'reused': False}
+
+    assert get_timing_cells(timings) == ['-', '1.2 ms', '-', '20.0 ms', '0.1 ms', 'new']
+    assert get_timing_cells({**timings, 'reused': True})[-1] == 'reused'
+    assert get_timing_cells(None) == ['N/A'] * 6
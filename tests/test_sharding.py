@@ -0,0 +1,55 @@
+import random
+
+from rest_tester.utils.sharding import get_worker_count, partition
+
+
+def get_loads(weights, shards, shard_count):
+    loads = [0] * shard_count
+    for weight, shard in zip(weights, shards):
+        loads[shard] += weight
+    return loads
+
+
+def test_partition_balances_the_shard_weights():
+    weights = [8, 7, 6, 5, 4, 3, 2, 1]
+    shards = partition(weights, 3)
+
+    assert get_loads(weights, shards, 3) == [13, 12, 11]
+
+
+def test_partition_loads_differ_by_at_most_the_heaviest_item():
+    generator = random.Random(3)
+    weights = [generator.randint(1, 50) for _ in range(200)]
+    loads = get_loads(weights, partition(weights, 7), 7)
+
+    assert max(loads) - min(loads) <= max(weights)
+    assert sum(loads) == sum(weights)
+
+
+def test_partition_breaks_ties_by_position():
+    weights = [1, 1, 1, 1, 1, 1]
+
+    assert partition(weights, 3) == [0, 1, 2, 0, 1, 2]
+    assert partition(list(weights), 3) == partition(weights, 3)
+
+
+def test_partition_into_one_or_no_shard():
+    assert partition([3, 1, 2], 1) == [0, 0, 0]
+    assert partition([3, 1, 2], 0) == [0, 0, 0]
+    assert partition([], 4) == []
+
+
+def test_worker_count_outside_of_xdist(monkeypatch):
+    monkeypatch.delenv('PYTEST_XDIST_WORKER', raising=False)
+    monkeypatch.setenv('PYTEST_XDIST_WORKER_COUNT', '4')
+
+    assert get_worker_count() == 0
+
+
+def test_worker_count_of_an_xdist_worker(monkeypatch):
+    monkeypatch.setenv('PYTEST_XDIST_WORKER', 'gw1')
+    monkeypatch.setenv('PYTEST_XDIST_WORKER_COUNT', '4')
+    assert get_worker_count() == 4
+
+    monkeypatch.delenv('PYTEST_XDIST_WORKER_COUNT')
+    assert get_worker_count() == 1
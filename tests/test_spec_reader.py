@@ -0,0 +1,65 @@
+import json
+
+import pytest
+import yaml
+
+from rest_tester.utils import spec_reader
+from rest_tester.utils.spec_reader import detect_spec_format, iter_spec_section, read_spec_sections
+
+yaml_spec = '''
+openapi: 3.0.0
+info: {title: Todos}
+x-shared:
+  limit: &limit {name: limit, in: query, schema: {type: integer}}
+components:
+  schemas:
+    Todo: &todo
+      type: object
+      properties: {id: {type: integer}}
+paths:
+  /todos:
+    get:
+      parameters: [*limit]
+      responses: {'200': {content: {application/json: {schema: *todo}}}}
+  /todos/{id}:
+    get: &get_todo
+      responses: {'200': {content: {application/json: {schema: {<<: *todo, required: [id]}}}}}
+    head: *get_todo
+'''
+
+
+def test_streamed_paths_use_anchors_of_other_sections(tmp_path):
+    spec_path = tmp_path / 'spec.yaml'
+    spec_path.write_text(yaml_spec)
+    spec = yaml.safe_load(yaml_spec)
+
+    assert dict(iter_spec_section(str(spec_path), 'paths')) == spec['paths']
+    assert read_spec_sections(str(spec_path), ['info', 'components']) == {
+        'info': spec['info'], 'components': spec['components']
+    }
+
+
+def test_spec_format_is_detected_from_the_head_of_the_file(tmp_path):
+    openapi_path = tmp_path / 'openapi.json'
+    openapi_path.write_text('{"info": {"title": "Todos"}, "openapi": "3.0.0", "paths": {}}')
+    postman_path = tmp_path / 'collection.json'
+    postman_path.write_text('{"info": {"_postman_id": "1", "name": "Todos"}, "item": []}')
+    late_key_path = tmp_path / 'late.yaml'
+    late_key_path.write_text('x-padding: "' + 'a' * 100 + '"\nopenapi: 3.0.0\n')
+
+    assert detect_spec_format(str(openapi_path)) == 'openapi'
+    assert detect_spec_format(str(postman_path)) == 'postman'
+    assert detect_spec_format(str(late_key_path), head_size=64) is None
+    assert detect_spec_format(str(late_key_path)) == 'openapi'
+
+
+@pytest.mark.parametrize('ijson_installed', [True, False])
+def test_json_paths_are_streamed_like_they_are_loaded(tmp_path, monkeypatch, ijson_installed):
+    spec = {'openapi': '3.0.0', 'paths': {f'/todos/{number}': {'get': {'summary': number / 2}} for number in range(5)}}
+    spec_path = tmp_path / 'spec.json'
+    spec_path.write_text(json.dumps(spec))
+    if not ijson_installed:
+        monkeypatch.setattr(spec_reader, 'get_ijson', lambda: None)
+
+    assert list(iter_spec_section(str(spec_path), 'paths')) == list(spec['paths'].items())
+    assert read_spec_sections(str(spec_path), ['openapi', 'info']) == {'openapi': '3.0.0'}
@@ -0,0 +1,87 @@
+import sys
+import json
+import atexit
+import logging
+import threading
+
+from rest_tester.utils.structured_logging import JsonLinesFormatter, Preview, RequestSampler, start_log_queue
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+        self.threads = []
+
+    def emit(self, record):
+        self.messages.append(self.format(record))
+        self.threads.append(threading.current_thread().name)
+
+
+def test_preview_cuts_long_values():
+    assert str(Preview('x' * 10, limit=4)) == 'xxxx...(6 more characters)'
+    assert str(Preview({'a': 1}, limit=100)) == "{'a': 1}"
+    assert str(Preview('x' * 10, limit=0)) == 'x' * 10
+
+
+def test_preview_builds_its_text_only_when_formatted():
+    class Value:
+        formatted = 0
+
+        def __str__(self):
+            Value.formatted += 1
+            return 'value'
+
+    logger = logging.getLogger('test_structured_logging.preview')
+    logger.setLevel(logging.WARNING)
+    logger.info('%s', Preview(Value(), limit=10))
+    assert Value.formatted == 0
+
+
+def test_request_sampler_logs_one_request_per_interval():
+    sampler = RequestSampler(0.25)
+    requests = [sampler.next_request() for _ in range(8)]
+
+    assert [request_id for request_id, _ in requests] == list(range(1, 9))
+    assert [sampled for _, sampled in requests] == [True, False, False, False] * 2
+
+
+def test_request_sampler_rates():
+    assert all(RequestSampler(1.0).next_request()[1] for _ in range(5))
+    assert not any(RequestSampler(0).next_request()[1] for _ in range(5))
+
+
+def test_json_lines_formatter_adds_the_request_fields():
+    record = logging.LogRecord('rest_tester', logging.INFO, __file__, 12, 'Received response: %s', (200,), None)
+    record.request_id, record.status_code, record.elapsed = 7, 200, 0.5
+    entry = json.loads(JsonLinesFormatter().format(record))
+
+    assert entry['message'] == 'Received response: 200'
+    assert (entry['level'], entry['line']) == ('INFO', 12)
+    assert (entry['request_id'], entry['status_code'], entry['elapsed']) == (7, 200, 0.5)
+    assert 'url' not in entry and 'exception' not in entry
+
+
+def test_json_lines_formatter_adds_the_exception():
+    try:
+        raise ValueError('boom')
+    except ValueError:
+        record = logging.LogRecord('rest_tester', logging.ERROR, __file__, 1, 'failed', (), sys.exc_info())
+    entry = json.loads(JsonLinesFormatter().format(record))
+
+    assert 'ValueError: boom' in entry['exception']
+
+
+def test_log_queue_formats_records_on_the_listener_thread():
+    logger = logging.getLogger('test_structured_logging.queue')
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handler = RecordingHandler()
+    logger.handlers = [handler]
+    listener = start_log_queue(logger)
+    logger.info('sent %s', Preview('body', limit=10))
+    atexit.unregister(listener.stop)
+    listener.stop()
+
+    assert handler.messages == ['sent body']
+    assert handler.threads != [threading.current_thread().name]
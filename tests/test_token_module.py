@@ -0,0 +1,138 @@
+import os
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from rest_tester.modules.token_module import TokenManager, TokenProvider
+
+
+class SlowLoginProvider(TokenProvider):
+    def __init__(self, started, release):
+        super().__init__({}, None)
+        self.started = started
+        self.release = release
+        self.calls = 0
+
+    def fetch(self):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        return {'token': f'token-{self.calls}', 'refresh_token': None, 'expires_at': None}
+
+
+def test_token_provider_requires_fetch():
+    with pytest.raises(TypeError):
+        TokenProvider({}, None)
+
+
+def test_static_tokens_are_not_written_to_disk(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = TokenManager([{'token': 'static-a'}, {'token': 'static-b'}], None, cache=True)
+
+    manager.fetch_all()
+
+    assert manager.cache_path is None
+    assert manager.get_token(1) == 'static-b'
+    assert not any(tmp_path.iterdir())
+
+
+def test_refresh_does_not_block_the_other_users():
+    started, release = threading.Event(), threading.Event()
+    manager = TokenManager([{'token': 'static-a'}, {'token': 'static-b'}], None, cache=False)
+    manager.fetch_all()
+    manager.providers[0] = SlowLoginProvider(started, release)
+
+    refresher = threading.Thread(target=manager.refresh, args=(0,))
+    refresher.start()
+    assert started.wait(5)
+    assert manager._lock.acquire(timeout=1)
+    manager._lock.release()
+    assert manager.get_token(1) == 'static-b'
+    release.set()
+    refresher.join(5)
+
+    assert manager.get_token(0) == 'token-1'
+    assert manager.refresh(0, 'static-a') == 'token-1'
+    assert manager.providers[0].calls == 1
+
+
+class OpaqueTokenProvider(TokenProvider):
+    def fetch(self):
+        return {'token': 'opaque-token', 'refresh_token': None, 'expires_at': None}
+
+
+class FailingProvider(TokenProvider):
+    def fetch(self):
+        raise RuntimeError('token endpoint is down')
+
+
+def test_refresh_due_survives_opaque_tokens_and_failures():
+    manager = TokenManager([{'token': 'static-a'}, {'token': 'static-b'}], None, cache=False)
+    manager.providers = [FailingProvider({}, None), OpaqueTokenProvider({}, None)]
+    manager.tokens = [{'token': 'a', 'expires_at': time.time() - 1}, {'token': 'b', 'expires_at': time.time() - 1}]
+
+    assert manager.refresh_due() == 60.0
+    assert manager.get_token(0) == 'a'
+    assert manager.get_token(1) == 'opaque-token'
+    assert manager.refresh_due() == 60.0
+
+
+class CountingProvider(TokenProvider):
+    def __init__(self, name):
+        super().__init__({}, None)
+        self.name = name
+        self.calls = 0
+
+    def fetch(self):
+        self.calls += 1
+        return {'token': f'{self.name}-{self.calls}', 'refresh_token': None, 'expires_at': None}
+
+
+def test_refresh_hook_refreshes_the_bound_user_only():
+    manager = TokenManager([{'token': 'shared'}, {'token': 'shared'}], None, cache=False)
+    manager.fetch_all()
+    manager.providers = [CountingProvider('first'), CountingProvider('second')]
+
+    assert manager.refresh(1, 'shared') == 'second-1'
+    assert manager.refresh(1, 'shared') == 'second-1'
+    assert [manager.get_token(0), manager.get_token(1)] == ['shared', 'second-1']
+    assert manager.providers[0].calls == 0
+
+
+
+def test_workers_saving_the_cache_never_expose_a_partial_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    managers = [TokenManager([{'auth': {'provider': 'login', 'data': {}}}], None, cache=True) for _ in range(4)]
+    for manager in managers:
+        manager.providers = [CountingProvider('login')]
+    done = threading.Event()
+    unreadable = []
+
+    def read_cache():
+        while not done.is_set():
+            try:
+                with open(managers[0].cache_path, 'r', encoding='utf-8') as cache_file:
+                    json.load(cache_file)
+            except FileNotFoundError:
+                pass
+            except json.JSONDecodeError as error:
+                unreadable.append(error)
+
+    def save_cache(manager):
+        manager.fetch_all()
+        for _ in range(50):
+            manager.save_cache()
+
+    reader = threading.Thread(target=read_cache)
+    reader.start()
+    with ThreadPoolExecutor(max_workers=4) as workers:
+        list(workers.map(save_cache, managers))
+    done.set()
+    reader.join()
+
+    assert not unreadable
+    assert not list(tmp_path.rglob('*.tmp'))
+    assert os.stat(managers[0].cache_path).st_mode & 0o777 == 0o600
@@ -0,0 +1,24 @@
+import jsonschema
+
+from rest_tester.utils.utils import get_json_schema, get_shape_schema
+
+
+def test_inferred_schema_accepts_the_response_it_was_inferred_from():
+    response_json = {"todos": [{"id": 1, "done": False}, {"id": 2.5, "done": True, "note": None}], "total": 2}
+
+    schema = get_json_schema(response_json, "UserTodos")
+
+    jsonschema.validate(response_json, schema)
+    assert schema["title"] == "UserTodos"
+    assert schema["properties"]["todos"]["items"]["required"] == ["done", "id"]
+    assert schema["properties"]["todos"]["items"]["properties"]["id"] == {"type": "number"}
+
+
+def test_schemas_are_inferred_once_per_shape_and_returned_as_copies():
+    get_shape_schema.cache_clear()
+    first_schema = get_json_schema({"id": 1, "tags": ["a"]})
+    first_schema["properties"]["id"]["type"] = "changed"
+    second_schema = get_json_schema({"id": 2, "tags": ["b", "c"]})
+
+    assert get_shape_schema.cache_info().hits == 1
+    assert second_schema["properties"]["id"] == {"type": "integer"}
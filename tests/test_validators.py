@@ -0,0 +1,62 @@
+import json
+
+import jsonschema
+import pydantic
+import pytest
+from pydantic import BaseModel
+
+from rest_tester.utils import validators
+from rest_tester.utils.validators import validate_json_schema, validate_model_json, get_model_schema
+
+
+class Todo(BaseModel):
+    id: int
+    title: str
+
+
+@pytest.mark.parametrize("body", ['{"id": 1, "title": "a"}', '{"id": 1.0, "title": "a"}', '{"id": 1e20, "title": "a"}'])
+def test_model_json_accepts_integral_numbers_like_jsonschema(body):
+    validate_json_schema(json.loads(body), get_model_schema(Todo))
+    validate_model_json(body, Todo)
+
+
+@pytest.mark.parametrize("body", ['{"id": 1.5, "title": "a"}', '{"id": "1", "title": "a"}', '{"title": "a"}'])
+def test_model_json_rejects_what_jsonschema_rejects(body):
+    with pytest.raises(jsonschema.exceptions.ValidationError):
+        validate_model_json(body, Todo)
+
+
+class Note(BaseModel):
+    title: str
+    tags: list[str]
+
+
+def test_models_without_integers_are_validated_by_pydantic_only(monkeypatch):
+    monkeypatch.setattr(validators, 'validate_json_schema', lambda *args: pytest.fail('validated twice'))
+
+    validate_model_json('{"title": "a", "tags": ["b"]}', Note)
+    with pytest.raises(pydantic.ValidationError):
+        validate_model_json('{"title": "a", "tags": [1]}', Note)
+
+
+def test_models_with_integers_are_validated_by_jsonschema_only(monkeypatch):
+    monkeypatch.setattr(validators, 'get_type_adapter', lambda class_: pytest.fail('validated twice'))
+
+    with pytest.raises(jsonschema.exceptions.ValidationError):
+        validate_model_json('{"id": "1", "title": "a"}', Todo)
+
+
+@pytest.mark.parametrize("engine", ["jsonschema", "fastjsonschema"])
+def test_validators_are_compiled_once_per_schema_and_engine(engine):
+    schema = {"type": "object", "properties": {"id": {"type": "integer"}}, "required": ["id"]}
+    validator = validators.get_validator(schema, engine)
+
+    assert validators.get_validator(json.loads(json.dumps(schema)), engine) is validator
+    validate_json_schema({"id": 1}, schema, engine)
+    with pytest.raises(jsonschema.exceptions.ValidationError):
+        validate_json_schema({"id": "1"}, schema, engine)
+
+
+def test_unknown_schema_engines_are_rejected():
+    with pytest.raises(ValueError):
+        validators.get_validator({"type": "object"}, "unknown")